@@ -7,3 +7,4 @@ from .agent import Agent
 from .aggressive import AggressiveAgent
 from .manual import ManualAgent
 from .random import RandomAgent
+from .search import SearchAgent
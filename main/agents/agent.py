@@ -1,12 +1,15 @@
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set
 
 from main import constants
 from main.agents.graveyard import Graveyard
-from main.exceptions import NotFoundError
+from main.exceptions import NotationError, NotFoundError
 from main.game_tree import HalfMove
-from main.pieces import Bishop, BlackPawn, King, Knight, Queen, Rook, WhitePawn
+from main.legality import KingSafety
+from main.notation import AN
+from main.pieces import Bishop, BlackPawn, King, Knight, Pawn, Queen, Rook, WhitePawn
 from main.types import AgentColor, Position, Promotee, X
+from main.x import to_str
 
 if TYPE_CHECKING:
     from main.board import Board
@@ -116,6 +119,14 @@ class Agent:
 
         return rights
 
+    @property
+    def king_safety(self) -> KingSafety:
+        cache = self.board.king_safety_cache
+        if (king_safety := cache.get(self.color)) is None:
+            king_safety = cache[self.color] = KingSafety(self)
+
+        return king_safety
+
     def get_by_position(self, x: X, y: int) -> "Piece":
         try:
             return self.pieces[(x, y)]
@@ -129,14 +140,90 @@ class Agent:
 
         raise NotFoundError("Bishop not found")
 
-    def can_move(self) -> bool:
-        pieces = list(self.pieces.values())
+    @staticmethod
+    def _get_disamb_search_fn(an: AN) -> Callable[["Piece"], bool]:
+        # Files are also ints, so tell them apart from ranks by the text
+        if isinstance(an.disambiguation, tuple):
+            return lambda p: p.position == an.disambiguation
+        elif an.match.group("disamb").isdigit():
+            return lambda p: p.y == an.disambiguation
+        else:
+            return lambda p: p.x == an.disambiguation
+
+    def _get_matching_piece(self, an: AN, pick: Position) -> "Piece":
+        search_fn: Callable[["Piece"], bool] = lambda p: True
+        piece = None
+
+        if an.piece_type is King:
+            piece = self.king
+        elif an.piece_type is Pawn:
+            search_fn: Callable[["Piece"], bool] = lambda p: (
+                p.x == an.pawn_file if an.is_capture else an.x
+            )
+        elif an.disambiguation:
+            search_fn = self._get_disamb_search_fn(an=an)
+
+        if piece is None:
+            pieces = list(self.pieces.values())
+            matching_pieces = [
+                piece
+                for piece in pieces
+                if (
+                    search_fn(piece)
+                    and isinstance(piece, an.piece_type)
+                    and piece.is_valid_move(pick)
+                )
+            ]
+
+            if len(matching_pieces) > 1:
+                raise NotationError(
+                    f"More than one {an.piece_type.__name__} can move to {to_str(an.x)}{an.y};"
+                    f" disambiguation required"
+                )
+            try:
+                piece = matching_pieces.pop()
+            except IndexError:
+                raise NotationError(f'"{an.text}" is an illegal move')
+        else:
+            if not piece.is_valid_move(pick):
+                raise NotationError(f'"{an.text}" is an illegal move')
+
+        if not an.is_capture and an.pick in piece.opponent.pieces:
+            raise NotationError(
+                f"Opponent piece on {to_str(an.x)}{an.y}. "
+                f"Did you mean {piece.symbol}x{an.text[1:]}?"
+            )
+        elif (
+            an.is_capture
+            and an.pick not in piece.opponent.pieces
+            and not (
+                isinstance(piece, Pawn) and an.pick == piece.opponent.en_passant_target
+            )
+        ):
+            raise NotationError(
+                f"No opponent piece on {an.x}{an.y}. "
+                f"Did you mean {piece.symbol}{an.x}{an.y}?"
+            )
+
+        return piece
+
+    def move_an(self, an_text: str, **kwargs) -> HalfMove:
+        """
+        Make the move written in algebraic notation, regardless of strategy.
+        Raises NotationError if the text is invalid or the move is illegal.
+        """
+
+        an = AN(text=an_text)
+        pick = an.pick or (an.x, self.king.y)
+        piece = self._get_matching_piece(an, pick)
 
-        for piece in pieces:
-            if piece.can_move():
-                return True
+        if an.promotee_type:
+            kwargs = {"promotee_type": an.promotee_type}
 
-        return False
+        return piece.move(*pick, **kwargs)
+
+    def can_move(self) -> bool:
+        return self.king_safety.has_legal_move()
 
     def move(
         self,
@@ -0,0 +1,281 @@
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from main.bitboards import POSITIONS
+from main.evaluation import PIECE_VALUES, evaluate
+from main.game_tree import HalfMove
+from main.moves import (
+    CAPTURE,
+    NULL_MOVE,
+    PROMOTEE_TYPES,
+    PROMOTION,
+    Move,
+    MoveList,
+    decode,
+    generate,
+)
+from main.transposition import EXACT, LOWER, UPPER, TranspositionTable
+from main.types import X
+
+from .agent import Agent
+
+MATE_SCORE = 100_000
+INFINITY = MATE_SCORE + 1
+# Scores beyond this are mates, counted in plies from the root
+MATE_THRESHOLD = MATE_SCORE - 1_000
+DEFAULT_TABLE_MB = 16
+
+
+class SearchStopped(Exception):
+    """
+    Raised from inside the search once the time or node budget is spent
+    """
+
+
+@dataclass(slots=True, repr=False)
+class SearchAgent(Agent):
+    """
+    Negamax alpha-beta with iterative deepening and a capture-only quiescence
+    search. Each move is searched until max_depth is reached or the time/node
+    budget runs out, whichever comes first; the deepest completed iteration
+    decides the move.
+    """
+
+    max_depth: int = 64
+    # Seconds per move. None means no limit
+    time_budget: Optional[float] = 0.05
+    # Nodes per move. None means no limit
+    node_budget: Optional[int] = None
+    # Created on the first search if not given. Assign the same table to
+    # several agents to share it
+    transposition_table: Optional[TranspositionTable] = None
+
+    # Stats of the latest search
+    nodes: int = field(default=0, init=False)
+    depth: int = field(default=0, init=False)
+    score: int = field(default=0, init=False)
+
+    _deadline: Optional[float] = field(default=None, init=False)
+    _path: List[int] = field(default_factory=list, init=False)
+    # Encoded, see main.moves
+    _best_move: int = field(default=NULL_MOVE, init=False)
+
+    @staticmethod
+    def _to_table(score: int, ply: int) -> int:
+        # Mate scores are stored relative to the node, not the root
+        if score >= MATE_THRESHOLD:
+            return score + ply
+        elif score <= -MATE_THRESHOLD:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _from_table(score: int, ply: int) -> int:
+        if score >= MATE_THRESHOLD:
+            return score - ply
+        elif score <= -MATE_THRESHOLD:
+            return score + ply
+        return score
+
+    def _order(self, moves: MoveList) -> List[int]:
+        """
+        Most valuable victim / least valuable attacker, promotions first. Quiet
+        moves keep their relative order.
+        """
+
+        agent = self.board.active_agent
+        pieces, opponent_pieces = agent.pieces, agent.king.opponent.pieces
+
+        def key(code: int) -> int:
+            flags = code >> 12
+            if not flags & (CAPTURE | PROMOTION):
+                return 0
+
+            priority = 0
+            if flags & PROMOTION:
+                priority += PIECE_VALUES[PROMOTEE_TYPES[flags & 3].symbol]
+            if flags & CAPTURE:
+                # En passant victims aren't on the to square, but are pawns
+                victim = opponent_pieces.get(POSITIONS[code >> 6 & 63])
+                attacker = pieces[POSITIONS[code & 63]]
+                priority += (
+                    PIECE_VALUES[victim.fen_symbol if victim else "P"]
+                    - PIECE_VALUES[attacker.fen_symbol] // 100
+                )
+            return -priority
+
+        return sorted(moves, key=key)
+
+    def _tick(self):
+        self.nodes += 1
+        if self.node_budget is not None and self.nodes >= self.node_budget:
+            raise SearchStopped
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchStopped
+
+    def _quiesce(self, alpha: int, beta: int, ply: int) -> int:
+        self._tick()
+        agent = self.board.active_agent
+        in_check = agent.king_safety.in_check
+
+        if not in_check:
+            stand_pat = evaluate(self.board)
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+
+        moves = generate(agent)
+        if not moves:
+            return -MATE_SCORE + ply if in_check else 0
+
+        if not in_check:
+            # Only captures and promotions, until the position is quiet
+            moves = [code for code in moves if code >> 12 & (CAPTURE | PROMOTION)]
+
+        best = alpha if not in_check else -INFINITY
+        for move in self._order(moves):
+            self.board.make(move)
+            try:
+                score = -self._quiesce(-beta, -alpha, ply + 1)
+            finally:
+                self.board.unmake()
+
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        return best
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        board = self.board
+        key = board.zobrist.key
+
+        if ply:
+            # Any repetition is scored as a draw
+            if key in self._path or board.position_cts.get(key):
+                return 0
+            if depth <= 0:
+                return self._quiesce(alpha, beta, ply)
+            self._tick()
+
+        agent = board.active_agent
+        table = self.transposition_table
+        table_move = NULL_MOVE
+        if entry := table.probe(key):
+            table_move = entry.move
+            if ply and entry.depth >= depth:
+                score = self._from_table(entry.score, ply)
+                if (
+                    entry.bound == EXACT
+                    or (entry.bound == LOWER and score >= beta)
+                    or (entry.bound == UPPER and score <= alpha)
+                ):
+                    return score
+
+        moves = generate(agent)
+        if not moves:
+            return -MATE_SCORE + ply if agent.king_safety.in_check else 0
+
+        # Best move of the previous iteration (at the root) or of an earlier
+        # search of this position goes first
+        first = self._best_move if ply == 0 else table_move
+        if first in moves:
+            moves.remove(first)
+            moves = [first] + self._order(moves)
+        else:
+            moves = self._order(moves)
+
+        alpha_orig = alpha
+        best, best_move = -INFINITY, NULL_MOVE
+        self._path.append(key)
+        try:
+            for move in moves:
+                board.make(move)
+                try:
+                    score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+                finally:
+                    board.unmake()
+
+                if score > best:
+                    best, best_move = score, move
+                    if ply == 0:
+                        self._best_move = move
+                    if score > alpha:
+                        alpha = score
+                        if alpha >= beta:
+                            break
+        finally:
+            self._path.pop()
+
+        if best <= alpha_orig:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        table.store(
+            key,
+            best_move if bound != UPPER else NULL_MOVE,
+            depth,
+            bound,
+            self._to_table(best, ply),
+        )
+
+        return best
+
+    def search(self) -> Optional[Move]:
+        """
+        Best move for this Agent in the current position, or None if there are
+        no legal moves
+        """
+
+        moves = generate(self)
+        if not moves:
+            return None
+
+        if self.transposition_table is None:
+            self.transposition_table = TranspositionTable(DEFAULT_TABLE_MB)
+        self.transposition_table.new_search()
+
+        self.nodes = 0
+        self._path = []
+        self._best_move = NULL_MOVE
+        self._deadline = (
+            time.perf_counter() + self.time_budget
+            if self.time_budget is not None
+            else None
+        )
+
+        best_move = self._order(moves)[0]
+        with self.board.untracked_attacks():
+            for depth in range(1, self.max_depth + 1):
+                try:
+                    score = self._negamax(depth, -INFINITY, INFINITY, 0)
+                except SearchStopped:
+                    break
+
+                best_move = self._best_move
+                self.depth, self.score = depth, score
+                if abs(score) >= MATE_THRESHOLD:
+                    break  # Forced mate found, searching deeper won't change it
+
+        self._best_move = best_move
+        return decode(self, best_move)
+
+    def move(
+        self,
+        attr: Optional[str] = None,
+        x: Optional[X] = None,
+        y: Optional[int] = None,
+    ) -> Optional[HalfMove]:
+        if (best_move := self.search()) is None:
+            return None
+
+        attr, x, y, promotee_type = best_move
+        kwargs = {"promotee_type": promotee_type} if promotee_type else {}
+
+        return getattr(self, attr).move(x, y, **kwargs)
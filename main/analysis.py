@@ -0,0 +1,139 @@
+"""
+Batch analysis of positions given as FEN: the legal moves, whether the side to
+move is in check, and whether the game is over. A single Board is reset in
+place for each position (see Board.set_position), rather than building Agents and
+Pieces from scratch every time, and positions can be fanned out across a
+process pool in chunks.
+
+Usage:
+    python -m main.analysis positions.fen
+    python -m main.analysis positions.fen --workers 4 --chunksize 500 --jsonl out.jsonl
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from main.builders import BoardBuilder
+from main.moves import generate, to_coordinate
+from main.types import GameResult
+
+# Positions sent to a worker at a time
+DEFAULT_CHUNKSIZE = 256
+
+
+class Analysis(NamedTuple):
+    fen: str
+    # Coordinate notation, e.g. e2e4, a7a8q
+    moves: List[str]
+    check: bool
+    # As Piece.get_game_result would have it, from the position alone (so never
+    # a repetition), or None if the game isn't over
+    result: GameResult
+
+
+class Analyser:
+    """
+    Analyses one position at a time on its own pooled Board
+    """
+
+    def __init__(self):
+        self.builder = BoardBuilder()
+        self.board = self.builder.from_start()
+
+    __slots__ = ("builder", "board")
+
+    def analyse(self, fen: str) -> Analysis:
+        board = self.board
+        board.set_position(self.builder.fields_from_fen(fen))
+
+        agent = board.active_agent
+        moves = generate(agent)
+        check = agent.king.is_in_check()
+
+        if not moves:
+            if check:
+                result = "0-1" if agent is board.white else "1-0"
+            else:
+                result = "½-½ Stalemate"
+        elif board.has_insufficient_material():
+            result = "½-½ Insufficient material"
+        elif board.draw_by_seventy_five_move_rule():
+            result = "½-½ Seventy-five-move rule"
+        else:
+            result = None
+
+        return Analysis(
+            fen=fen,
+            moves=[to_coordinate(code) for code in moves],
+            check=check,
+            result=result,
+        )
+
+
+# Each worker process's own Analyser, set up by _init_worker
+_analyser: Optional[Analyser] = None
+
+
+def _init_worker():
+    global _analyser
+    _analyser = Analyser()
+
+
+def _analyse(fen: str) -> Analysis:
+    return _analyser.analyse(fen)
+
+
+def analyse(
+    fens: Iterable[str],
+    workers: Optional[int] = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[Analysis]:
+    """
+    Analyse every position, yielding results in the order given. With more than
+    one worker (None for one per core), chunks of `chunksize` positions are
+    analysed in a process pool.
+    """
+
+    if workers == 1:
+        yield from map(Analyser().analyse, fens)
+        return
+
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        yield from pool.imap(_analyse, fens, chunksize=chunksize)
+
+
+def main(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Analyse positions given as FEN")
+    parser.add_argument("fens", help="File with one FEN per line, or - for stdin")
+    parser.add_argument("--workers", type=int, default=1, help="0 for one per core")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--jsonl", help="Write one JSON analysis per line here")
+    parsed = parser.parse_args(args)
+
+    handle = sys.stdin if parsed.fens == "-" else open(parsed.fens)
+    out = open(parsed.jsonl, "w") if parsed.jsonl else None
+    fens = (line.strip() for line in handle if line.strip())
+    count = 0
+    start = time.perf_counter()
+
+    try:
+        for analysis in analyse(fens, parsed.workers or None, parsed.chunksize):
+            count += 1
+            if out:
+                out.write(f"{json.dumps(analysis._asdict(), ensure_ascii=False)}\n")
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+        if out:
+            out.close()
+
+    seconds = time.perf_counter() - start
+    print(f"{count} positions in {seconds:.2f}s ({count / seconds:.0f} positions/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Binary game archive: millions of games in one file, each readable on its own
+without parsing text. Moves are stored in the 16-bit encoding of main.moves.
+
+Layout (little-endian):
+    Header      magic, format version (one byte), game count, offset of the
+                index
+    Games       for each game: result, whether a starting position follows,
+                number of halfmoves, the starting position if it's not the
+                standard one (a Snapshot), then the encoded halfmoves
+    Index       offset of each game, 8 bytes apiece
+
+The reader memory-maps the file, so opening an archive is instant however big
+it is, and a game is only decoded when it's asked for.
+
+Usage:
+    python -m main.archive create games.chsa RandomAgent AggressiveAgent --games 100
+    python -m main.archive info games.chsa
+    python -m main.archive pgn games.chsa 42
+"""
+
+import argparse
+import mmap
+import multiprocessing
+import struct
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict
+from functools import cache
+from typing import TYPE_CHECKING, Iterator, List, NamedTuple, Optional, Tuple
+
+from main.builders import BoardBuilder
+from main.exceptions import NotationError, NotFoundError
+from main.export import to_pgn
+from main.moves import decode, encode_halfmove, make_move
+from main.snapshot import FORMAT, Snapshot
+from main.tournament import AGENTS, Game, play_board, schedule
+from main.types import GameResult
+
+if TYPE_CHECKING:
+    from main.board import Board
+
+MAGIC = b"CHSARCH\0"
+# Bump whenever the layout (including Snapshot's), or the result codes below,
+# change
+VERSION = 3
+HEADER = struct.Struct("<8sB3xIQ")
+GAME_HEADER = struct.Struct("<BBH")
+INDEX_ENTRY = struct.Struct("<Q")
+# A game's result is stored as its index in here. This is part of the file
+# format and independent of GameResult's order: never reorder it, only append
+RESULT_CODES: Tuple[GameResult, ...] = (
+    None,
+    "1-0",
+    "0-1",
+    "½-½ Stalemate",
+    "½-½ Insufficient material",
+    "½-½ Repetition",
+    "½-½ Seventy-five-move rule",
+    "½-½ Agreement",
+)
+
+
+class ArchivedGame(NamedTuple):
+    result: GameResult
+    # None if the game began from the standard starting position
+    start: Optional[Snapshot]
+    # Encoded halfmoves (see main.moves)
+    moves: array
+
+
+@cache
+def _standard_start() -> Snapshot:
+    return BoardBuilder().from_start().snapshot()
+
+
+def pack(board: "Board") -> bytes:
+    """
+    The current line of board's GameTree, as stored in an archive
+    """
+
+    tree = board.game_tree
+    start = tree.start.snapshot if tree.halfmoves else board.snapshot()
+    if start is None:
+        raise NotFoundError("Starting position of the game not found")
+
+    moves = array("H", map(encode_halfmove, tree.halfmoves))
+    if sys.byteorder == "big":
+        moves.byteswap()
+
+    custom_start = start != _standard_start()
+    return b"".join(
+        (
+            GAME_HEADER.pack(
+                RESULT_CODES.index(board.result), custom_start, len(moves)
+            ),
+            start if custom_start else b"",
+            moves.tobytes(),
+        )
+    )
+
+
+class ArchiveWriter:
+    """
+    Writes games to a new archive. The index and game count are written on
+    close, so use it as a context manager.
+    """
+
+    def __init__(self, path: str):
+        self.handle = open(path, "wb")
+        self.offsets = array("Q")
+        self.handle.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+
+    __slots__ = ("handle", "offsets")
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, board: "Board"):
+        self.add_packed(pack(board))
+
+    def add_packed(self, data: bytes):
+        """
+        Add a game packed elsewhere (e.g. by a worker process) with pack
+        """
+
+        self.offsets.append(self.handle.tell())
+        self.handle.write(data)
+
+    def close(self):
+        if self.handle.closed:
+            return
+
+        index_offset = self.handle.tell()
+        if sys.byteorder == "big":
+            self.offsets.byteswap()
+        self.handle.write(self.offsets.tobytes())
+        self.handle.seek(0)
+        self.handle.write(HEADER.pack(MAGIC, VERSION, len(self.offsets), index_offset))
+        self.handle.close()
+
+
+class ArchiveReader:
+    """
+    Random access to the games in an archive, by index
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.count, self._index_offset = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise NotationError(f"{path} is not a version {VERSION} game archive")
+
+    __slots__ = ("_mmap", "count", "_index_offset")
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, idx: int) -> ArchivedGame:
+        offset = self._offset(idx)
+        result, custom_start, plies = GAME_HEADER.unpack_from(self._mmap, offset)
+        offset += GAME_HEADER.size
+
+        start = None
+        if custom_start:
+            start = Snapshot(self._mmap[offset : offset + FORMAT.size])
+            offset += FORMAT.size
+
+        moves = array("H", self._mmap[offset : offset + plies * 2])
+        if sys.byteorder == "big":
+            moves.byteswap()
+
+        return ArchivedGame(result=RESULT_CODES[result], start=start, moves=moves)
+
+    def __iter__(self) -> Iterator[ArchivedGame]:
+        for idx in range(self.count):
+            yield self[idx]
+
+    def result(self, idx: int) -> GameResult:
+        """
+        A game's result, without decoding anything else
+        """
+
+        return RESULT_CODES[self._mmap[self._offset(idx)]]
+
+    def replay(self, idx: int, **kwargs) -> "Board":
+        """
+        Play a game back onto a new Board (with a full GameTree, results and so
+        on). kwargs are passed on to BoardBuilder.from_start.
+        """
+
+        game = self[idx]
+        board = BoardBuilder().from_start(**kwargs)
+        if game.start:
+            board.restore(game.start)
+            board.position_cts = defaultdict(int, {board.zobrist.key: 1})
+
+        for code in game.moves:
+            agent = board.active_agent
+            make_move(agent, decode(agent, code))
+
+        return board
+
+    def close(self):
+        self._mmap.close()
+
+    def _offset(self, idx: int) -> int:
+        if idx < 0:
+            idx += self.count
+        if not 0 <= idx < self.count:
+            raise IndexError(f"Game {idx} not in archive of {self.count}")
+
+        return INDEX_ENTRY.unpack_from(self._mmap, self._index_offset + idx * 8)[0]
+
+
+def _play_packed(game: Game) -> bytes:
+    return pack(play_board(game))
+
+
+def play_packed(games: List[Game], workers: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Play games in a pool of `workers` processes (one per core by default),
+    yielding each one packed for an archive, in order
+    """
+
+    if workers == 1:
+        yield from map(_play_packed, games)
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap(_play_packed, games)
+
+
+def main(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Create or read game archives")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser("create", help="Archive self-play games")
+    create_parser.add_argument("archive")
+    create_parser.add_argument("agents", nargs="+", choices=sorted(AGENTS))
+    create_parser.add_argument("--games", type=int, default=10, help="Per pairing")
+    create_parser.add_argument("--workers", type=int, default=None)
+    create_parser.add_argument("--seed", type=int, default=0)
+    create_parser.add_argument("--max-fullmoves", type=int, default=300)
+
+    info_parser = subparsers.add_parser("info", help="Summarise an archive")
+    info_parser.add_argument("archive")
+
+    pgn_parser = subparsers.add_parser("pgn", help="Print a game as PGN")
+    pgn_parser.add_argument("archive")
+    pgn_parser.add_argument("index", type=int)
+
+    parsed = parser.parse_args(args)
+    start = time.perf_counter()
+
+    if parsed.command == "create":
+        games = schedule(parsed.agents, parsed.games, parsed.seed, parsed.max_fullmoves)
+        with ArchiveWriter(parsed.archive) as writer:
+            for data in play_packed(games, parsed.workers):
+                writer.add_packed(data)
+        print(f"{len(games)} games in {time.perf_counter() - start:.1f}s")
+    elif parsed.command == "info":
+        with ArchiveReader(parsed.archive) as reader:
+            results = Counter()
+            plies = 0
+            for game in reader:
+                results[game.result or "*"] += 1
+                plies += len(game.moves)
+        print(
+            f"{len(reader)} games, {plies} halfmoves, read in "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+        for result, count in results.most_common():
+            print(f"  {result}: {count}")
+    else:
+        with ArchiveReader(parsed.archive) as reader:
+            print(to_pgn(reader.replay(parsed.index)), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+from typing import Dict, List, Tuple
+
+from main import constants
+from main.bitboards import (
+    BETWEEN,
+    DIAGONAL_RAYS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    LINE_RAYS,
+    ORTHOGONAL_RAYS,
+    PAWN_ATTACKS,
+    PIECE_SYMBOLS,
+    SQUARE_BITS,
+    SQUARE_INDEX,
+    Bitboards,
+    iter_bits,
+    sliding_attacks,
+)
+from main.types import AgentColor, Position
+
+# Enough for a count of 31, more attackers than any square can have
+PLANES = 5
+
+SLIDER_RAYS = {
+    "B": DIAGONAL_RAYS,
+    "R": ORTHOGONAL_RAYS,
+    "Q": DIAGONAL_RAYS + ORTHOGONAL_RAYS,
+}
+
+
+def attacks_from(color: AgentColor, symbol: str, sq: int, occupied: int) -> int:
+    """
+    Squares attacked by a piece of `color` and `symbol` (uppercase FEN) on sq
+    """
+
+    if symbol == "P":
+        return PAWN_ATTACKS[color][sq]
+    elif symbol == "N":
+        return KNIGHT_ATTACKS[sq]
+    elif symbol == "K":
+        return KING_ATTACKS[sq]
+    return sliding_attacks(sq, occupied, SLIDER_RAYS[symbol])
+
+
+class AttackMap:
+    """
+    The squares each color attacks, and by how many pieces, kept in sync by
+    Board.apply_change right after the Bitboards it reads occupancy from (add,
+    remove and move take the occupancy from before that update). Only the piece
+    itself and the sliders that saw a vacated or filled square are recomputed.
+
+    Responsibilities:
+    - Answer attack queries in O(1) (Is this square attacked? How many times?)
+    - Answer whether a move would give check, without applying it
+    """
+
+    def __init__(self, bitboards: Bitboards):
+        self.bitboards = bitboards
+        # Attack counts per color, bit-sliced: bit sq of planes[color][i] is bit i
+        # of the number of pieces attacking sq, so a whole mask of squares can be
+        # counted in or out with a few integer operations
+        self.planes: Dict[AgentColor, List[int]] = {
+            color: [0] * PLANES for color in constants.COLORS
+        }
+        # Squares attacked by each Pawn, Knight and King, keyed by color and square
+        self.masks: Dict[Tuple[AgentColor, int], int] = {}
+        # Same for each Bishop, Rook and Queen, the only pieces whose attacks
+        # depend on the occupancy of the board
+        self.sliders: Dict[Tuple[AgentColor, int], int] = {}
+
+    __slots__ = ("bitboards", "planes", "masks", "sliders")
+
+    @classmethod
+    def from_bitboards(cls, bitboards: Bitboards) -> "AttackMap":
+        attack_map = cls(bitboards)
+        for color in constants.COLORS:
+            for symbol in PIECE_SYMBOLS:
+                for sq in iter_bits(bitboards.pieces[color][symbol]):
+                    attack_map._add(color, symbol, sq)
+
+        return attack_map
+
+    def attacked(self, color: AgentColor) -> int:
+        """
+        Mask of every square `color` attacks
+        """
+
+        p0, p1, p2, p3, p4 = self.planes[color]
+        return p0 | p1 | p2 | p3 | p4
+
+    def is_attacked(self, position: Position, color: AgentColor) -> bool:
+        return bool(self.attacked(color) & SQUARE_BITS[position])
+
+    def count(self, position: Position, color: AgentColor) -> int:
+        sq = SQUARE_INDEX[position]
+        return sum((plane >> sq & 1) << i for i, plane in enumerate(self.planes[color]))
+
+    def add(self, color: AgentColor, symbol: str, position: Position, occupied: int):
+        self._update_sliders(occupied)
+        self._add(color, symbol, SQUARE_INDEX[position])
+
+    def remove(self, color: AgentColor, position: Position, occupied: int):
+        self._remove(color, SQUARE_INDEX[position])
+        self._update_sliders(occupied)
+
+    def move(
+        self,
+        color: AgentColor,
+        symbol: str,
+        old: Position,
+        new: Position,
+        occupied: int,
+    ):
+        self._remove(color, SQUARE_INDEX[old])
+        self._update_sliders(occupied)
+        self._add(color, symbol, SQUARE_INDEX[new])
+
+    def gives_check(
+        self,
+        color: AgentColor,
+        symbol: str,
+        old: Position,
+        new: Position,
+        king: Position,
+        vacated: int = 0,
+        filled: int = 0,
+    ) -> bool:
+        """
+        Would a piece of `color` moving from old to new attack the King on `king`,
+        either directly or by uncovering one of its own sliders? `vacated` and
+        `filled` are any other squares the move empties or fills (e.g. en passant,
+        castling).
+        """
+
+        king_sq = SQUARE_INDEX[king]
+        vacated |= SQUARE_BITS[old]
+        occupied = (self.bitboards.occupied & ~vacated) | SQUARE_BITS[new] | filled
+
+        if attacks_from(color, symbol, SQUARE_INDEX[new], occupied) >> king_sq & 1:
+            return True
+
+        # Only a slider that already sees a vacated square can newly see the King,
+        # and only if the King is further along that same line
+        old_sq = SQUARE_INDEX[old]
+        for (slider_color, sq), mask in self.sliders.items():
+            if slider_color != color or sq == old_sq or not (seen := mask & vacated):
+                continue
+
+            line_rays, between = LINE_RAYS[sq], BETWEEN[sq][king_sq]
+            while seen:
+                lsb = seen & -seen
+                if (
+                    line_rays[lsb.bit_length() - 1] is line_rays[king_sq]
+                    and not between & occupied
+                ):
+                    return True
+                seen ^= lsb
+
+        return False
+
+    def _add(self, color: AgentColor, symbol: str, sq: int):
+        mask = attacks_from(color, symbol, sq, self.bitboards.occupied)
+        if symbol in SLIDER_RAYS:
+            self.sliders[(color, sq)] = mask
+        else:
+            self.masks[(color, sq)] = mask
+        self._count(color, mask, 1)
+
+    def _remove(self, color: AgentColor, sq: int):
+        key = (color, sq)
+        mask = self.sliders.pop(key, None)
+        if mask is None:
+            mask = self.masks.pop(key)
+        self._count(color, mask, -1)
+
+    def _update_sliders(self, occupied: int):
+        """
+        Update the sliders that saw a square whose occupancy has changed from
+        `occupied`. Only the ray through that square needs recomputing.
+        """
+
+        changed = occupied ^ self.bitboards.occupied
+        if not changed:
+            return
+
+        occupied, sliders = self.bitboards.occupied, self.sliders
+        for key, mask in sliders.items():
+            if seen := mask & changed:
+                line_rays = LINE_RAYS[key[1]]
+                new_mask = mask
+                while seen:
+                    rays, ascending = line_rays[(seen & -seen).bit_length() - 1]
+                    ray = full_ray = rays[key[1]]
+                    if blockers := ray & occupied:
+                        if ascending:
+                            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+                        else:
+                            ray ^= rays[blockers.bit_length() - 1]
+                    new_mask = (new_mask & ~full_ray) | ray
+                    seen &= ~full_ray
+
+                sliders[key] = new_mask
+                if lost := mask & ~new_mask:
+                    self._count(key[0], lost, -1)
+                if gained := new_mask & ~mask:
+                    self._count(key[0], gained, 1)
+
+    def _count(self, color: AgentColor, mask: int, delta: int):
+        """
+        Add (delta=1) or subtract (delta=-1) one from the count of every square in
+        mask, rippling the carry or borrow through the planes
+        """
+
+        planes = self.planes[color]
+        i = 0
+        while mask:
+            plane = planes[i]
+            planes[i] = plane ^ mask
+            mask = mask & plane if delta > 0 else mask & ~plane
+            i += 1
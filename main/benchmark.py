@@ -0,0 +1,389 @@
+"""
+Benchmark suite: one microbenchmark per subsystem, plus full games. Every
+benchmark is seeded, warmed up, then sampled repeatedly; results (seconds per
+call, with percentiles) can be saved as a JSON baseline and later compared
+against, so a slowdown in any one component shows up on its own.
+
+The baseline the suite is checked against is benchmarks/baseline.json; save a
+new one with --json when a change is meant to move the numbers.
+
+Usage:
+    python -m main.benchmark run
+    python -m main.benchmark run --baseline benchmarks/baseline.json
+    python -m main.benchmark run perft_3 an_parsing --json current.json
+    python -m main.benchmark compare benchmarks/baseline.json current.json --tolerance 0.1
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from main.agents import AggressiveAgent, RandomAgent
+from main.analysis import Analyser
+from main.builders import BoardBuilder
+from main.export import to_pgn
+from main.moves import generate
+from main.notation import AN, FEN
+from main.perft import START_FEN, perft
+
+if TYPE_CHECKING:
+    from main.board import Board
+
+# https://www.chessprogramming.org/Perft_Results
+FENS = (
+    START_FEN,
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+)
+# What a headless worker imports to play and analyse games. None of the
+# presentation dependencies (pyperclip, colorist, dotenv, tabulate) should load.
+ENGINE_IMPORTS = "import main.board, main.builders, main.moves, main.tournament"
+# Where ENGINE_IMPORTS can be imported from, whatever the working directory
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SEED = 0
+DEFAULT_REPEAT = 20
+DEFAULT_WARMUP = 3
+# Relative slowdown of the median tolerated by compare
+DEFAULT_TOLERANCE = 0.1
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # Given a seeded Random, builds any fixtures and returns the callable timed
+    setup: Callable[[random.Random], Callable[[], Any]]
+    # Calls per sample, so that each sample is long enough to time reliably
+    number: int
+    # Items (e.g. positions) handled per call, to report throughput in items/s
+    items: Optional[int] = None
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(number: int = 1, items: Optional[int] = None) -> Callable:
+    def register(setup: Callable[[random.Random], Callable[[], Any]]) -> Callable:
+        BENCHMARKS[setup.__name__] = Benchmark(setup.__name__, setup, number, items)
+        return setup
+
+    return register
+
+
+def _play_game(seed: int) -> "Board":
+    random.seed(seed)
+    board = BoardBuilder().from_start(
+        white_agent_cls=RandomAgent,
+        black_agent_cls=AggressiveAgent,
+        max_fullmoves=300,
+    )
+    board.play(internal=True)
+
+    return board
+
+
+@benchmark(number=20)
+def move_generation(rng: random.Random) -> Callable[[], Any]:
+    boards = [BoardBuilder().from_fen(fen) for fen in FENS]
+
+    def call():
+        for board in boards:
+            board.king_safety_cache.clear()
+            generate(board.active_agent)
+
+    return call
+
+
+@benchmark()
+def perft_3(rng: random.Random) -> Callable[[], Any]:
+    board = BoardBuilder().from_fen(START_FEN)
+
+    def call():
+        with board.untracked_attacks():
+            perft(board, 3)
+
+    return call
+
+
+@benchmark(number=50)
+def fen_generation(rng: random.Random) -> Callable[[], Any]:
+    boards = [BoardBuilder().from_fen(fen) for fen in FENS]
+
+    def call():
+        for board in boards:
+            board._placement = None  # Generated from scratch, not incrementally
+            board.get_fen(internal=True)
+
+    return call
+
+
+@benchmark(number=200)
+def fen_parsing(rng: random.Random) -> Callable[[], Any]:
+    def call():
+        for text in FENS:
+            fen = FEN(text)
+            (
+                fen.piece_placement,
+                fen.active_color,
+                fen.castling_rights,
+                fen.en_passant_target,
+                fen.halfmove_clock,
+                fen.fullmove_number,
+            )
+
+    return call
+
+
+@benchmark(number=20)
+def an_parsing(rng: random.Random) -> Callable[[], Any]:
+    board = _play_game(rng.getrandbits(32))
+    texts = [halfmove.to_an() for halfmove in board.game_tree.halfmoves]
+
+    def call():
+        for text in texts:
+            an = AN(text)
+            (an.piece_type, an.disambiguation, an.pick, an.promotee_type, an.check)
+
+    return call
+
+
+@benchmark(number=20)
+def san_generation(rng: random.Random) -> Callable[[], Any]:
+    halfmoves = _play_game(rng.getrandbits(32)).game_tree.halfmoves
+
+    def call():
+        for halfmove in halfmoves:
+            halfmove.to_an()
+
+    return call
+
+
+@benchmark(number=20)
+def from_fen(rng: random.Random) -> Callable[[], Any]:
+    builder = BoardBuilder()
+
+    def call():
+        for fen in FENS:
+            builder.from_fen(fen)
+
+    return call
+
+
+@benchmark()
+def full_game(rng: random.Random) -> Callable[[], Any]:
+    seed = rng.getrandbits(32)
+    return lambda: _play_game(seed)
+
+
+@benchmark(number=20)
+def pgn_export(rng: random.Random) -> Callable[[], Any]:
+    board = _play_game(rng.getrandbits(32))
+    return lambda: to_pgn(board)
+
+
+@benchmark(number=5, items=len(FENS) * 10)
+def fen_analysis(rng: random.Random) -> Callable[[], Any]:
+    analyser = Analyser()
+    fens = FENS * 10
+
+    def call():
+        for fen in fens:
+            analyser.analyse(fen)
+
+    return call
+
+
+@benchmark()
+def engine_import(rng: random.Random) -> Callable[[], Any]:
+    # A fresh interpreter each time, so interpreter startup is included
+    return lambda: subprocess.run(
+        [sys.executable, "-c", ENGINE_IMPORTS], cwd=ROOT, check=True
+    )
+
+
+def measure(
+    bench: Benchmark,
+    seed: int = DEFAULT_SEED,
+    repeat: int = DEFAULT_REPEAT,
+    warmup: int = DEFAULT_WARMUP,
+) -> Dict[str, float]:
+    """
+    Statistics of `repeat` samples of bench, in seconds per call, and its
+    throughput if it counts items
+    """
+
+    fn = bench.setup(random.Random(seed))
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(bench.number):
+            fn()
+        samples.append((time.perf_counter() - start) / bench.number)
+
+    percentiles = statistics.quantiles(samples, n=100) if repeat > 1 else samples * 99
+    result = {
+        "number": bench.number,
+        "repeat": repeat,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if repeat > 1 else 0.0,
+        "p90": percentiles[89],
+        "p99": percentiles[98],
+    }
+    if bench.items:
+        result["per_second"] = bench.items / result["median"]
+
+    return result
+
+
+def run(
+    names: Optional[Sequence[str]] = None,
+    seed: int = DEFAULT_SEED,
+    repeat: int = DEFAULT_REPEAT,
+    warmup: int = DEFAULT_WARMUP,
+) -> Dict[str, Any]:
+    """
+    Measure the named benchmarks (all by default), as a JSON-ready report
+    """
+
+    results = {}
+    for name in names or BENCHMARKS:
+        # Same starting state for every benchmark, whichever ran before it
+        random.seed(seed)
+        results[name] = measure(BENCHMARKS[name], seed, repeat, warmup)
+
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Dict[str, Any]]:
+    """
+    Median of each benchmark in both reports, relative to the baseline.
+    Regressions are slower than the baseline by more than `tolerance`.
+    """
+
+    rows = []
+    for name, result in current["results"].items():
+        if (base := baseline["results"].get(name)) is None:
+            continue
+
+        ratio = result["median"] / base["median"]
+        rows.append(
+            {
+                "benchmark": name,
+                "baseline_ms": base["median"] * 1000,
+                "current_ms": result["median"] * 1000,
+                "change": f"{ratio - 1:+.1%}",
+                "regression": ratio > 1 + tolerance,
+            }
+        )
+
+    return rows
+
+
+# Shown in milliseconds by _print_report
+STATS = ("min", "median", "mean", "p90", "p99")
+
+
+def _print_report(report: Dict[str, Any]):
+    from tabulate import tabulate
+
+    rows = [
+        {
+            "benchmark": name,
+            **{k: v * 1000 for k, v in result.items() if k in STATS},
+            "per_second": result.get("per_second"),
+        }
+        for name, result in report["results"].items()
+    ]
+    print(tabulate(rows, headers="keys", floatfmt=".4f"))
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    # Only the command line prints tables; benchmarks can run without tabulate
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Run or compare benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("benchmarks", nargs="*", help="All by default")
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run_parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    run_parser.add_argument("--json", help="Save the report here, e.g. as a baseline")
+    run_parser.add_argument("--baseline", help="Compare against this saved report")
+    run_parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+
+    parsed = parser.parse_args(args)
+
+    if parsed.command == "run":
+        if unknown := set(parsed.benchmarks) - set(BENCHMARKS):
+            parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+        report = run(parsed.benchmarks, parsed.seed, parsed.repeat, parsed.warmup)
+        _print_report(report)
+        if parsed.json:
+            with open(parsed.json, "w") as handle:
+                json.dump(report, handle, indent=2)
+        if not parsed.baseline:
+            return 0
+        with open(parsed.baseline) as handle:
+            baseline = json.load(handle)
+    else:
+        with open(parsed.baseline) as handle:
+            baseline = json.load(handle)
+        with open(parsed.current) as handle:
+            report = json.load(handle)
+
+    rows = compare(baseline, report, parsed.tolerance)
+    print()
+    print(tabulate(rows, headers="keys", floatfmt=".4f"))
+
+    regressions = [row["benchmark"] for row in rows if row["regression"]]
+    if regressions:
+        print(f"\nSlower than the baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+from typing import Dict, List, Optional, Tuple
+
+from main import constants
+from main.types import AgentColor, Position
+
+# Squares are indexed a1 = 0, b1 = 1, ..., h8 = 63, and a set of squares is
+# represented by an int with the matching bits set.
+SQUARE_INDEX: Dict[Position, int] = {
+    (x, y): (y - 1) * 8 + (x - 1) for x, y in constants.SQUARES_LIST
+}
+SQUARE_BITS: Dict[Position, int] = {
+    position: 1 << idx for position, idx in SQUARE_INDEX.items()
+}
+POSITIONS: List[Position] = sorted(SQUARE_INDEX, key=SQUARE_INDEX.get)
+
+PIECE_SYMBOLS = ("P", "N", "B", "R", "Q", "K")
+DIAGONAL_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+ORTHOGONAL_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+KNIGHT_JUMPS = ((2, 1), (1, 2), (2, -1), (1, -2), (-2, 1), (-1, 2), (-2, -1), (-1, -2))
+
+
+def _mask(positions) -> int:
+    mask = 0
+    for position in positions:
+        if bit := SQUARE_BITS.get(position):
+            mask |= bit
+    return mask
+
+
+def _ray(position: Position, direction: Position) -> List[Position]:
+    (x, y), (x_d, y_d) = position, direction
+    ray = []
+    x, y = x + x_d, y + y_d
+    while (x, y) in SQUARE_INDEX:
+        ray.append((x, y))
+        x, y = x + x_d, y + y_d
+    return ray
+
+
+def _build_between() -> List[List[int]]:
+    """
+    BETWEEN[a][b] holds the squares strictly between a and b when they share a
+    rank, file or diagonal, and 0 otherwise (including adjacent squares)
+    """
+
+    between = [[0] * 64 for _ in range(64)]
+    for position, idx in SQUARE_INDEX.items():
+        for direction in DIAGONAL_DIRECTIONS + ORTHOGONAL_DIRECTIONS:
+            path = 0
+            for square in _ray(position, direction):
+                between[idx][SQUARE_INDEX[square]] = path
+                path |= SQUARE_BITS[square]
+    return between
+
+
+def _build_lines(directions) -> List[int]:
+    return [
+        _mask(sq for direction in directions for sq in _ray(position, direction))
+        for position in POSITIONS
+    ]
+
+
+def _build_jumps(jumps) -> List[int]:
+    return [_mask((x + x_d, y + y_d) for x_d, y_d in jumps) for x, y in POSITIONS]
+
+
+BETWEEN = _build_between()
+DIAGONALS = _build_lines(DIAGONAL_DIRECTIONS)
+ORTHOGONALS = _build_lines(ORTHOGONAL_DIRECTIONS)
+KNIGHT_ATTACKS = _build_jumps(KNIGHT_JUMPS)
+KING_ATTACKS = _build_jumps(DIAGONAL_DIRECTIONS + ORTHOGONAL_DIRECTIONS)
+
+# PAWN_ATTACKS[color][sq] are the squares a pawn of that color on sq attacks
+PAWN_ATTACKS: Dict[AgentColor, List[int]] = {
+    constants.WHITE: _build_jumps(((1, 1), (-1, 1))),
+    constants.BLACK: _build_jumps(((1, -1), (-1, -1))),
+}
+
+# RAYS[direction][sq] holds every square from sq to the edge of the board in that
+# direction
+RAYS: Dict[Position, List[int]] = {
+    direction: [_mask(_ray(position, direction)) for position in POSITIONS]
+    for direction in DIAGONAL_DIRECTIONS + ORTHOGONAL_DIRECTIONS
+}
+# Along these, the nearest blocker is the lowest set bit; otherwise the highest
+ASCENDING_DIRECTIONS = {(1, 0), (0, 1), (1, 1), (-1, 1)}
+# (rays, ascending) pairs for sliding_attacks
+DIAGONAL_RAYS = [(RAYS[d], d in ASCENDING_DIRECTIONS) for d in DIAGONAL_DIRECTIONS]
+ORTHOGONAL_RAYS = [(RAYS[d], d in ASCENDING_DIRECTIONS) for d in ORTHOGONAL_DIRECTIONS]
+
+
+def _build_line_rays() -> List[List[Optional[Tuple[List[int], bool]]]]:
+    """
+    LINE_RAYS[a][b] is the (rays, ascending) pair for the direction from a to b,
+    or None if they don't share a rank, file or diagonal
+    """
+
+    line_rays = [[None] * 64 for _ in range(64)]
+    for position, idx in SQUARE_INDEX.items():
+        for direction in DIAGONAL_DIRECTIONS + ORTHOGONAL_DIRECTIONS:
+            pair = (RAYS[direction], direction in ASCENDING_DIRECTIONS)
+            for square in _ray(position, direction):
+                line_rays[idx][SQUARE_INDEX[square]] = pair
+    return line_rays
+
+
+LINE_RAYS = _build_line_rays()
+
+
+def sliding_attacks(sq: int, occupied: int, rays: List[Tuple[List[int], bool]]) -> int:
+    """
+    Squares a slider on sq attacks along `rays` (e.g. DIAGONAL_RAYS): each ray up
+    to and including the first occupied square
+    """
+
+    attacks = 0
+    for ray_table, ascending in rays:
+        ray = ray_table[sq]
+        if blockers := ray & occupied:
+            if ascending:
+                ray ^= ray_table[(blockers & -blockers).bit_length() - 1]
+            else:
+                ray ^= ray_table[blockers.bit_length() - 1]
+        attacks |= ray
+
+    return attacks
+
+
+def iter_bits(mask: int):
+    while mask:
+        lsb = mask & -mask
+        yield lsb.bit_length() - 1
+        mask ^= lsb
+
+
+class Bitboards:
+    """
+    Occupancy of the board as 64-bit integers, per color and per piece type
+    (keyed by the uppercase FEN symbol). Kept in sync by Board.apply_change.
+
+    Responsibilities:
+    - Answer occupancy queries (Is this square taken? By whom?)
+    - Answer blocking queries (Is there anything between these two squares?)
+    - Answer attack queries (Can this color capture on this square?)
+    """
+
+    def __init__(self):
+        self.colors: Dict[AgentColor, int] = {constants.WHITE: 0, constants.BLACK: 0}
+        self.pieces: Dict[AgentColor, Dict[str, int]] = {
+            color: {symbol: 0 for symbol in PIECE_SYMBOLS} for color in constants.COLORS
+        }
+
+    __slots__ = ("colors", "pieces")
+
+    @classmethod
+    def from_agents(cls, *agents) -> "Bitboards":
+        bitboards = cls()
+        for agent in agents:
+            for position, piece in agent.pieces.items():
+                bitboards.add(agent.color, piece.fen_symbol, position)
+
+        return bitboards
+
+    @property
+    def occupied(self) -> int:
+        return self.colors[constants.WHITE] | self.colors[constants.BLACK]
+
+    def add(self, color: AgentColor, symbol: str, position: Position):
+        bit = SQUARE_BITS[position]
+        self.colors[color] |= bit
+        self.pieces[color][symbol] |= bit
+
+    def remove(self, color: AgentColor, symbol: str, position: Position):
+        mask = ~SQUARE_BITS[position]
+        self.colors[color] &= mask
+        self.pieces[color][symbol] &= mask
+
+    def move(self, color: AgentColor, symbol: str, old: Position, new: Position):
+        flip = SQUARE_BITS[old] | SQUARE_BITS[new]
+        self.colors[color] ^= flip
+        self.pieces[color][symbol] ^= flip
+
+    def is_blocked(self, position: Position, target_position: Position) -> bool:
+        return bool(
+            BETWEEN[SQUARE_INDEX[position]][SQUARE_INDEX[target_position]]
+            & self.occupied
+        )
+
+    def attackers(
+        self,
+        position: Position,
+        color: AgentColor,
+        occupied: Optional[int] = None,
+    ) -> int:
+        """
+        All pieces of `color` that attack `position`. A custom `occupied` mask can
+        be passed to evaluate sliders against a hypothetical occupancy (e.g. with
+        the defending King lifted off the board).
+        """
+
+        sq = SQUARE_INDEX[position]
+        pieces = self.pieces[color]
+        occupied = self.occupied if occupied is None else occupied
+        opponent = constants.BLACK if color == constants.WHITE else constants.WHITE
+
+        attackers = (
+            (KNIGHT_ATTACKS[sq] & pieces["N"])
+            | (KING_ATTACKS[sq] & pieces["K"])
+            | (PAWN_ATTACKS[opponent][sq] & pieces["P"])
+        )
+
+        between = BETWEEN[sq]
+        queens = pieces["Q"]
+        for slider in iter_bits((pieces["B"] | queens) & DIAGONALS[sq]):
+            if not between[slider] & occupied:
+                attackers |= 1 << slider
+        for slider in iter_bits((pieces["R"] | queens) & ORTHOGONALS[sq]):
+            if not between[slider] & occupied:
+                attackers |= 1 << slider
+
+        return attackers
+
+    def is_attacked(
+        self,
+        position: Position,
+        color: AgentColor,
+        occupied: Optional[int] = None,
+    ) -> bool:
+        """
+        Same as attackers, but returns as soon as any attacker is found
+        """
+
+        sq = SQUARE_INDEX[position]
+        pieces = self.pieces[color]
+        opponent = constants.BLACK if color == constants.WHITE else constants.WHITE
+
+        if (
+            (KNIGHT_ATTACKS[sq] & pieces["N"])
+            or (KING_ATTACKS[sq] & pieces["K"])
+            or (PAWN_ATTACKS[opponent][sq] & pieces["P"])
+        ):
+            return True
+
+        occupied = self.occupied if occupied is None else occupied
+        between = BETWEEN[sq]
+        queens = pieces["Q"]
+        for slider in iter_bits((pieces["B"] | queens) & DIAGONALS[sq]):
+            if not between[slider] & occupied:
+                return True
+        for slider in iter_bits((pieces["R"] | queens) & ORTHOGONALS[sq]):
+            if not between[slider] & occupied:
+                return True
+
+        return False
@@ -1,23 +1,61 @@
-from collections import Counter
-from datetime import date
-from typing import TYPE_CHECKING, Dict, Optional, Set
-
-import pyperclip
-from colorist import Color
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Tuple
 
 from main import constants
+from main.attacks import AttackMap
+from main.bitboards import POSITIONS, Bitboards
 from main.exceptions import NotFoundError
-from main.game_tree import FullMove, GameTree, HalfMove
-from main.game_tree.utils import get_halfmove
-from main.notation.utils import truncate_fen
-from main.types import Change, GameResult, Position
-from main.x import H, to_str
+from main.export import pgn_result, tag_pairs, to_pgn
+from main.game_tree import FullMove, GameTree, HalfMove, Node
+from main.material import Material
+from main.moves import (
+    CAPTURE,
+    DOUBLE_PAWN_PUSH,
+    EN_PASSANT,
+    KINGSIDE_CASTLE,
+    PROMOTEE_TYPES,
+    PROMOTION,
+    QUEENSIDE_CASTLE,
+)
+from main.placement import Placement
+from main.snapshot import (
+    INTERVAL,
+    MOVED_ATTRS,
+    PROM_ATTRS,
+    SLOT_TYPES,
+    Fields,
+    Snapshot,
+)
+from main.types import Change, GameResult, LookaheadResults, Position
+from main.x import A, D, F, H, to_str
+from main.zobrist import Zobrist
 
 if TYPE_CHECKING:
     from main.agents import Agent
     from main.pieces import Piece
 
 
+class Undo(NamedTuple):
+    """
+    What Board.unmake needs to take back a move applied with Board.make
+    """
+
+    piece: "Piece"
+    old_position: Position
+    has_moved: Optional[bool]
+    captured: Optional["Piece"]
+    rook: Optional["Piece"]
+    promotee: Optional["Piece"]
+    # Whatever the graveyard held under the promotee's attr beforehand
+    buried: Optional["Piece"]
+    en_passant_targets: Tuple[Optional[Position], Optional[Position]]
+    halfmove_clock: int
+    fullmove_number: int
+    # Zobrist key, White and Black castling indexes, and en passant file
+    zobrist: Optional[Tuple[int, int, int, Optional[int]]]
+
+
 class Board:
     """
      The highest-level object in our data model. All game information
@@ -39,6 +77,7 @@ class Board:
         halfmove_clock: Optional[int] = 0,
         fullmove_number: Optional[int] = 1,
         game_tree: Optional[GameTree] = None,
+        lazy_results: Optional[bool] = True,
     ):
         self.max_fullmoves = max_fullmoves
         self.game_tree = game_tree or GameTree()
@@ -47,11 +86,24 @@ class Board:
         self.fullmove_number = fullmove_number
         self.result: GameResult = None
 
-        self.fen_cts = None
-        self.fen_rows = {}
+        # Whether check, FEN and game result are computed after a move is applied
+        # (see Piece.move), rather than by applying and rolling it back beforehand
+        self.lazy_results = lazy_results
+
+        # Occurrences of each committed position, keyed by Zobrist key
+        self.position_cts = defaultdict(int)
 
         self._white = None
         self._black = None
+        self._bitboards = None
+        self._attacks = None
+        self._track_attacks = True
+        self._zobrist = None
+        self._placement = None
+        self._material = None
+        self.king_safety_cache = {}
+        # Pushed by make, popped by unmake
+        self.undo_stack: List[Undo] = []
 
     __slots__ = (
         "max_fullmoves",
@@ -60,10 +112,18 @@ class Board:
         "halfmove_clock",
         "fullmove_number",
         "result",
-        "fen_cts",
-        "fen_rows",
+        "lazy_results",
+        "position_cts",
         "_white",
         "_black",
+        "_bitboards",
+        "_attacks",
+        "_track_attacks",
+        "_zobrist",
+        "_placement",
+        "_material",
+        "king_safety_cache",
+        "undo_stack",
     )
 
     def __repr__(self) -> str:
@@ -85,6 +145,60 @@ class Board:
     def black(self, agent: "Agent"):
         self._black = agent
 
+    @property
+    def bitboards(self) -> Bitboards:
+        # Built on first use, then kept up to date by apply_change
+        if self._bitboards is None:
+            self._bitboards = Bitboards.from_agents(self.white, self.black)
+
+        return self._bitboards
+
+    @property
+    def attacks(self) -> Optional[AttackMap]:
+        # Built on first use, then kept up to date by apply_change. None inside
+        # untracked_attacks, where callers fall back to the Bitboards
+        if self._attacks is None and self._track_attacks:
+            self._attacks = AttackMap.from_bitboards(self.bitboards)
+
+        return self._attacks
+
+    @contextmanager
+    def untracked_attacks(self):
+        """
+        For bursts of speculative moves (e.g. a search), where updating the attack
+        map costs more than it saves. It's rebuilt on first use afterwards.
+        """
+
+        self._attacks, self._track_attacks = None, False
+        try:
+            yield
+        finally:
+            self._track_attacks = True
+
+    @property
+    def zobrist(self) -> Zobrist:
+        # Built on first use, then kept up to date by apply_change
+        if self._zobrist is None:
+            self._zobrist = Zobrist.from_board(self)
+
+        return self._zobrist
+
+    @property
+    def placement(self) -> Placement:
+        # Built on first use, then kept up to date by apply_change
+        if self._placement is None:
+            self._placement = Placement.from_agents(self.white, self.black)
+
+        return self._placement
+
+    @property
+    def material(self) -> Material:
+        # Built on first use, then kept up to date by apply_change
+        if self._material is None:
+            self._material = Material.from_agents(self.white, self.black)
+
+        return self._material
+
     @property
     def truncated_result(self) -> str:
         return self.result[0:3] if self.result else ""
@@ -93,54 +207,16 @@ class Board:
     def active_agent(self) -> "Agent":
         return self.white if self.active_color == "w" else self.black
 
-    @staticmethod
-    def _get_row(
-        y: int, white_memo: Dict[Position, str], black_memo: Dict[Position, str]
-    ) -> str:
-        row = ""
-        empty_squares_ct = 0
-
-        for x in constants.FILES:
-            if piece := white_memo.get((x, y)) or black_memo.get((x, y)):
-                row += f"{str(empty_squares_ct) if empty_squares_ct else ''}{piece}"
-                empty_squares_ct = 0
-            elif x == H:
-                row += str(empty_squares_ct + 1)
-            else:
-                empty_squares_ct += 1
-
-        return row if y == 1 else f"{row}/"
-
     def get_fen(
         self,
         idx: Optional[float] = None,
-        rows_changing: Optional[Set] = None,
         internal: Optional[bool] = False,
     ) -> str:
         if idx:
-            halfmove = get_halfmove(idx, self.game_tree.root)
+            halfmove = self.game_tree.get_halfmove(idx)
             return halfmove.change["fen"]
 
-        piece_placement = ""
-        white_memo = {p.position: p.fen_symbol for p in self.white.pieces.values()}
-        black_memo = {
-            p.position: p.fen_symbol.lower() for p in self.black.pieces.values()
-        }
-
-        if rows_changing and self.fen_rows:
-            for y in constants.RANKS:
-                if y in rows_changing:
-                    row = self._get_row(y, white_memo, black_memo)
-                    piece_placement += row
-                    self.fen_rows[y] = row
-                else:
-                    piece_placement += self.fen_rows[y]
-        else:
-            for y in constants.RANKS:
-                row = self._get_row(y, white_memo, black_memo)
-                piece_placement += row
-                self.fen_rows[y] = row
-
+        piece_placement = str(self.placement)
         castling_rights = (
             f"{self.white.castling_rights}{self.black.castling_rights.lower()}" or "-"
         )
@@ -159,6 +235,8 @@ class Board:
         if internal:
             return fen
         else:
+            import pyperclip
+
             print(fen)
             pyperclip.copy(fen)
             print("\nCopied to clipboard!")
@@ -175,6 +253,8 @@ class Board:
             white_an = node.white.to_an() if node.white else "..."
             black_an = node.black.to_an() if node.black else ""
             if colored:
+                from colorist import Color
+
                 white_color = Color.RED if "x" in white_an else Color.WHITE
                 black_color = Color.RED if "x" in black_an else Color.YELLOW
                 off = Color.OFF
@@ -184,37 +264,98 @@ class Board:
                 f"{number}. {white_color}{white_an}{off} "
                 f"{black_color}{black_an}{off}{" " if compact else "\n"}"
             )
-        return movetext + self.truncated_result
-
-    def get_pgn(self, compact: Optional[bool] = True):
-        pgn = (
-            f'[Event "?"]\n'
-            f'[Site "?"]\n'
-            f"[Date \"{date.today().strftime('%Y.%m.%d')}\"]\n"
-            f'[Round "?"]\n'
-            f'[Result "{self.truncated_result}"]\n'
-            f'[White "{self.white.__class__.__name__}"]\n'
-            f'[Black "{self.black.__class__.__name__}"]\n\n'
-        )
+        return movetext + pgn_result(self.result)
 
-        print(f"{pgn}{self._get_movetext(compact=compact)}")
-        pyperclip.copy(f"{pgn}{self._get_movetext(compact=compact, colored=False)}")
-        print("\nCopied to clipboard!")
+    def get_pgn(
+        self, compact: Optional[bool] = True, internal: Optional[bool] = False
+    ) -> str:
+        """
+        The game as PGN, with one fullmove per line unless compact. Unless
+        internal, it's also printed in color and copied to the clipboard; see
+        main.export for exporting without either.
+        """
 
-    @staticmethod
-    def add_piece(piece: "Piece", attr: str, new_position: Position):
+        text = to_pgn(self, compact=compact)
+
+        if internal:
+            return text
+        else:
+            import pyperclip
+
+            print(f"{tag_pairs(self)}\n{self._get_movetext(compact=compact)}")
+            pyperclip.copy(text)
+            print("\nCopied to clipboard!")
+            return text
+
+    def add_piece(self, piece: "Piece", attr: str, new_position: Position):
         piece.agent.pieces_cache[new_position] = piece
         setattr(piece.agent, attr, piece)
 
         if hasattr(piece.agent.graveyard, attr):
             setattr(piece.agent.graveyard, attr, None)
+        if self._bitboards is not None:
+            occupied = self._bitboards.occupied
+            self._bitboards.add(piece.agent.color, piece.fen_symbol, new_position)
+            if self._attacks is not None:
+                self._attacks.add(
+                    piece.agent.color, piece.fen_symbol, new_position, occupied
+                )
+        if self._zobrist is not None:
+            self._zobrist.toggle_piece(
+                piece.agent.color, piece.fen_symbol, new_position
+            )
+        if self._placement is not None:
+            self._placement.add(piece.agent.color, piece.fen_symbol, new_position)
+        if self._material is not None:
+            self._material.add(piece.agent.color, piece.fen_symbol, new_position)
 
-    @staticmethod
-    def destroy_piece(piece: "Piece", attr: str):
+    def destroy_piece(self, piece: "Piece", attr: str):
         piece.agent.del_cache_item((piece.x, piece.y))
 
         setattr(piece.agent.graveyard, attr, piece)
         setattr(piece.agent, attr, None)
+        if self._bitboards is not None:
+            occupied = self._bitboards.occupied
+            self._bitboards.remove(piece.agent.color, piece.fen_symbol, piece.position)
+            if self._attacks is not None:
+                self._attacks.remove(piece.agent.color, piece.position, occupied)
+        if self._zobrist is not None:
+            self._zobrist.toggle_piece(
+                piece.agent.color, piece.fen_symbol, piece.position
+            )
+        if self._placement is not None:
+            self._placement.remove(piece.agent.color, piece.fen_symbol, piece.position)
+        if self._material is not None:
+            self._material.remove(piece.agent.color, piece.fen_symbol, piece.position)
+
+    def move_piece(self, piece: "Piece", new_position: Position):
+        agent = piece.agent
+        agent.del_cache_item(piece.position)
+
+        if self._bitboards is not None:
+            occupied = self._bitboards.occupied
+            self._bitboards.move(
+                agent.color, piece.fen_symbol, piece.position, new_position
+            )
+            if self._attacks is not None:
+                self._attacks.move(
+                    agent.color,
+                    piece.fen_symbol,
+                    piece.position,
+                    new_position,
+                    occupied,
+                )
+        if self._zobrist is not None:
+            self._zobrist.move_piece(
+                agent.color, piece.fen_symbol, piece.position, new_position
+            )
+        if self._placement is not None:
+            self._placement.move(
+                agent.color, piece.fen_symbol, piece.position, new_position
+            )
+
+        piece.x, piece.y = new_position
+        agent.pieces_cache[new_position] = piece
 
     def apply_change(self, change: Change, rollback: Optional[bool] = False):
         """
@@ -222,45 +363,70 @@ class Board:
         here. State should never be changed from anywhere else.
         """
 
+        if rollback and "fen" in change:
+            # Leaving a committed position
+            self.position_cts[self.zobrist.key] -= 1
+
+        zobrist = self._zobrist
+
         for agent in (self.white, self.black):
-            for key, datum in change[agent.color].items():
+            agent_change = change[agent.color]
+            for key, datum in agent_change.items():
                 piece = getattr(agent, key)
 
                 if key == "en_passant_target":
                     agent.en_passant_target = datum[1]
+                    if zobrist is not None:
+                        zobrist.update_en_passant(
+                            self.white.en_passant_target or self.black.en_passant_target
+                        )
                 elif datum["new_position"] is None:
                     self.destroy_piece(piece, attr=key)
                 elif datum["old_position"] is None:
                     # We're either resurrecting a piece, or adding a promotee
                     x, y = datum["new_position"]
-                    piece = datum["piece_type"](
-                        attr=key,
-                        agent=agent,
-                        x=x,
-                        y=y,
-                    )
+                    piece = getattr(agent.graveyard, key, None)
+                    if type(piece) is datum["piece_type"]:
+                        piece.x, piece.y = x, y
+                    else:
+                        piece = datum["piece_type"](
+                            attr=key,
+                            agent=agent,
+                            x=x,
+                            y=y,
+                        )
                     self.add_piece(piece, attr=key, new_position=(x, y))
                 else:
-                    agent.del_cache_item((piece.x, piece.y))
-                    x, y = datum["new_position"]
-                    piece.x, piece.y = x, y
-                    agent.pieces_cache[(x, y)] = piece
+                    self.move_piece(piece, datum["new_position"])
 
                 if "has_moved" in datum:
                     piece.has_moved = datum["has_moved"]
 
+            if zobrist is not None and (
+                "king" in agent_change
+                or "a_rook" in agent_change
+                or "h_rook" in agent_change
+            ):
+                zobrist.update_castling(agent)
+
         if "game_result" in change and change["game_result"]:
             self.result = change["game_result"]
-        if "fen" in change:
-            if rollback:
-                self.fen_cts[truncate_fen(change["fen"])] -= 1
-            else:
-                self.fen_cts[truncate_fen(change["fen"])] += 1
+        elif "result" in change:
+            self.result = change["result"]
 
+        self.king_safety_cache.clear()
         self.halfmove_clock = change["halfmove_clock"][1]
         self.active_color = "w" if self.active_color == "b" else "b"
         self.fullmove_number = change["fullmove_number"][1]
 
+        if zobrist is not None:
+            zobrist.toggle_side()
+
+        if not rollback and "fen" in change:
+            # Only committed moves (those which store a FEN) count towards
+            # repetition; speculative ones are applied and rolled back
+            self.position_cts[self.zobrist.key] += 1
+
     def apply_gametree(self, root: FullMove):
         for node in root:
             if node.white:
@@ -269,11 +435,175 @@ class Board:
                 self.apply_halfmove(node.black)
 
     def apply_halfmove(self, halfmove: HalfMove):
+        tree = self.game_tree
+        if not tree.halfmoves and tree.start.snapshot is None:
+            tree.start.snapshot = self.snapshot()
+
         self.apply_change(halfmove.change)
-        self.game_tree.append(halfmove)
+        tree.append(halfmove)
+
+        if not len(tree) % INTERVAL and tree.cursor.snapshot is None:
+            tree.cursor.snapshot = self.snapshot()
+
+    def record_results(self, halfmove: HalfMove, results: LookaheadResults):
+        """
+        Store results computed for a halfmove that's already been applied. Once it
+        has a FEN, its position counts towards repetition.
+        """
+
+        halfmove.change.update(results)
+        if results["game_result"]:
+            self.result = results["game_result"]
+
+        self.position_cts[self.zobrist.key] += 1
 
     def rollback_halfmove(self, halfmove: Optional[HalfMove] = None):
         halfmove = halfmove or self.game_tree.get_latest_halfmove()
+        self.revert_change(halfmove.change)
+        self.game_tree.prune()
+
+    def step_back(self):
+        """
+        Take back the latest halfmove, but keep it in the GameTree so it can be
+        stepped forward into again (or branched off from with a different move)
+        """
+
+        self.revert_change(self.game_tree.get_latest_halfmove().change)
+        self.game_tree.back()
+
+    def step_forward(self, variation: int = 0):
+        """
+        Replay a halfmove already in the GameTree from this position: the mainline
+        continuation by default, or another variation
+        """
+
+        self.apply_halfmove(self.game_tree.cursor.children[variation].halfmove)
+
+    def goto(self, node: Node):
+        """
+        Jump to any position in the GameTree: back to where the current line and
+        node's line meet, then forward along node's line
+        """
+
+        on_path = {id(n) for n in self.game_tree.path}
+        line = []
+        while id(node) not in on_path:
+            line.append(node)
+            node = node.parent
+
+        while self.game_tree.cursor is not node:
+            self.step_back()
+        for node in reversed(line):
+            self.apply_halfmove(node.halfmove)
+
+    def snapshot(self) -> Snapshot:
+        return Snapshot.from_board(self)
+
+    def restore(self, snapshot: Snapshot):
+        self.set_position(snapshot.unpack())
+
+    def set_position(self, fields: Fields):
+        """
+        Set up a position in place: Agents and Pieces are reused (a piece only
+        needs creating if it's a promotee of a type the slot hasn't held yet).
+        The GameTree, repetition counts and undo stack aren't part of a position,
+        so they're left alone and cleared respectively; cached views of the
+        board are rebuilt on next use.
+        """
+
+        positions = iter(fields.positions)
+
+        for agent in (self.white, self.black):
+            graveyard = agent.graveyard
+            agent.pieces_cache.clear()
+            for attr in constants.PIECE_ATTRS:
+                position = next(positions)
+                live, dead = getattr(agent, attr), getattr(graveyard, attr)
+
+                if attr in PROM_ATTRS:
+                    piece_type = fields.promotee_types[agent.color][attr]
+                else:
+                    piece_type = SLOT_TYPES[agent.color][attr]
+
+                if position is None and (piece_type is None or not (live or dead)):
+                    # Nothing to keep track of, but hold on to any piece for reuse
+                    if live:
+                        setattr(graveyard, attr, live)
+                        setattr(agent, attr, None)
+                    continue
+
+                if type(live) is piece_type:
+                    piece = live
+                elif type(dead) is piece_type:
+                    piece = dead
+                else:
+                    x, y = position or (live or dead).position
+                    piece = piece_type(attr=attr, agent=agent, x=x, y=y)
+
+                if attr in MOVED_ATTRS:
+                    piece.has_moved = fields.has_moved[agent.color][attr]
+                if position is None:
+                    # Captured: keep it (as it was) in the graveyard, so taking
+                    # back the capture brings back the same piece
+                    setattr(graveyard, attr, piece)
+                    setattr(agent, attr, None)
+                    continue
+
+                piece.x, piece.y = position
+                setattr(agent, attr, piece)
+                setattr(graveyard, attr, None)
+                agent.pieces_cache[position] = piece
+
+            agent.en_passant_target = None
+            agent.rights_cache = None
+
+        # The target is the square skipped by the side that just moved
+        inactive = self.black if fields.active_color == "w" else self.white
+        inactive.en_passant_target = fields.en_passant_target
+
+        self.active_color = fields.active_color
+        self.halfmove_clock = fields.halfmove_clock
+        self.fullmove_number = fields.fullmove_number
+        self.result = None
+
+        self._bitboards = self._attacks = self._zobrist = self._placement = None
+        self._material = None
+        self.king_safety_cache.clear()
+        self.undo_stack.clear()
+
+    def jump(self, ply: int):
+        """
+        Show the position after the first `ply` halfmoves of the current line,
+        e.g. to scrub through a game: restore the latest snapshot at or before it
+        and replay fewer than INTERVAL halfmoves from there, however long the game.
+        Only the Board moves, not the GameTree's cursor, so jump(len(game_tree))
+        before playing on.
+        """
+
+        tree = self.game_tree
+        if not 0 <= ply <= len(tree):
+            raise NotFoundError(f"Ply {ply} not found")
+
+        # Snapshots are taken as halfmoves are applied, so a line appended to
+        # the GameTree some other way has fewer of them
+        base = ply - ply % INTERVAL
+        while base >= 0 and tree.path[base].snapshot is None:
+            base -= 1
+        if base < 0:
+            raise NotFoundError("No snapshot to jump from")
+        self.restore(tree.path[base].snapshot)
+
+        for halfmove in tree[base:ply]:
+            # Replayed positions have been counted towards repetition already
+            self.apply_change({k: v for k, v in halfmove.change.items() if k != "fen"})
+        self.result = tree[ply - 1].change.get("game_result") if ply else None
+
+    def revert_change(self, change: Change):
+        """
+        Undo the latest change applied with apply_change, leaving the GameTree
+        alone (see rollback_halfmove)
+        """
+
         inverted_change = {
             constants.WHITE: {},
             constants.BLACK: {},
@@ -284,7 +614,7 @@ class Board:
         }
 
         for agent in (self.white, self.black):
-            for key, datum in halfmove.change[agent.color].items():
+            for key, datum in change[agent.color].items():
                 if key == "en_passant_target":
                     inverted_change[agent.color][key] = (datum[1], datum[0])
                     continue
@@ -303,54 +633,170 @@ class Board:
                         "has_moved"
                     ]
 
-        if (
-            "game_result" in halfmove.change
-            and halfmove.change["game_result"] is not None
-        ):
+        if "game_result" in change and change["game_result"] is not None:
             inverted_change["result"] = None
 
         inverted_change["halfmove_clock"] = (
-            halfmove.change["halfmove_clock"][1],
-            halfmove.change["halfmove_clock"][0],
+            change["halfmove_clock"][1],
+            change["halfmove_clock"][0],
         )
         inverted_change["fullmove_number"] = (
-            halfmove.change["fullmove_number"][1],
-            halfmove.change["fullmove_number"][0],
+            change["fullmove_number"][1],
+            change["fullmove_number"][0],
         )
+        if "fen" in change:
+            inverted_change["fen"] = change["fen"]
 
         self.apply_change(inverted_change, rollback=True)
-        self.game_tree.prune()
+
+    def make(self, code: int):
+        """
+        Apply an encoded move (see main.moves) for the active Agent, for moves
+        that are only speculative (e.g. searching). The GameTree isn't touched,
+        no Change is built, and the position doesn't count towards repetition.
+        Take it back with unmake.
+        """
+
+        agent = self.active_agent
+        opponent = self.black if agent is self.white else self.white
+        piece = agent.pieces[POSITIONS[code & 63]]
+        old_position, new_position = piece.position, POSITIONS[code >> 6 & 63]
+        flags = code >> 12
+        zobrist = self._zobrist
+
+        captured = rook = promotee = buried = None
+        if flags == EN_PASSANT:
+            captured = opponent.pieces[(new_position[0], old_position[1])]
+        elif flags & CAPTURE:
+            captured = opponent.pieces[new_position]
+        if flags == KINGSIDE_CASTLE:
+            rook = agent.h_rook
+        elif flags == QUEENSIDE_CASTLE:
+            rook = agent.a_rook
+        if flags & PROMOTION:
+            x, y = new_position
+            promotee = PROMOTEE_TYPES[flags & 3](
+                attr=f"{piece.attr[0]}_prom", agent=agent, x=x, y=y
+            )
+            buried = getattr(agent.graveyard, promotee.attr)
+
+        undo = Undo(
+            piece=piece,
+            old_position=old_position,
+            has_moved=getattr(piece, "has_moved", None),
+            captured=captured,
+            rook=rook,
+            promotee=promotee,
+            buried=buried,
+            en_passant_targets=(
+                self.white.en_passant_target,
+                self.black.en_passant_target,
+            ),
+            halfmove_clock=self.halfmove_clock,
+            fullmove_number=self.fullmove_number,
+            zobrist=(
+                (
+                    zobrist.key,
+                    zobrist.castling[constants.WHITE],
+                    zobrist.castling[constants.BLACK],
+                    zobrist.en_passant_x,
+                )
+                if zobrist is not None
+                else None
+            ),
+        )
+        self.undo_stack.append(undo)
+
+        if captured:
+            self.destroy_piece(captured, attr=captured.attr)
+        if promotee:
+            self.destroy_piece(piece, attr=piece.attr)
+            self.add_piece(promotee, promotee.attr, new_position)
+        else:
+            self.move_piece(piece, new_position)
+        if rook:
+            self.move_piece(rook, (F if rook is agent.h_rook else D, new_position[1]))
+            rook.has_moved = True
+        if undo.has_moved is not None:
+            piece.has_moved = True
+
+        opponent.en_passant_target = None
+        if flags == DOUBLE_PAWN_PUSH:
+            agent.en_passant_target = (
+                old_position[0],
+                (old_position[1] + new_position[1]) // 2,
+            )
+
+        if zobrist is not None:
+            zobrist.update_en_passant(agent.en_passant_target)
+            if undo.has_moved is not None:
+                zobrist.update_castling(agent)
+            if captured and captured.fen_symbol == "R":
+                zobrist.update_castling(opponent)
+            zobrist.toggle_side()
+
+        self.king_safety_cache.clear()
+        if captured or piece.fen_symbol == "P":
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if agent is self.black:
+            self.fullmove_number += 1
+        self.active_color = "w" if self.active_color == "b" else "b"
+
+    def unmake(self):
+        """
+        Take back the latest move applied with make
+        """
+
+        undo = self.undo_stack.pop()
+        piece = undo.piece
+        agent = piece.agent
+
+        # Restored wholesale below, rather than stepped back piece by piece
+        zobrist, self._zobrist = self._zobrist, None
+
+        if undo.promotee:
+            self.destroy_piece(undo.promotee, attr=undo.promotee.attr)
+            setattr(agent.graveyard, undo.promotee.attr, undo.buried)
+            self.add_piece(piece, piece.attr, undo.old_position)
+        else:
+            self.move_piece(piece, undo.old_position)
+        if undo.rook:
+            self.move_piece(
+                undo.rook, (H if undo.rook.x == F else A, undo.old_position[1])
+            )
+            undo.rook.has_moved = False
+        if undo.has_moved is not None:
+            piece.has_moved = undo.has_moved
+        if undo.captured:
+            self.add_piece(undo.captured, undo.captured.attr, undo.captured.position)
+
+        self.white.en_passant_target, self.black.en_passant_target = (
+            undo.en_passant_targets
+        )
+        self.king_safety_cache.clear()
+        self.halfmove_clock = undo.halfmove_clock
+        self.fullmove_number = undo.fullmove_number
+        self.active_color = "w" if agent is self.white else "b"
+
+        if zobrist is not None and undo.zobrist is not None:
+            (
+                zobrist.key,
+                zobrist.castling[constants.WHITE],
+                zobrist.castling[constants.BLACK],
+                zobrist.en_passant_x,
+            ) = undo.zobrist
+            self._zobrist = zobrist
 
     def has_insufficient_material(self) -> bool:
-        scenarios = [
-            ([0], [0]),  # KK
-            ([0], [0, 3]),  # KKN or KKB
-            ([0, 3], [0]),  # KNK or KBK
-        ]
-
-        if self.white.material_sum > 3 or self.black.material_sum > 3:
-            return False
-        for white_material, black_material in scenarios:
-            white_match = Counter(self.white.material) == Counter(white_material)
-            black_match = Counter(self.black.material) == Counter(black_material)
-            if white_match and black_match:
-                return True
-
-        if Counter(self.white.material) == Counter([0, 3]) and Counter(
-            self.black.material
-        ) == Counter([0, 3]):
-            try:
-                white_bishop = self.white.get_bishop()
-                black_bishop = self.black.get_bishop()
-            except NotFoundError:
-                return False
-
-            return white_bishop.dark is black_bishop.dark
-
-        return False
-
-    def draw_by_repetition(self, fen: str) -> bool:
-        return self.fen_cts[truncate_fen(fen)] == 2
+        return self.material.is_insufficient()
+
+    def draw_by_repetition(self) -> bool:
+        return self.position_cts[self.zobrist.key] == 2
+
+    def draw_by_seventy_five_move_rule(self) -> bool:
+        return self.halfmove_clock >= constants.SEVENTY_FIVE_MOVE_CLOCK
 
     def play(
         self,
@@ -1,15 +1,15 @@
 import itertools
-import re
 from collections import defaultdict
-from typing import TYPE_CHECKING, List, Optional, Type
+from typing import TYPE_CHECKING, Iterator, List, Optional, TextIO, Tuple, Type
 
 from main import constants
 from main.agents import ManualAgent
 from main.board import Board
-from main.exceptions import BuildError
-from main.notation import FEN
-from main.notation.utils import truncate_fen
+from main.exceptions import BuildError, NotationError
+from main.export import game_result
+from main.notation import FEN, PGN, iter_pgn
 from main.pieces import SYMBOLS_MAP, Bishop, King, Knight, Queen, Rook
+from main.snapshot import MOVED_ATTRS, PROM_ATTRS, Fields, Snapshot
 from main.types import AgentScaffold, PieceScaffold, X
 from main.x import A, B, C, F, G, H, to_str
 
@@ -141,9 +141,7 @@ class BoardBuilder:
         board = self._get_board(white_agent_cls, black_agent_cls, max_fullmoves, "w")
         self._set_pieces(agent=board.white, scaffold=WHITE_SCAFFOLD)
         self._set_pieces(agent=board.black, scaffold=BLACK_SCAFFOLD)
-        board.fen_cts = defaultdict(
-            int, {"rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -": 1}
-        )
+        board.position_cts = defaultdict(int, {board.zobrist.key: 1})
 
         return board
 
@@ -161,41 +159,47 @@ class BoardBuilder:
         )
         self._set_pieces(agent=board.white, scaffold=self._get_scaffold(white_data))
         self._set_pieces(agent=board.black, scaffold=self._get_scaffold(black_data))
-        board.fen_cts = defaultdict(
-            int, {truncate_fen(board.get_fen(internal=True)): 1}
-        )
+        board.position_cts = defaultdict(int, {board.zobrist.key: 1})
 
         return board
 
-    def from_fen(
-        self,
-        text: str,
-        white_agent_cls: Optional[Type["Agent"]] = ManualAgent,
-        black_agent_cls: Optional[Type["Agent"]] = ManualAgent,
-        max_fullmoves: Optional[int] = 300,
-    ) -> Board:
-        fen = FEN(text=text)
+    @staticmethod
+    def _get_fen_data(fen: FEN) -> Tuple[List[PieceScaffold], List[PieceScaffold]]:
         iter_squares = iter(constants.SQUARES_LIST)
+        castling_rights = fen.castling_rights
         white_data = []
         black_data = []
 
         for ch in fen.piece_placement:
             if ch == "/":
                 continue
-            elif re.match(r"\d", ch):
+            elif ch.isdigit():
                 next(itertools.islice(iter_squares, int(ch) - 1, None))
                 continue
 
             x, y = next(iter_squares)
             scaffold = {"piece_type": SYMBOLS_MAP[ch], "x": x, "y": y}
 
-            if scaffold["piece_type"] in (Rook, King) and (x, y) in fen.castling_rights:
-                scaffold["has_moved"] = not fen.castling_rights[x, y]
+            if scaffold["piece_type"] in (Rook, King):
+                # Off the castling squares, they must have moved
+                scaffold["has_moved"] = not castling_rights.get((x, y), False)
             if ch.islower():
                 black_data.append(scaffold)
             else:
                 white_data.append(scaffold)
 
+        return white_data, black_data
+
+    def from_fen(
+        self,
+        text: str,
+        white_agent_cls: Optional[Type["Agent"]] = ManualAgent,
+        black_agent_cls: Optional[Type["Agent"]] = ManualAgent,
+        max_fullmoves: Optional[int] = 300,
+    ) -> Board:
+        fen = FEN(text=text)
+        white_data, black_data = self._get_fen_data(fen)
+
         board = self._get_board(
             white_agent_cls,
             black_agent_cls,
@@ -204,39 +208,105 @@ class BoardBuilder:
             halfmove_clock=fen.halfmove_clock,
             fullmove_number=fen.fullmove_number,
         )
-        board.fen_cts = defaultdict(int, {truncate_fen(text): 1})
         if fen.en_passant_target:
             inactive_agent = board.white if fen.active_color == "b" else board.black
             inactive_agent.en_passant_target = fen.en_passant_target
 
         self._set_pieces(agent=board.white, scaffold=self._get_scaffold(white_data))
         self._set_pieces(agent=board.black, scaffold=self._get_scaffold(black_data))
+        board.position_cts = defaultdict(int, {board.zobrist.key: 1})
 
         return board
 
-    # @classmethod
-    # def from_pgn(
-    #     cls,
-    #     white_agent_cls: Type['Agent'],
-    #     black_agent_cls: Type['Agent'],
-    #     pgn: str,
-    #     max_fullmoves: Optional[int] = 300,
-    # ):
-    #     processor = PGNProcessor(pgn=pgn)
-
-    # TODO what if we want to load a partial game using PGN, then
-    # play it out using RandomAgent? Currently there's no way to do this
-    # We will have to play out the game using a "mock" ManualAgent, then
-    # switch over to the real Agent. Or something like that
-
-    #
-    #     return cls(
-    #         max_fullmoves=max_fullmoves,
-    #         white=white_agent_cls.from_collection(
-    #             color=constants.WHITE, coll=processor.white
-    #         ),
-    #         black=black_agent_cls.from_collection(
-    #             color=constants.BLACK, coll=processor.black
-    #         ),
-    #         game_tree=processor.game_tree,
-    #     )
+    def fields_from_fen(self, text: str) -> Fields:
+        """
+        The position in a FEN, ready to set up on an existing Board (see
+        Board.set_position), so that many positions can be analysed without
+        building Agents and Pieces for each
+        """
+
+        fen = FEN(text=text)
+        positions = []
+        has_moved = {}
+        promotee_types = {}
+
+        for color, data in zip(constants.COLORS, self._get_fen_data(fen)):
+            scaffold = self._get_scaffold(data)
+            for attr in constants.PIECE_ATTRS:
+                datum = scaffold[attr]
+                positions.append((datum["x"], datum["y"]) if datum else None)
+
+            has_moved[color] = {
+                attr: bool(scaffold[attr] and scaffold[attr]["has_moved"])
+                for attr in MOVED_ATTRS
+            }
+            promotee_types[color] = {
+                attr: scaffold[attr]["piece_type"] if scaffold[attr] else None
+                for attr in PROM_ATTRS
+            }
+
+        return Fields(
+            positions=positions,
+            has_moved=has_moved,
+            promotee_types=promotee_types,
+            en_passant_target=fen.en_passant_target,
+            active_color=fen.active_color,
+            halfmove_clock=fen.halfmove_clock,
+            fullmove_number=fen.fullmove_number,
+        )
+
+    def snapshot_from_fen(self, text: str) -> Snapshot:
+        return Snapshot.from_fields(self.fields_from_fen(text))
+
+    def from_pgn(
+        self,
+        pgn: str | PGN,
+        white_agent_cls: Optional[Type["Agent"]] = ManualAgent,
+        black_agent_cls: Optional[Type["Agent"]] = ManualAgent,
+        max_fullmoves: Optional[int] = 300,
+    ) -> Board:
+        """
+        Replay a game's movetext from its starting position. The Agents can be of
+        any type, so a partial game can be loaded and then played out. If the
+        final position isn't over, the result is taken from the PGN.
+        """
+
+        pgn = pgn if isinstance(pgn, PGN) else PGN(text=pgn)
+        kwargs = {
+            "white_agent_cls": white_agent_cls,
+            "black_agent_cls": black_agent_cls,
+            "max_fullmoves": max_fullmoves,
+        }
+        board = (
+            self.from_fen(pgn.fen, **kwargs) if pgn.fen else self.from_start(**kwargs)
+        )
+
+        for i, an_text in enumerate(pgn.moves):
+            try:
+                board.active_agent.move_an(an_text)
+            except NotationError as e:
+                raise NotationError(f'Halfmove {i + 1} ("{an_text}"): {e}') from e
+
+        if board.result is None:
+            # e.g. a resignation, which the position itself doesn't show
+            board.result = game_result(pgn.result)
+
+        return board
+
+    def iter_pgn(
+        self,
+        handle: TextIO,
+        skip_invalid: Optional[bool] = False,
+        **kwargs,
+    ) -> Iterator[Tuple[PGN, Board]]:
+        """
+        Stream games from a PGN file, replaying each one onto a Board. To read
+        only headers and moves without replaying, use main.notation.iter_pgn.
+        """
+
+        for pgn in iter_pgn(handle):
+            try:
+                yield pgn, self.from_pgn(pgn, **kwargs)
+            except (NotationError, BuildError):
+                if not skip_invalid:
+                    raise
@@ -6,6 +6,9 @@ from main.x import A, B, C, D, E, F, G, H
 WHITE = "WHITE"
 BLACK = "BLACK"
 COLORS: List[AgentColor] = ["WHITE", "BLACK"]
+# Halfmove clock at which the game is drawn by the seventy-five-move rule: 75
+# moves by each side without a capture or pawn move
+SEVENTY_FIVE_MOVE_CLOCK = 150
 RANKS = [8, 7, 6, 5, 4, 3, 2, 1]
 FILES = [A, B, C, D, E, F, G, H]
 
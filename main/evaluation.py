@@ -0,0 +1,139 @@
+"""
+Static evaluation: material plus piece-square tables, in centipawns.
+
+Tables are written as seen from White's side of the board (rank 8 on top), one
+row per rank. Values from the "Simplified Evaluation Function":
+https://www.chessprogramming.org/Simplified_Evaluation_Function
+"""
+
+from typing import TYPE_CHECKING, Dict, List
+
+from main import constants
+from main.bitboards import iter_bits
+
+if TYPE_CHECKING:
+    from main.board import Board
+    from main.types import AgentColor
+
+PIECE_VALUES: Dict[str, int] = {
+    "P": 100,
+    "N": 320,
+    "B": 330,
+    "R": 500,
+    "Q": 900,
+    "K": 0,
+}
+
+# fmt: off
+_PAWN = [
+     0,   0,   0,   0,   0,   0,   0,   0,
+    50,  50,  50,  50,  50,  50,  50,  50,
+    10,  10,  20,  30,  30,  20,  10,  10,
+     5,   5,  10,  25,  25,  10,   5,   5,
+     0,   0,   0,  20,  20,   0,   0,   0,
+     5,  -5, -10,   0,   0, -10,  -5,   5,
+     5,  10,  10, -20, -20,  10,  10,   5,
+     0,   0,   0,   0,   0,   0,   0,   0,
+]
+_KNIGHT = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+]
+_BISHOP = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+]
+_ROOK = [
+     0,   0,   0,   0,   0,   0,   0,   0,
+     5,  10,  10,  10,  10,  10,  10,   5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+     0,   0,   0,   5,   5,   0,   0,   0,
+]
+_QUEEN = [
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+]
+_KING = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+]
+# fmt: on
+
+
+def _by_square(table: List[int], color: "AgentColor") -> List[int]:
+    """
+    Reindex a table by square index (a1 = 0 ... h8 = 63). The tables above start
+    at a8, so White flips the rank (sq ^ 56); Black reads them as they are.
+    """
+
+    flip = 56 if color == constants.WHITE else 0
+    return [table[sq ^ flip] for sq in range(64)]
+
+
+# Material folded into the tables, so a single lookup scores a piece
+PIECE_SQUARE_VALUES: Dict["AgentColor", Dict[str, List[int]]] = {
+    color: {
+        symbol: [PIECE_VALUES[symbol] + v for v in _by_square(table, color)]
+        for symbol, table in (
+            ("P", _PAWN),
+            ("N", _KNIGHT),
+            ("B", _BISHOP),
+            ("R", _ROOK),
+            ("Q", _QUEEN),
+            ("K", _KING),
+        )
+    }
+    for color in constants.COLORS
+}
+
+
+def score(board: "Board", color: "AgentColor") -> int:
+    """
+    Material and placement of `color`'s pieces
+    """
+
+    total = 0
+    tables = PIECE_SQUARE_VALUES[color]
+    for symbol, mask in board.bitboards.pieces[color].items():
+        table = tables[symbol]
+        for sq in iter_bits(mask):
+            total += table[sq]
+
+    return total
+
+
+def evaluate(board: "Board") -> int:
+    """
+    Centipawn score from the point of view of the side to move
+    """
+
+    white = score(board, constants.WHITE) - score(board, constants.BLACK)
+    return white if board.active_color == "w" else -white
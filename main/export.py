@@ -0,0 +1,136 @@
+"""
+Headless export of games as PGN (and positions as FEN): plain text only, no
+printing, colors or clipboard, so many games can be written out in bulk, e.g.
+
+    with open("games.pgn", "w") as handle:
+        for board in boards:
+            write_pgn(handle, board, {"Event": "Self-play"})
+"""
+
+from datetime import date
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, TextIO
+
+from main import constants
+from main.types import GameResult
+
+if TYPE_CHECKING:
+    from main.board import Board
+
+# The tags every PGN game has, in the order they're written
+SEVEN_TAG_ROSTER = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+# Movetext lines are wrapped to fit in this many characters
+LINE_WIDTH = 79
+
+
+def pgn_result(result: GameResult) -> str:
+    if result is None:
+        return "*"
+    elif result in ("1-0", "0-1"):
+        return result
+    return "1/2-1/2"
+
+
+def game_result(token: str) -> GameResult:
+    """
+    The GameResult for a PGN result token. A drawn game's PGN doesn't say how
+    it was drawn, so that's left to the position where it can be.
+    """
+
+    if token in ("1-0", "0-1"):
+        return token
+    elif token == "1/2-1/2":
+        return "½-½ Agreement"
+    return None
+
+
+def pgn_headers(
+    board: "Board", headers: Optional[Mapping[str, str]] = None
+) -> Dict[str, str]:
+    """
+    The Seven Tag Roster for board's game, with any tags in headers added or
+    overriding the defaults
+    """
+
+    return {
+        "Event": "?",
+        "Site": "?",
+        "Date": date.today().strftime("%Y.%m.%d"),
+        "Round": "?",
+        "White": type(board.white).__name__,
+        "Black": type(board.black).__name__,
+        "Result": pgn_result(board.result),
+        **(headers or {}),
+    }
+
+
+def movetext(
+    board: "Board", width: int = LINE_WIDTH, compact: Optional[bool] = True
+) -> str:
+    """
+    The current line of board's GameTree in SAN, wrapped to `width` characters,
+    ending with the result. Unless compact, every fullmove (and the result) gets
+    a line of its own.
+    """
+
+    tokens = []
+    for i, halfmove in enumerate(board.game_tree):
+        number, _ = halfmove.change["fullmove_number"]
+        if halfmove.color == constants.WHITE:
+            tokens.append(f"{number}. {halfmove.to_an()}")
+        elif i == 0:
+            tokens.append(f"{number}... {halfmove.to_an()}")
+        else:
+            tokens.append(halfmove.to_an())
+    tokens.append(pgn_result(board.result))
+
+    lines = []
+    line = ""
+    for i, token in enumerate(tokens):
+        new_fullmove = i and (token[0].isdigit() or i == len(tokens) - 1)
+        if line and (
+            len(line) + 1 + len(token) > width or (not compact and new_fullmove)
+        ):
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+
+    return "\n".join(lines)
+
+
+def tag_pairs(board: "Board", headers: Optional[Mapping[str, str]] = None) -> str:
+    tags = pgn_headers(board, headers)
+    # Roster tags first, in order, then any others
+    names = [name for name in SEVEN_TAG_ROSTER if name in tags]
+    names += [name for name in tags if name not in SEVEN_TAG_ROSTER]
+
+    return "".join(f'[{name} "{_escape(tags[name])}"]\n' for name in names)
+
+
+def to_pgn(
+    board: "Board",
+    headers: Optional[Mapping[str, str]] = None,
+    compact: Optional[bool] = True,
+) -> str:
+    return f"{tag_pairs(board, headers)}\n{movetext(board, compact=compact)}\n"
+
+
+def to_fen(board: "Board", idx: Optional[float] = None) -> str:
+    return board.get_fen(idx, internal=True)
+
+
+def write_pgn(
+    handle: TextIO, board: "Board", headers: Optional[Mapping[str, str]] = None
+):
+    """
+    Append board's game to an open text file, followed by the blank line that
+    separates games
+    """
+
+    handle.write(to_pgn(board, headers))
+    handle.write("\n")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
@@ -1,9 +1,11 @@
-from typing import Optional
+from typing import List, Optional
 
 from main import constants
+from main.exceptions import NotFoundError
 
 from .fullmove import FullMove
 from .halfmove import HalfMove
+from .node import Node
 
 
 class GameTree:
@@ -12,21 +14,52 @@ class GameTree:
     - Track changes in state for each move
     - Assist with writing algebraic notation
     - Assist with writing FEN
-    - (Future) Assist with strategy/line calculation
+    - Keep variations: lines branching off from earlier positions
+
+    The linked FullMoves (and the halfmoves and fullmoves indexes alongside them,
+    for constant time access) follow the current line: the one the Board has
+    played to reach its position. tree[0] is the first halfmove played, tree[-1]
+    the latest, and slices work as they do for lists.
+
+    Every line ever played is kept in a tree of Nodes from `start`. Stepping
+    back (back) leaves the current line's nodes in the tree, so playing a
+    different move from there starts a variation; prune removes them for good.
+    Every few plies, a Node keeps a Snapshot of its position, so that any ply
+    can be jumped to without replaying the whole line (see Board.jump).
     """
 
     def __init__(self):
         self.root: FullMove = FullMove()
-        self.latest_fullmove: FullMove = self.root
-        self.second_latest_fullmove: Optional[FullMove] = None
-        self.third_latest_fullmove: Optional[FullMove] = None
+        self.halfmoves: List[HalfMove] = []
+        # Every FullMove from the root on, the last being the one being filled
+        self.fullmoves: List[FullMove] = [self.root]
+        self.start: Node = Node()
+        # Nodes of the current line, from start on
+        self.path: List[Node] = [self.start]
+
+    __slots__ = ("root", "halfmoves", "fullmoves", "start", "path")
+
+    def __len__(self) -> int:
+        return len(self.halfmoves)
+
+    def __getitem__(self, ply: int | slice) -> HalfMove | List[HalfMove]:
+        return self.halfmoves[ply]
+
+    @property
+    def cursor(self) -> Node:
+        return self.path[-1]
 
-    __slots__ = (
-        "root",
-        "latest_fullmove",
-        "second_latest_fullmove",
-        "third_latest_fullmove",
-    )
+    @property
+    def latest_fullmove(self) -> FullMove:
+        return self.fullmoves[-1]
+
+    @property
+    def second_latest_fullmove(self) -> Optional[FullMove]:
+        return self.fullmoves[-2] if len(self.fullmoves) > 1 else None
+
+    @property
+    def third_latest_fullmove(self) -> Optional[FullMove]:
+        return self.fullmoves[-3] if len(self.fullmoves) > 2 else None
 
     @classmethod
     def backfill(cls, root: FullMove) -> "GameTree":
@@ -41,20 +74,40 @@ class GameTree:
 
     def append(self, hm: "HalfMove"):
         node = self.latest_fullmove
+        self.halfmoves.append(hm)
+
+        # A move played here before is followed rather than branched off again
+        if child := self.cursor.find_child(hm):
+            child.halfmove = hm
+        else:
+            child = Node(halfmove=hm, parent=self.cursor)
+            self.cursor.children.append(child)
+        self.path.append(child)
 
         if hm.color == constants.WHITE:
             node.white = hm
         else:
             node.black = hm
             # The next FullMove is added once the current node is full
-            self.latest_fullmove = node.child = FullMove()
-            self.third_latest_fullmove = self.second_latest_fullmove
-            self.second_latest_fullmove = node
+            node.child = FullMove()
+            self.fullmoves.append(node.child)
 
     def prune(self):
-        # TODO eventually we might need to prune a branch larger than just one halfmove
-        # (pruning a non-leaf node and its children)
-        # We'll also have to revert to allowing more than one child
+        """
+        Remove the latest halfmove, along with any variations after it
+        """
+
+        node = self.cursor
+        self.back()
+        node.parent.children.remove(node)
+
+    def back(self):
+        """
+        Step the current line back one halfmove, keeping it in the tree
+        """
+
+        self.halfmoves.pop()
+        self.path.pop()
 
         if self.root.child is None:
             self.root.white = None  # Remove first move; we've fully reset the board
@@ -62,32 +115,64 @@ class GameTree:
         elif self.root.child.is_empty():  # Removing second move
             self.root.black = None
             self.root.child = None
-            self.latest_fullmove = self.root
-            self.second_latest_fullmove = None
+            self.fullmoves.pop()
             return
 
         fm = self.second_latest_fullmove
         if fm.child.is_empty():
-            # Pruning a black node
+            # Stepping back over a black halfmove
             fm.black = None
             fm.child = None
-            self.latest_fullmove = self.second_latest_fullmove
-            self.second_latest_fullmove = self.third_latest_fullmove
-            self.third_latest_fullmove = None
+            self.fullmoves.pop()
         else:
-            # Pruning a white node
-            fm.child = FullMove()
-            self.latest_fullmove = fm.child
+            # Stepping back over a white halfmove
+            fm.child = self.fullmoves[-1] = FullMove()
 
     def get_latest_halfmove(self) -> Optional["HalfMove"]:
-        if self.second_latest_fullmove is None:
-            if self.root.black:
-                return self.root.black
-            elif self.root.white:
-                return self.root.white
-        else:
-            fm = self.second_latest_fullmove
-            if fm.child.is_empty():
-                return fm.black
-            else:
-                return fm.child.white
+        return self.halfmoves[-1] if self.halfmoves else None
+
+    def get_halfmove(self, idx: float) -> "HalfMove":
+        """
+        Halfmove by move number, as in movetext: 1 is White's first move, 1.5 is
+        Black's reply, and so on
+        """
+
+        if self.halfmoves:
+            fullmove_number = int(idx)
+            first = self.halfmoves[0]
+            ply = (
+                (fullmove_number - first.change["fullmove_number"][0]) * 2
+                + (idx != fullmove_number)
+                - (first.color == constants.BLACK)
+            )
+            if 0 <= ply < len(self.halfmoves):
+                return self.halfmoves[ply]
+
+        raise NotFoundError(f"Halfmove {idx} not found")
+
+    def promote(self, node: Node):
+        """
+        Make the line through node the mainline, at every branch point above it
+        """
+
+        while node.parent:
+            siblings = node.parent.children
+            siblings.remove(node)
+            siblings.insert(0, node)
+            node = node.parent
+
+    def mainline(self) -> List[HalfMove]:
+        halfmoves = []
+        node = self.start
+        while node.children:
+            node = node.children[0]
+            halfmoves.append(node.halfmove)
+
+        return halfmoves
+
+    def get_node_at_height(self, height: int) -> FullMove:
+        """
+        height of 0 yields a leaf, height of 1 yields second to last node, etc.
+        """
+
+        return self.fullmoves[-1 - height]
@@ -28,7 +28,8 @@ class HalfMove:
             }
         },
         constants.BLACK: {
-            # Denotes an en passant target expiring
+            # Denotes an en passant target expiring. A pawn advancing two squares
+            # sets one for its own Agent, e.g. (None, ('d', 6))
             'en_passant_target': (('d', 6), None),
 
             # Denotes a pawn being captured
@@ -65,7 +66,11 @@ class HalfMove:
 
     @property
     def new_position(self) -> str:
-        pc = [pc for pc in self.change[self.color].values() if pc["new_position"]][0]
+        pc = [
+            pc
+            for key, pc in self.change[self.color].items()
+            if key != "en_passant_target" and pc["new_position"]
+        ][0]
         x, y = pc["new_position"]
 
         return f"{to_str(x)}{str(y)}"
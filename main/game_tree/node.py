@@ -0,0 +1,73 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Optional
+
+from main import constants
+
+from .halfmove import HalfMove
+
+if TYPE_CHECKING:
+    from main.snapshot import Snapshot
+
+
+@dataclass(slots=True, eq=False)
+class Node:
+    """
+    A position in the tree of variations, reached by playing `halfmove` from its
+    parent (the starting position has no halfmove). The first child continues
+    the mainline; any others are variations branching off here. Lines share
+    every node up to where they diverge.
+    """
+
+    halfmove: Optional[HalfMove] = None
+    parent: Optional["Node"] = None
+    children: List["Node"] = field(default_factory=list)
+    # The position here, kept every few plies so it can be jumped to
+    snapshot: Optional["Snapshot"] = None
+
+    def __iter__(self):
+        # This node and every node below it, depth first, mainline first
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    @property
+    def is_mainline(self) -> bool:
+        node = self
+        while node.parent:
+            if node.parent.children[0] is not node:
+                return False
+            node = node.parent
+
+        return True
+
+    def find_child(self, halfmove: HalfMove) -> Optional["Node"]:
+        """
+        The child reached by the same move as halfmove, if it's been played before
+        """
+
+        for child in self.children:
+            if (
+                child.halfmove.color == halfmove.color
+                and child.halfmove.change[constants.WHITE]
+                == halfmove.change[constants.WHITE]
+                and child.halfmove.change[constants.BLACK]
+                == halfmove.change[constants.BLACK]
+            ):
+                return child
+
+        return None
+
+    def line(self) -> List[HalfMove]:
+        """
+        Halfmoves played from the starting position to reach this node
+        """
+
+        halfmoves = []
+        node = self
+        while node.parent:
+            halfmoves.append(node.halfmove)
+            node = node.parent
+
+        return halfmoves[::-1]
@@ -1,15 +1,14 @@
 from typing import TYPE_CHECKING
 
-from tabulate import tabulate
-
 from main.utils import cprint
 
 if TYPE_CHECKING:
     from .fullmove import FullMove
-    from .halfmove import HalfMove
 
 
 def pprint(root: "FullMove"):
+    from tabulate import tabulate
+
     data = []
 
     for node in root:
@@ -30,12 +29,3 @@ def pprint(root: "FullMove"):
         maxcolwidths=[None, 60, 60],
     )
     cprint(table)
-
-
-def get_halfmove(idx: float, root: "FullMove") -> "HalfMove":
-    for node in root:
-        if halfmove := node.black if str(idx).endswith(".5") else node.white:
-            if halfmove.change["fullmove_number"][0] == int(idx):
-                return halfmove
-    else:
-        raise Exception(f"Halfmove {idx} not found")
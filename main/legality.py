@@ -0,0 +1,144 @@
+from typing import TYPE_CHECKING, Dict
+
+from main import constants
+from main.attacks import attacks_from
+from main.bitboards import (
+    BETWEEN,
+    DIAGONALS,
+    KING_ATTACKS,
+    ORTHOGONALS,
+    POSITIONS,
+    SQUARE_BITS,
+    SQUARE_INDEX,
+    iter_bits,
+)
+from main.types import Position
+
+if TYPE_CHECKING:
+    from main.agents import Agent
+    from main.pieces import Piece
+
+ALL_SQUARES = (1 << 64) - 1
+
+
+class KingSafety:
+    """
+    One Agent's King safety in the current position, computed once and cached on
+    the Board until the next applied change.
+
+    Responsibilities:
+    - Know which opponent pieces give check, and which squares resolve it
+    - Know which of my pieces are pinned, and along which line they may still move
+    - Decide whether a pseudo-legal move leaves my King in check, without
+      applying it to the Board
+    - Decide whether I have any legal move at all (for mate and stalemate)
+    """
+
+    def __init__(self, agent: "Agent"):
+        self.agent = agent
+        bitboards = agent.board.bitboards
+        opponent_color = (
+            constants.BLACK if agent.color == constants.WHITE else constants.WHITE
+        )
+        king_sq = SQUARE_INDEX[agent.king.position]
+        between = BETWEEN[king_sq]
+
+        attacks = agent.board.attacks
+        if attacks is None or attacks.is_attacked(agent.king.position, opponent_color):
+            self.checkers = bitboards.attackers(agent.king.position, opponent_color)
+        else:
+            self.checkers = 0
+        if not self.checkers:
+            self.check_mask = ALL_SQUARES
+        elif self.checkers & (self.checkers - 1):
+            self.check_mask = 0  # Double check; only the King can move
+        else:
+            checker_sq = self.checkers.bit_length() - 1
+            self.check_mask = self.checkers | between[checker_sq]
+
+        # Maps the square of each pinned piece to the squares it may move to
+        self.pins: Dict[int, int] = {}
+        occupied = bitboards.occupied
+        own = bitboards.colors[agent.color]
+        opponent = bitboards.pieces[opponent_color]
+        for lines, symbol in ((DIAGONALS, "B"), (ORTHOGONALS, "R")):
+            for slider in iter_bits(
+                (opponent[symbol] | opponent["Q"]) & lines[king_sq]
+            ):
+                blockers = between[slider] & occupied
+                if blockers & own and not blockers & (blockers - 1):
+                    pinned_sq = blockers.bit_length() - 1
+                    self.pins[pinned_sq] = between[slider] | (1 << slider)
+
+    __slots__ = ("agent", "checkers", "check_mask", "pins")
+
+    @property
+    def in_check(self) -> bool:
+        return bool(self.checkers)
+
+    def is_legal(self, piece: "Piece", new_position: Position) -> bool:
+        if piece.fen_symbol == "K":
+            return not piece.is_in_check(new_position)
+        elif (
+            piece.fen_symbol == "P"
+            and new_position[0] != piece.x
+            and new_position == piece.opponent.en_passant_target
+        ):
+            return self._is_legal_en_passant(piece, new_position)
+
+        new_bit = SQUARE_BITS[new_position]
+        if not new_bit & self.check_mask:
+            return False
+
+        pin = self.pins.get(SQUARE_INDEX[piece.position])
+        return pin is None or bool(new_bit & pin)
+
+    def has_legal_move(self) -> bool:
+        """
+        Whether the Agent has any legal move, without listing them: King escapes
+        first, then every other piece's attacked squares masked by check and
+        pins, and only pawns (with their pushes, promotions and en passant) are
+        asked for a moveset
+        """
+
+        agent = self.agent
+        bitboards = agent.board.bitboards
+        own = bitboards.colors[agent.color]
+        king = agent.king
+
+        # Castling can be skipped: it needs the square next to the King to be
+        # empty and unattacked, which is a legal move already
+        for sq in iter_bits(KING_ATTACKS[SQUARE_INDEX[king.position]] & ~own):
+            if not king.is_in_check(POSITIONS[sq]):
+                return True
+        if not self.check_mask:
+            return False  # Double check, and the King can't move
+
+        occupied = bitboards.occupied
+        targets = ~own & self.check_mask
+        pieces = bitboards.pieces[agent.color]
+        for symbol in ("N", "B", "R", "Q"):
+            for sq in iter_bits(pieces[symbol]):
+                moves = attacks_from(agent.color, symbol, sq, occupied) & targets
+                if (pin := self.pins.get(sq)) is not None:
+                    moves &= pin
+                if moves:
+                    return True
+
+        return any(
+            agent.pieces[POSITIONS[sq]].can_move() for sq in iter_bits(pieces["P"])
+        )
+
+    def _is_legal_en_passant(self, piece: "Piece", new_position: Position) -> bool:
+        # En passant removes two pieces from the same rank, which pin detection
+        # can't see, so check this one exactly against the resulting occupancy
+        bitboards = self.agent.board.bitboards
+        captured = SQUARE_BITS[(new_position[0], piece.y)]
+        occupied = (
+            bitboards.occupied & ~SQUARE_BITS[piece.position] & ~captured
+        ) | SQUARE_BITS[new_position]
+        attackers = bitboards.attackers(
+            self.agent.king.position, piece.opponent.color, occupied
+        )
+
+        return not attackers & ~captured
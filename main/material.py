@@ -0,0 +1,65 @@
+from typing import Dict, List
+
+from main import constants
+from main.bitboards import PIECE_SYMBOLS
+from main.types import AgentColor, Position
+
+
+class Material:
+    """
+    How many pieces of each type each Agent has, with bishops also counted by
+    the color of their square, kept in sync by Board.apply_change so that
+    insufficient material can be checked in constant time after every move
+    """
+
+    def __init__(self):
+        self.counts: Dict[AgentColor, Dict[str, int]] = {
+            color: {symbol: 0 for symbol in PIECE_SYMBOLS} for color in constants.COLORS
+        }
+        # Bishops on light squares, then on dark squares, of both Agents
+        self.bishops: List[int] = [0, 0]
+
+    __slots__ = ("counts", "bishops")
+
+    @classmethod
+    def from_agents(cls, *agents) -> "Material":
+        material = cls()
+        for agent in agents:
+            for position, piece in agent.pieces.items():
+                material.add(agent.color, piece.fen_symbol, position)
+
+        return material
+
+    def add(self, color: AgentColor, symbol: str, position: Position):
+        self.counts[color][symbol] += 1
+        if symbol == "B":
+            self.bishops[position in constants.DARK_SQUARES] += 1
+
+    def remove(self, color: AgentColor, symbol: str, position: Position):
+        self.counts[color][symbol] -= 1
+        if symbol == "B":
+            self.bishops[position in constants.DARK_SQUARES] -= 1
+
+    def is_insufficient(self) -> bool:
+        """
+        Whether neither side can ever mate: at most a single knight or bishop
+        left besides the Kings, or only bishops, all on squares of one color
+        """
+
+        white, black = self.counts[constants.WHITE], self.counts[constants.BLACK]
+        if (
+            white["P"]
+            or black["P"]
+            or white["R"]
+            or black["R"]
+            or white["Q"]
+            or black["Q"]
+        ):
+            return False
+
+        knights = white["N"] + black["N"]
+        light, dark = self.bishops
+        if knights + light + dark <= 1:
+            return True
+
+        return not knights and not (light and dark)
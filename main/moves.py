@@ -0,0 +1,178 @@
+from array import array
+from typing import TYPE_CHECKING, List, Optional, Tuple, Type
+
+from main.bitboards import POSITIONS, SQUARE_INDEX
+from main.game_tree import HalfMove
+from main.pieces import Bishop, Knight, Queen, Rook
+from main.types import Promotee, X
+from main.x import to_str
+
+if TYPE_CHECKING:
+    from main.agents import Agent
+    from main.pieces import Piece
+
+PROMOTEE_TYPES = (Queen, Rook, Bishop, Knight)
+
+# (attr, x, y, promotee_type)
+Move = Tuple[str, X, int, Optional[Type[Promotee]]]
+
+# Moves packed into 16 bits: from square (bits 0-5), to square (bits 6-11) and
+# flags (bits 12-15). With the PROMOTION bit set, the low two bits of the flags
+# are the promotee's index into PROMOTEE_TYPES.
+QUIET = 0
+DOUBLE_PAWN_PUSH = 1
+KINGSIDE_CASTLE = 2
+QUEENSIDE_CASTLE = 3
+CAPTURE = 4
+EN_PASSANT = 5
+PROMOTION = 8
+NULL_MOVE = 0
+
+# A list of encoded moves, as filled by generate
+MoveList = array
+
+
+def _flags(piece: "Piece", x: X, y: int) -> int:
+    flags = CAPTURE if (x, y) in piece.opponent.pieces else QUIET
+
+    if piece.fen_symbol == "P":
+        if x != piece.x and not flags:
+            return EN_PASSANT
+        elif abs(y - piece.y) == 2:
+            return DOUBLE_PAWN_PUSH
+        elif piece.is_promotion(y):
+            return flags | PROMOTION
+    elif piece.fen_symbol == "K" and abs(x - piece.x) == 2:
+        return KINGSIDE_CASTLE if x > piece.x else QUEENSIDE_CASTLE
+
+    return flags
+
+
+def generate(agent: "Agent", moves: Optional[MoveList] = None) -> MoveList:
+    """
+    Append every legal move for this Agent to `moves` (a new list by default) as
+    encoded moves, with pawn promotions expanded to each possible promotee
+    """
+
+    if moves is None:
+        moves = array("H")
+
+    opponent_pieces = agent.king.opponent.pieces
+    for piece in list(agent.pieces.values()):
+        from_sq = SQUARE_INDEX[piece.position]
+
+        if piece.fen_symbol not in ("P", "K"):
+            # No special moves, so a capture is the only possible flag
+            for position in piece.get_moveset():
+                code = from_sq | SQUARE_INDEX[position] << 6
+                moves.append(
+                    code | CAPTURE << 12 if position in opponent_pieces else code
+                )
+            continue
+
+        for x, y in piece.get_moveset():
+            code = from_sq | SQUARE_INDEX[(x, y)] << 6 | _flags(piece, x, y) << 12
+            if code >> 12 & PROMOTION:
+                moves.extend(code | i << 12 for i in range(len(PROMOTEE_TYPES)))
+            else:
+                moves.append(code)
+
+    return moves
+
+
+def legal_moves(agent: "Agent") -> List[Move]:
+    """
+    Every legal move for this Agent, with pawn promotions expanded to each
+    possible promotee
+    """
+
+    return [decode(agent, code) for code in generate(agent)]
+
+
+def make_move(agent: "Agent", move: Move) -> HalfMove:
+    attr, x, y, promotee_type = move
+    kwargs = {"promotee_type": promotee_type} if promotee_type else {}
+
+    return getattr(agent, attr).move(x, y, **kwargs)
+
+
+def to_coordinate(code: int) -> str:
+    """
+    Coordinate notation (e.g. e2e4, a7a8q), as used by perft tools and UCI
+    """
+
+    (from_x, from_y), (x, y) = POSITIONS[code & 63], POSITIONS[code >> 6 & 63]
+    flags = code >> 12
+    promotion = PROMOTEE_TYPES[flags & 3].symbol.lower() if flags & PROMOTION else ""
+
+    return f"{to_str(from_x)}{from_y}{to_str(x)}{y}{promotion}"
+
+
+def encode(agent: "Agent", move: Move) -> int:
+    attr, x, y, promotee_type = move
+    piece = getattr(agent, attr)
+    flags = _flags(piece, x, y)
+    if flags & PROMOTION:
+        flags |= PROMOTEE_TYPES.index(promotee_type or Queen)
+
+    return SQUARE_INDEX[piece.position] | SQUARE_INDEX[(x, y)] << 6 | flags << 12
+
+
+def decode(agent: "Agent", code: int) -> Optional[Move]:
+    """
+    The Move for this Agent's piece on the encoded from square, or None if it
+    has no piece there. The move itself is not checked for legality.
+    """
+
+    if code == NULL_MOVE or (piece := agent.pieces.get(POSITIONS[code & 63])) is None:
+        return None
+
+    x, y = POSITIONS[code >> 6 & 63]
+    flags = code >> 12
+
+    return piece.attr, x, y, PROMOTEE_TYPES[flags & 3] if flags & PROMOTION else None
+
+
+def encode_halfmove(halfmove: HalfMove) -> int:
+    """
+    The encoded move a HalfMove made, worked out from its Change alone, so it
+    doesn't need the position it was played from
+    """
+
+    moved = {
+        attr: datum
+        for attr, datum in halfmove.change[halfmove.color].items()
+        if attr != "en_passant_target"
+    }
+    captured = next(
+        (
+            datum
+            for attr, datum in halfmove.change[halfmove.opponent_color].items()
+            if attr != "en_passant_target" and datum["new_position"] is None
+        ),
+        None,
+    )
+
+    if len(moved) == 1:
+        ((attr, datum),) = moved.items()
+        from_position, to_position = datum["old_position"], datum["new_position"]
+        if captured:
+            # Only an en passant capture takes a piece off another square
+            flags = EN_PASSANT if captured["old_position"] != to_position else CAPTURE
+        elif halfmove.change[halfmove.color].get("en_passant_target", (None, None))[1]:
+            flags = DOUBLE_PAWN_PUSH
+        else:
+            flags = QUIET
+    elif "king" in moved:
+        from_position = moved["king"]["old_position"]
+        to_position = moved["king"]["new_position"]
+        flags = KINGSIDE_CASTLE if "h_rook" in moved else QUEENSIDE_CASTLE
+    else:
+        # The pawn leaves the board, and its promotee arrives
+        pawn, promotee = sorted(moved.values(), key=lambda d: d["old_position"] is None)
+        from_position, to_position = pawn["old_position"], promotee["new_position"]
+        flags = PROMOTION | PROMOTEE_TYPES.index(promotee["piece_type"])
+        if captured:
+            flags |= CAPTURE
+
+    return SQUARE_INDEX[from_position] | SQUARE_INDEX[to_position] << 6 | flags << 12
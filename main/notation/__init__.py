@@ -1,2 +1,3 @@
 from .an import AN
 from .fen import FEN
+from .pgn import PGN, iter_pgn
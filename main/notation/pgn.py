@@ -0,0 +1,102 @@
+import re
+from typing import Dict, Iterator, List, TextIO
+
+from main.exceptions import NotationError
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+_HEADER = re.compile(r'^\[\s*(?P<name>\w+)\s+"(?P<value>(?:[^"\\]|\\.)*)"\s*\]\s*$')
+_COMMENT = re.compile(r"\{[^}]*\}|;[^\n]*")
+_VARIATION = re.compile(r"\([^()]*\)")
+_NAG = re.compile(r"\$\d+")
+_MOVE_NUMBER = re.compile(r"\d+\.(\.\.)?")
+_ANNOTATION = re.compile(r"[!?]+$")
+
+
+class PGN:
+    """
+    A single game in Portable Game Notation. Comments, variations, NAGs and
+    annotation glyphs (!, ?) are dropped; only the mainline is kept.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.headers: Dict[str, str] = {}
+        movetext = []
+
+        for line in text.splitlines():
+            if match := _HEADER.match(line.strip()):
+                self.headers[match.group("name")] = match.group("value")
+            elif not line.startswith("%"):  # Escaped lines are ignored
+                movetext.append(line)
+
+        self.moves: List[str] = []
+        self.result = self.headers.get("Result", "*")
+
+        for token in self._tokenize("\n".join(movetext)):
+            if token in RESULTS:
+                self.result = token
+            else:
+                self.moves.append(token)
+
+    def __repr__(self) -> str:
+        white, black = self.headers.get("White", "?"), self.headers.get("Black", "?")
+        return f"<PGN {white} vs {black}: {len(self.moves)} halfmoves, {self.result}>"
+
+    @staticmethod
+    def _tokenize(movetext: str) -> List[str]:
+        movetext = _COMMENT.sub(" ", movetext)
+        while (stripped := _VARIATION.sub(" ", movetext)) != movetext:
+            movetext = stripped  # Innermost variations first
+        if "(" in movetext or ")" in movetext:
+            raise NotationError("Unbalanced variation in movetext")
+
+        movetext = _MOVE_NUMBER.sub(" ", _NAG.sub(" ", movetext))
+        tokens = []
+
+        for token in movetext.split():
+            if token == "e.p.":
+                continue
+            elif token not in RESULTS:
+                token = _ANNOTATION.sub("", token)
+                if token.startswith("0-0"):
+                    token = token.replace("0", "O")
+            tokens.append(token)
+
+        return tokens
+
+    @property
+    def fen(self) -> str | None:
+        """
+        Starting position, if the game doesn't start from the initial one
+        """
+
+        return self.headers.get("FEN")
+
+
+def iter_pgn(handle: TextIO) -> Iterator[PGN]:
+    """
+    Yield games one at a time from a (possibly huge) PGN file, reading it line
+    by line. Only the game being read is held in memory.
+    """
+
+    lines: List[str] = []
+    in_movetext = False
+    open_comments = 0
+
+    for line in handle:
+        stripped = line.strip()
+
+        if stripped.startswith("[") and in_movetext and not open_comments:
+            # Tag pair after movetext starts the next game
+            yield PGN("".join(lines))
+            lines, in_movetext = [], False
+        elif stripped and not stripped.startswith("["):
+            in_movetext = True
+
+        if in_movetext:
+            open_comments += line.count("{") - line.count("}")
+        lines.append(line)
+
+    if any(line.strip() for line in lines):
+        yield PGN("".join(lines))
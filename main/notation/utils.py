@@ -1,2 +0,0 @@
-def truncate_fen(fen: str) -> str:
-    return " ".join(fen.split(" ")[0:4])
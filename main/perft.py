@@ -0,0 +1,100 @@
+"""
+Perft: count the leaf nodes of the legal move tree from a position. Used to
+verify move generation against known reference counts, and to benchmark it.
+
+Usage:
+    python -m main.perft 3
+    python -m main.perft 2 --fen "<FEN>" --divide
+"""
+
+import argparse
+import time
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
+
+from main.builders import BoardBuilder
+from main.moves import generate, to_coordinate
+
+if TYPE_CHECKING:
+    from main.board import Board
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+class PerftResult(NamedTuple):
+    nodes: int
+    seconds: float
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.seconds if self.seconds else float("inf")
+
+
+def perft(board: "Board", depth: int) -> int:
+    if depth == 0:
+        return 1
+
+    agent = board.active_agent
+    moves = generate(agent)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for code in moves:
+        board.make(code)
+        nodes += perft(board, depth - 1)
+        board.unmake()
+
+    return nodes
+
+
+def divide(board: "Board", depth: int) -> Dict[str, int]:
+    """
+    Perft split by root move, for narrowing down where a count goes wrong
+    """
+
+    agent = board.active_agent
+    counts = {}
+
+    with board.untracked_attacks():
+        for code in generate(agent):
+            board.make(code)
+            counts[to_coordinate(code)] = perft(board, depth - 1)
+            board.unmake()
+
+    return counts
+
+
+def timed_perft(board: "Board", depth: int) -> PerftResult:
+    start = time.perf_counter()
+    with board.untracked_attacks():
+        nodes = perft(board, depth)
+
+    return PerftResult(nodes=nodes, seconds=time.perf_counter() - start)
+
+
+def main(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Count legal move tree leaves")
+    parser.add_argument("depth", type=int)
+    parser.add_argument("--fen", default=START_FEN)
+    parser.add_argument("--divide", action="store_true")
+    parsed = parser.parse_args(args)
+
+    board = BoardBuilder().from_fen(parsed.fen)
+
+    if parsed.divide:
+        start = time.perf_counter()
+        counts = divide(board, parsed.depth)
+        result = PerftResult(sum(counts.values()), time.perf_counter() - start)
+        for text, nodes in sorted(counts.items()):
+            print(f"{text}: {nodes}")
+        print()
+    else:
+        result = timed_perft(board, parsed.depth)
+
+    print(f"Nodes: {result.nodes}")
+    print(f"Time (s): {result.seconds:.3f}")
+    print(f"Nodes per second: {result.nps:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 
 from main import constants
-from main.pieces.utils import vector
+from main.pieces.utils import build_rays, vector
 from main.types import Position, X
 
 from .piece import Piece
@@ -17,6 +17,7 @@ class Bishop(Piece):
         [(-p, p) for p in range(1, 9)],
         [(-p, -p) for p in range(1, 9)],
     ]
+    rays = build_rays(movements)
     symbol = "B"
     fen_symbol = symbol
     value = 3
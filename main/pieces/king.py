@@ -1,13 +1,11 @@
 from typing import TYPE_CHECKING, Optional, Set, Tuple
 
 from main import constants
-from main.game_tree import HalfMove
-from main.pieces.utils import vector
+from main.bitboards import SQUARE_BITS
+from main.pieces.utils import build_rays, vector
 from main.types import Change, Position, X
 from main.x import A, C, D, E, F, G, H
 
-from .knight import Knight
-from .pawn import BlackPawn, WhitePawn
 from .piece import Piece
 from .rook import Rook
 
@@ -26,6 +24,7 @@ class King(Piece):
         [(-1, 1)],
         [(-1, -1)],
     ]
+    rays = build_rays(movements)
     symbol = "K"
     fen_symbol = symbol
     value = 0
@@ -54,18 +53,19 @@ class King(Piece):
             rook is None
             or rook.has_moved
             or self.has_moved
-            or self.is_in_check()
+            or self.agent.king_safety.in_check
             or self.is_blocked((rook.x, rook.y))
         ):
             return None, False
 
+        # The King isn't in check, so nothing can attack these squares through it
         if rook.x == A:  # Queenside
-            castle_through_check = self.is_in_check((D, self.y))
-            castle_into_check = self.is_in_check((C, self.y))
+            castle_through_check = self._is_attacked((D, self.y))
+            castle_into_check = self._is_attacked((C, self.y))
             new_king_xpos = C
         else:  # Kingside
-            castle_through_check = self.is_in_check((F, self.y))
-            castle_into_check = self.is_in_check((G, self.y))
+            castle_through_check = self._is_attacked((F, self.y))
+            castle_into_check = self._is_attacked((G, self.y))
             new_king_xpos = G
 
         return new_king_xpos, (not castle_through_check and not castle_into_check)
@@ -85,7 +85,9 @@ class King(Piece):
             elif new_x == G:
                 _, can_castle = self._can_castle(self.agent.h_rook)
                 return can_castle
-        elif not self.is_valid_movement(new_position) or self.is_in_check(new_position):
+        elif not self.is_valid_movement(new_position) or self.leaves_king_in_check(
+            new_position
+        ):
             return False
 
         return True
@@ -108,54 +110,54 @@ class King(Piece):
     def is_in_check(self, target_position: Optional[Position] = None) -> bool:
         """
         This is used in several different ways:
-        1. To ensure a move from this King's agent would not leave this King in check
-        (direct checks, pins)
-        2. By the opponent agent to see if they've checked this King
+        1. By the opponent agent to see if they've checked this King
         (direct checks, discoveries)
-        3. To prevent castling out of check
-        4. To prevent castling through check
-        5. To prevent this King from moving into check
+        2. To prevent this King from moving into check
 
-        1, 2, and 3 evaluate King safety based on its current position.
+        1 evaluates King safety based on its current position. (Whether moves
+        from my other pieces expose this King is answered by KingSafety, which
+        also prevents castling out of check.)
 
-        4 and 5 evaluate based on a new, target position. For this we must apply
-        and rollback the target move so that King safety is evaluated using that
-        future King position. Otherwise, we allow for Kings to illegally move
-        'backwards' when skewered, because is_blocked interprets the King as being
-        'blocked' by itself.
+        2 evaluates based on a new, target position. For this we lift the
+        King off the board before testing the target square. Otherwise, we allow
+        for Kings to illegally move 'backwards' when skewered, because the King
+        would be interpreted as blocking the attack on the square behind it.
+        That can only happen while in check, so otherwise the attack map answers.
         """
 
         if target_position:
-            change = self.construct_change(*target_position, augment=False)
-            halfmove = HalfMove(color=self.agent.color, change=change)
+            if not self.agent.king_safety.in_check:
+                return self._is_attacked(target_position)
 
-            self.agent.board.apply_halfmove(halfmove)
-            is_capturable = self._is_capturable()
-            self.agent.board.rollback_halfmove(halfmove)
-        else:
-            is_capturable = self._is_capturable()
+            bitboards = self.agent.board.bitboards
+            occupied = bitboards.occupied & ~SQUARE_BITS[self.position]
+            return bitboards.is_attacked(target_position, self.opponent.color, occupied)
 
-        return is_capturable
+        return self._is_capturable()
 
     def _is_capturable(self) -> bool:
-        for piece in self.opponent.pieces.values():
-            if isinstance(piece, (WhitePawn, BlackPawn)):
-                skip = not piece.is_capture((self.x, self.y))
-            else:
-                skip = not piece.is_valid_vector((self.x, self.y))
-            if skip:
-                continue
-
-            if isinstance(piece, (Knight, King)):
-                return True
-            elif isinstance(piece, (WhitePawn, BlackPawn)):
-                if piece.is_capture((self.x, self.y)):
-                    return True
-            else:
-                if not piece.is_blocked((self.x, self.y)):
-                    return True
-
-        return False
+        return self._is_attacked(self.position)
+
+    def _is_attacked(self, position: Position) -> bool:
+        if (attacks := self.agent.board.attacks) is not None:
+            return attacks.is_attacked(position, self.opponent.color)
+        return self.agent.board.bitboards.is_attacked(position, self.opponent.color)
+
+    def gives_check(self, new_position: Position) -> bool:
+        if not self.is_castle(new_position):
+            return super().gives_check(new_position)
+
+        # Only the Rook can give check when castling
+        rook_x, new_rook_x = (A, D) if new_position[0] == C else (H, F)
+        return self.agent.board.attacks.gives_check(
+            self.agent.color,
+            "R",
+            (rook_x, self.y),
+            (new_rook_x, self.y),
+            self.opponent.king.position,
+            vacated=SQUARE_BITS[self.position],
+            filled=SQUARE_BITS[new_position],
+        )
 
     def get_disambiguation(self, x: X, y: int) -> str:
         return ""
@@ -1,4 +1,4 @@
-from main.pieces.utils import vector
+from main.pieces.utils import build_rays, vector
 from main.types import Position
 
 from .piece import Piece
@@ -15,6 +15,7 @@ class Knight(Piece):
         [(-2, -1)],
         [(-1, -2)],
     ]
+    rays = build_rays(movements)
     symbol = "N"
     fen_symbol = symbol
     value = 3
@@ -28,10 +29,7 @@ class Knight(Piece):
     def is_valid_move(self, new_position: Position) -> bool:
         if not self.is_valid_movement(new_position):
             return False
-        elif self.king_would_be_in_check(
-            king=self.king,
-            new_position=new_position,
-        ):
+        elif self.leaves_king_in_check(new_position):
             return False
 
         return True
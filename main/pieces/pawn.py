@@ -1,9 +1,8 @@
-from typing import Dict, List
+from typing import Dict
 
-from main import constants
-from main.game_tree import HalfMove
-from main.pieces.utils import vector
-from main.types import Change, Position, Vector, X
+from main.bitboards import SQUARE_BITS
+from main.pieces.utils import build_rays
+from main.types import Change, Position, X
 
 from .piece import Piece
 from .queen import Queen
@@ -21,10 +20,15 @@ class Pawn(Piece):
         return self.agent.pieces | self.opponent.pieces
 
     def is_valid_vector(self, new_position: Position) -> bool:
-        vec = vector((self.x, self.y), new_position)
-        if self.y == self.y_init:
-            return vec in {(0, 1), (0, 2)}
-        return vec == (0, 1)
+        x, y = new_position
+        # Pawns only move forward, unlike the other pieces
+        steps = y - self.y if self.y_init == 2 else self.y - y
+
+        if x != self.x:
+            return False
+        elif self.y == self.y_init:
+            return steps in {1, 2}
+        return steps == 1
 
     def is_capture(self, new_position: Position) -> bool:
         raise NotImplementedError
@@ -35,20 +39,12 @@ class Pawn(Piece):
                 new_position in self.opponent.pieces
                 or new_position == self.opponent.en_passant_target
             ):
-                if self.king_would_be_in_check(
-                    king=self.king,
-                    new_position=new_position,
-                ):
-                    return False
-                return True
+                return not self.leaves_king_in_check(new_position)
             return False
 
         return super().is_valid_move(new_position)
 
     def is_valid_candidate(self, candidate: Position) -> bool:
-        if candidate not in constants.SQUARES:
-            return False
-
         if self.is_capture(candidate):
             return (
                 candidate in self.opponent.pieces
@@ -57,12 +53,34 @@ class Pawn(Piece):
         else:
             return candidate not in self.forbidden_squares
 
+    def gives_check(self, new_position: Position) -> bool:
+        x, y = new_position
+        vacated = 0
+        if x != self.x and new_position == self.opponent.en_passant_target:
+            vacated = SQUARE_BITS[(x, self.y)]
+
+        return self.agent.board.attacks.gives_check(
+            self.agent.color,
+            # Promotions are to a Queen unless told otherwise, see augment_change
+            "Q" if self.is_promotion(y) else self.fen_symbol,
+            self.position,
+            new_position,
+            self.opponent.king.position,
+            vacated=vacated,
+        )
+
     def get_disambiguation(self, x: X, y: int) -> str:
         return ""
 
     def augment_change(self, x: X, y: int, change: Change, **kwargs) -> Change:
         change["halfmove_clock"] = (self.agent.board.halfmove_clock, 0)
 
+        if abs(self.y - y) == 2:
+            change[self.agent.color]["en_passant_target"] = (
+                None,
+                (self.x, (self.y + y) // 2),
+            )
+
         if (x, y) == self.opponent.en_passant_target:
             piece = self.opponent.get_by_position(x, self.y)
             change[self.opponent.color] = {
@@ -76,10 +94,9 @@ class Pawn(Piece):
             return change
 
         if "promotee_type" not in kwargs:
-            # If king_would_be_in_check is testing a promotion move, we must provide a piece type.
-            # Just assume Queen in this case. Or, if a promotee_value is not provided,
-            # also just assume Queen. You could play a decade of chess and never find a
-            # situation where you need a Knight. This is fine for our purposes.
+            # If a promotee_type is not provided, just assume Queen. You could
+            # play a decade of chess and never find a situation where you need a
+            # Knight. This is fine for our purposes.
             promotee_type = Queen
         else:
             # Let's also assume that whatever client is sending the move knows
@@ -95,15 +112,6 @@ class Pawn(Piece):
 
         return change
 
-    def set_en_passant_target(self, y: int):
-        if abs(self.y - y) == 2:
-            target_y = int((self.y + y) / 2)
-            self.agent.en_passant_target = (self.x, target_y)
-
-    def move(self, x: X, y: int, **kwargs) -> HalfMove:
-        self.set_en_passant_target(y=y)
-        return super().move(x, y, **kwargs)
-
     @staticmethod
     def is_promotion(y: int) -> bool:
         return y in (1, 8)
@@ -111,6 +119,10 @@ class Pawn(Piece):
 
 class WhitePawn(Pawn):
     y_init = 2
+    rays = build_rays(
+        lambda position: [[(0, 1), (0, 2)] if position[1] == 2 else [(0, 1)]]
+        + [[(1, 1)], [(-1, 1)]]
+    )
 
     __slots__ = ("attr", "agent", "x", "y")
 
@@ -120,15 +132,13 @@ class WhitePawn(Pawn):
             (self.x - 1, self.y + 1),
         }
 
-    @property
-    def movements(self) -> List[List[Vector]]:
-        if self.y == self.y_init:
-            return [[(0, 1), (0, 2)]] + [[(1, 1)], [(-1, 1)]]
-        return [[(0, 1)]] + [[(1, 1)], [(-1, 1)]]
-
 
 class BlackPawn(Pawn):
     y_init = 7
+    rays = build_rays(
+        lambda position: [[(0, -1), (0, -2)] if position[1] == 7 else [(0, -1)]]
+        + [[(1, -1)], [(-1, -1)]]
+    )
 
     __slots__ = ("attr", "agent", "x", "y")
 
@@ -137,9 +147,3 @@ class BlackPawn(Pawn):
             (self.x + 1, self.y - 1),
             (self.x - 1, self.y - 1),
         }
-
-    @property
-    def movements(self) -> List[List[Vector]]:
-        if self.y == self.y_init:
-            return [[(0, -1), (0, -2)]] + [[(1, -1)], [(-1, -1)]]
-        return [[(0, -1)]] + [[(1, -1)], [(-1, -1)]]
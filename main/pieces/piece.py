@@ -1,10 +1,10 @@
 from functools import cached_property
-from itertools import zip_longest
 from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
 from main import constants
+from main.bitboards import SQUARE_INDEX
 from main.game_tree import HalfMove
-from main.pieces.utils import vector
+from main.pieces.utils import Rays
 from main.types import Change, GameResult, LookaheadResults, Position, Vector, X
 from main.x import to_str
 
@@ -31,6 +31,7 @@ class Piece:
         self.y = y
 
     movements: List[List[Vector]] = NotImplemented
+    rays: Rays = NotImplemented
     symbol: str = NotImplemented
     fen_symbol: str = NotImplemented
     value: int = NotImplemented
@@ -68,54 +69,30 @@ class Piece:
         return True
 
     def is_blocked(self, target_position: Position) -> bool:
-        if vector((self.x, self.y), target_position) in {(1, 1), (0, 1), (1, 0)}:
-            return False
-
-        target_x, target_y = target_position
-        step_x = 1 if self.x < target_x else -1
-        step_y = 1 if self.y < target_y else -1
-        x_range = range(self.x + step_x, target_x, step_x)
-        y_range = range(self.y + step_y, target_y, step_y)
-        fillvalue = self.x if not x_range else self.y
-
-        _zip = zip_longest(x_range, y_range, fillvalue=fillvalue)
-        squares_on_path = set(_zip)
-
-        return bool(squares_on_path & (self.agent.positions | self.opponent.positions))
+        return self.agent.board.bitboards.is_blocked(self.position, target_position)
 
     def is_valid_move(self, new_position: Position) -> bool:
         if not self.is_valid_movement(new_position):
             return False
         elif self.is_blocked(new_position):
             return False
-        elif self.king_would_be_in_check(
-            king=self.king,
-            new_position=new_position,
-        ):
+        elif self.leaves_king_in_check(new_position):
             return False
 
         return True
 
     def is_valid_candidate(self, candidate: Position) -> bool:
-        if candidate not in constants.SQUARES:
-            return False
-
         return candidate not in self.forbidden_squares
 
     def get_moveset(self, lazy: Optional[bool] = False) -> Set[Position]:
         moveset = set()
 
-        for batch in self.movements:
-            for x_d, y_d in batch:
-                candidate = (self.x + x_d, self.y + y_d)
-
+        for ray in self.rays[SQUARE_INDEX[(self.x, self.y)]]:
+            for candidate in ray:
                 if not self.is_valid_candidate(candidate):
                     break  # Blocked, abort the batch
                 else:
-                    if not self.king_would_be_in_check(
-                        king=self.king,
-                        new_position=candidate,
-                    ):
+                    if not self.leaves_king_in_check(candidate):
                         moveset.add(candidate)
                         if lazy:
                             return moveset
@@ -159,65 +136,61 @@ class Piece:
         # Remove duplicate characters, then sort them (e.g. 3c -> c3)
         return "".join(sorted(set(disambiguation), reverse=True))
 
-    def king_would_be_in_check(
-        self,
-        king: "King",
-        new_position: Optional[Position] = None,
-        change: Optional[Change] = None,
-    ) -> bool:
-        # If we're constructing a new change, it means we're verifying King
-        # safety for this Agent. Skip augmentations in this case - they can't
-        # affect safety of my own king for this move, which is all we care
-        # about here. Otherwise, this method will infinitely recurse.
-        change = change or self.construct_change(*new_position, augment=False)
+    def leaves_king_in_check(self, new_position: Position) -> bool:
+        """
+        Would moving to new_position expose my own King? Answered from the cached
+        checkers and pins of this position, so the Board is never touched.
+        """
 
-        halfmove = HalfMove(color=self.agent.color, change=change)
-        self.agent.board.apply_halfmove(halfmove)
-        in_check = king.is_in_check()
-        self.agent.board.rollback_halfmove(halfmove)
+        return not self.agent.king_safety.is_legal(self, new_position)
+
+    def gives_check(self, new_position: Position) -> bool:
+        """
+        Would moving to new_position check the opponent's King? Answered from the
+        Board's attack map, without applying the move, so it can't be used inside
+        Board.untracked_attacks.
+        """
 
-        return in_check
+        return self.agent.board.attacks.gives_check(
+            self.agent.color,
+            self.fen_symbol,
+            self.position,
+            new_position,
+            self.opponent.king.position,
+        )
 
-    def get_game_result(self, check: bool, fen: str) -> GameResult:
-        if check and not self.opponent.can_move():
+    def get_game_result(self, check: bool) -> GameResult:
+        if not self.opponent.can_move():
+            if not check:
+                return "½-½ Stalemate"
             return "1-0" if self.agent.color == constants.WHITE else "0-1"
-        elif (
-            # .can_move() is computationally expensive; stalemate is
-            # likely impossible until move 10, and in practice won't be
-            # reached until much later than that (15+)
-            # https://en.wikipedia.org/wiki/List_of_world_records_in_chess#:~:text=The%20shortest%20known%20stalemate%2C%20composed,Qh5%20Ra6%203.
-            # 1.e3 a5 2.Qh5 Ra6 3.Qxa5 h5 4.Qxc7 Rah6 5.h4 f6 6.Qxd7+ Kf7
-            # 7.Qxb7 Qd3 8.Qxb8 Qh7 9.Qxc8 Kg6 10.Qe6 ½-½
-            self.agent.board.fullmove_number >= 10
-            and not self.opponent.can_move()
-        ):
-            return "½-½ Stalemate"
-        elif (
-            # Safe guess...probably not possible to capture 28 pieces in 20 moves?
-            self.agent.board.fullmove_number >= 20
-            and self.agent.board.has_insufficient_material()
-        ):
+        elif self.agent.board.has_insufficient_material():
             return "½-½ Insufficient material"
-        elif self.agent.board.draw_by_repetition(fen):
+        elif self.agent.board.draw_by_repetition():
             return "½-½ Repetition"
-        elif self.agent.board.halfmove_clock == 125:
+        elif self.agent.board.draw_by_seventy_five_move_rule():
             return "½-½ Seventy-five-move rule"
         return None
 
-    def get_lookahead_results(self, change: Change, **kwargs) -> LookaheadResults:
-        halfmove = HalfMove(color=self.agent.color, change=change)
-        self.agent.board.apply_halfmove(halfmove)
+    def get_results(self, **kwargs) -> LookaheadResults:
+        """
+        Check, FEN and game result of the position on the board, which must have
+        just been reached by a move of this Piece's Agent
+        """
 
         check: bool = kwargs.get("check") or self.opponent.king.is_in_check()
-        fen = self.agent.board.get_fen(
-            internal=True, rows_changing=change["rows_changing"]
-        )
-        game_result = self.get_game_result(check=check, fen=fen)
-
-        self.agent.board.rollback_halfmove(halfmove)
+        fen = self.agent.board.get_fen(internal=True)
+        game_result = self.get_game_result(check=check)
 
         return {"check": check, "fen": fen, "game_result": game_result}
 
+    def get_lookahead_results(self, change: Change, **kwargs) -> LookaheadResults:
+        self.agent.board.apply_change(change)
+        results = self.get_results(**kwargs)
+        self.agent.board.revert_change(change)
+
+        return results
+
     def augment_change(self, x: X, y: int, change: Change, **kwargs) -> Change:
         """
         Piece specific augmentations/side effects: castling, promotions, etc.
@@ -229,8 +202,15 @@ class Piece:
         x: X,
         y: int,
         augment: Optional[bool] = True,
+        lookahead: Optional[bool] = True,
         **kwargs,
     ) -> Change:
+        """
+        With lookahead=False the change is complete enough to apply and roll back
+        (e.g. while searching), but has no notation, FEN, or game result, and so
+        does not count towards repetition.
+        """
+
         color = self.agent.color
         opponent_color = self.opponent.color
         board = self.agent.board
@@ -265,8 +245,6 @@ class Piece:
 
         if augment:
             change = self.augment_change(x, y, change, **kwargs)
-            change["disambiguation"] = self.get_disambiguation(x, y)
-            change["rows_changing"] = {self.y, y}
 
             if self.opponent.en_passant_target:
                 change[opponent_color]["en_passant_target"] = (
@@ -274,6 +252,11 @@ class Piece:
                     None,
                 )
 
+            if not lookahead:
+                return change
+
+            change["disambiguation"] = self.get_disambiguation(x, y)
+
             # These must be computed after the piece-specific augmentations in
             # augment_change because castling and promotion create new possibilities
             change = change | self.get_lookahead_results(change=change, **kwargs)
@@ -281,8 +264,20 @@ class Piece:
         return change
 
     def move(self, x: X, y: int, **kwargs) -> HalfMove:
-        change = self.construct_change(x, y, **kwargs)
+        board = self.agent.board
+        if not board.lazy_results:
+            change = self.construct_change(x, y, **kwargs)
+            halfmove = HalfMove(color=self.agent.color, change=change)
+            board.apply_halfmove(halfmove)
+
+            return halfmove
+
+        # Results are only computed once the move is on the board, which saves
+        # applying and rolling it back just to look at the position it leads to
+        change = self.construct_change(x, y, lookahead=False, **kwargs)
+        change["disambiguation"] = self.get_disambiguation(x, y)
         halfmove = HalfMove(color=self.agent.color, change=change)
-        self.agent.board.apply_halfmove(halfmove)
+        board.apply_halfmove(halfmove)
+        board.record_results(halfmove, self.get_results(**kwargs))
 
         return halfmove
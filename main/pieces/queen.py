@@ -1,4 +1,4 @@
-from main.pieces.utils import vector
+from main.pieces.utils import build_rays, vector
 from main.types import Position
 
 from .bishop import Bishop
@@ -8,6 +8,7 @@ from .rook import Rook
 
 class Queen(Piece):
     movements = Bishop.movements + Rook.movements
+    rays = build_rays(movements)
     symbol = "Q"
     fen_symbol = symbol
     value = 9
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING, Optional
 
 from main import constants
-from main.pieces.utils import vector
+from main.pieces.utils import build_rays, vector
 from main.types import Change, Position, X
 from main.x import A, H
 
@@ -18,6 +18,7 @@ class Rook(Piece):
         [(0, p) for p in range(1, 9)],
         [(0, -p) for p in range(1, 9)],
     ]
+    rays = build_rays(movements)
     symbol = "R"
     fen_symbol = symbol
     value = 5
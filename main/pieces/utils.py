@@ -1,8 +1,41 @@
+from typing import Callable, List, Tuple, Union
+
+from main.bitboards import POSITIONS, SQUARE_INDEX
 from main.types import Position, Vector
 
+Movements = List[List[Vector]]
+# RAYS[sq] holds, for the square indexed sq (see main.bitboards.SQUARE_INDEX),
+# the on-board squares reached by each batch of movements, nearest first
+Rays = List[Tuple[Tuple[Position, ...], ...]]
+
 
 def vector(position: Position, other: Position) -> Vector:
     x, y = position
     other_x, other_y = other
 
     return abs(x - other_x), abs(y - other_y)
+
+
+def build_rays(movements: Union[Movements, Callable[[Position], Movements]]) -> Rays:
+    """
+    Offset and bounds-check a piece's movements once per square, at import. Pass
+    a function of the square for pieces whose movements depend on where they are.
+    """
+
+    rays = []
+    for x, y in POSITIONS:
+        batches = movements((x, y)) if callable(movements) else movements
+        square_rays = []
+
+        for batch in batches:
+            ray = []
+            for x_d, y_d in batch:
+                if (x + x_d, y + y_d) not in SQUARE_INDEX:
+                    break
+                ray.append((x + x_d, y + y_d))
+            if ray:
+                square_rays.append(tuple(ray))
+
+        rays.append(tuple(square_rays))
+
+    return rays
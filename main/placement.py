@@ -0,0 +1,81 @@
+from typing import Dict, List, Optional
+
+from main import constants
+from main.bitboards import PIECE_SYMBOLS
+from main.types import AgentColor, Position
+
+# Symbol as written in a FEN: uppercase for White, lowercase for Black
+FEN_SYMBOLS: Dict[AgentColor, Dict[str, str]] = {
+    constants.WHITE: {symbol: symbol for symbol in PIECE_SYMBOLS},
+    constants.BLACK: {symbol: symbol.lower() for symbol in PIECE_SYMBOLS},
+}
+
+
+class Placement:
+    """
+    The piece placement field of a FEN, kept in sync by Board.apply_change. A
+    rank's string is only rebuilt after a piece has entered or left it.
+    """
+
+    def __init__(self):
+        # squares[y - 1][x - 1] holds the FEN symbol on that square, or ""
+        self.squares: List[List[str]] = [[""] * 8 for _ in range(8)]
+        # Cached string of each rank, None once it's out of date
+        self.ranks: List[Optional[str]] = [None] * 8
+
+    __slots__ = ("squares", "ranks")
+
+    def __str__(self) -> str:
+        ranks = self.ranks
+        for y in constants.RANKS:
+            if ranks[y - 1] is None:
+                ranks[y - 1] = self._build_rank(y)
+
+        return "/".join(ranks[y - 1] for y in constants.RANKS)
+
+    @classmethod
+    def from_agents(cls, *agents) -> "Placement":
+        placement = cls()
+        for agent in agents:
+            for position, piece in agent.pieces.items():
+                placement.add(agent.color, piece.fen_symbol, position)
+
+        return placement
+
+    def add(self, color: AgentColor, symbol: str, position: Position):
+        x, y = position
+        self.squares[y - 1][x - 1] = FEN_SYMBOLS[color][symbol]
+        self.ranks[y - 1] = None
+
+    def remove(self, color: AgentColor, symbol: str, position: Position):
+        # The other Agent's half of a change may already have put a piece on
+        # this square (captures, and rolling them back), so it's only cleared
+        # if it still holds the piece that's leaving
+        x, y = position
+        if self.squares[y - 1][x - 1] == FEN_SYMBOLS[color][symbol]:
+            self.squares[y - 1][x - 1] = ""
+            self.ranks[y - 1] = None
+
+    def move(self, color: AgentColor, symbol: str, old: Position, new: Position):
+        (old_x, old_y), (new_x, new_y) = old, new
+        fen_symbol = FEN_SYMBOLS[color][symbol]
+        squares, ranks = self.squares, self.ranks
+
+        if squares[old_y - 1][old_x - 1] == fen_symbol:
+            squares[old_y - 1][old_x - 1] = ""
+            ranks[old_y - 1] = None
+        squares[new_y - 1][new_x - 1] = fen_symbol
+        ranks[new_y - 1] = None
+
+    def _build_rank(self, y: int) -> str:
+        rank = ""
+        empty_squares_ct = 0
+
+        for fen_symbol in self.squares[y - 1]:
+            if fen_symbol:
+                rank += f"{empty_squares_ct or ''}{fen_symbol}"
+                empty_squares_ct = 0
+            else:
+                empty_squares_ct += 1
+
+        return f"{rank}{empty_squares_ct or ''}"
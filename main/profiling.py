@@ -0,0 +1,214 @@
+"""
+Opt-in call counts and timings of the hot paths of a game. Nothing is
+instrumented until a Profiler is enabled: the profiled methods are swapped for
+timing wrappers, and put back when it's disabled, so there's no overhead
+otherwise.
+
+Times are inclusive (e.g. rollback_halfmove includes the apply_change it makes),
+and a method that calls itself (e.g. King.get_moveset via Piece.get_moveset)
+is counted once per outermost call.
+
+Usage:
+    python -m main.profiling RandomAgent AggressiveAgent --games 10
+    python -m main.profiling SearchAgent RandomAgent --games 2 --json report.json
+"""
+
+import argparse
+import functools
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from main.board import Board
+from main.pieces import Piece
+from main.tournament import AGENTS, play_game, schedule
+
+# Call site name: (class defining it, method). Subclasses overriding the method
+# are instrumented too.
+TARGETS: Dict[str, Tuple[type, str]] = {
+    "get_moveset": (Piece, "get_moveset"),
+    "get_game_result": (Piece, "get_game_result"),
+    "apply_change": (Board, "apply_change"),
+    "rollback_halfmove": (Board, "rollback_halfmove"),
+    "make": (Board, "make"),
+    "unmake": (Board, "unmake"),
+    "get_fen": (Board, "get_fen"),
+}
+
+# Every committed halfmove passes through here, whether or not it was played
+# with results computed lazily
+HALFMOVE_TARGET = (Board, "apply_halfmove")
+
+
+def _with_subclasses(cls: type) -> Iterator[type]:
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _with_subclasses(subclass)
+
+
+class Profiler:
+    """
+    Counts and times calls to TARGETS while enabled. Use the profile context
+    manager, or enable and disable it around the code to measure.
+    """
+
+    def __init__(self):
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.halfmoves = 0
+        # (class, attr, original) of every method swapped out while enabled
+        self._originals: List[Tuple[type, str, Any]] = []
+        # Call sites currently being timed, so recursive calls aren't counted
+        self._active = set()
+
+    __slots__ = ("calls", "seconds", "halfmoves", "_originals", "_active")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def enable(self):
+        if self.enabled:
+            return
+
+        for name, (owner, attr) in TARGETS.items():
+            for cls in _with_subclasses(owner):
+                if attr in cls.__dict__:
+                    self._patch(cls, attr, self._timed(name, cls.__dict__[attr]))
+
+        owner, attr = HALFMOVE_TARGET
+        self._patch(owner, attr, self._counted(owner.__dict__[attr]))
+
+    def disable(self):
+        while self._originals:
+            cls, attr, original = self._originals.pop()
+            setattr(cls, attr, original)
+
+    def reset(self):
+        self.calls.clear()
+        self.seconds.clear()
+        self.halfmoves = 0
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Totals per call site, and calls per committed halfmove, ready for
+        json.dump
+        """
+
+        return {
+            "halfmoves": self.halfmoves,
+            "functions": {
+                name: {
+                    "calls": self.calls[name],
+                    "seconds": self.seconds[name],
+                    "calls_per_halfmove": (
+                        self.calls[name] / self.halfmoves if self.halfmoves else None
+                    ),
+                    "us_per_call": (
+                        self.seconds[name] / self.calls[name] * 1e6
+                        if self.calls[name]
+                        else None
+                    ),
+                }
+                for name in TARGETS
+            },
+        }
+
+    def dump(self, handle: TextIO):
+        json.dump(self.report(), handle, indent=2)
+
+    def _patch(self, cls: type, attr: str, wrapper: Callable):
+        self._originals.append((cls, attr, cls.__dict__[attr]))
+        setattr(cls, attr, wrapper)
+
+    def _timed(self, name: str, method: Callable) -> Callable:
+        calls, seconds, active = self.calls, self.seconds, self._active
+        perf_counter = time.perf_counter
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if name in active:
+                return method(*args, **kwargs)
+
+            active.add(name)
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds[name] += perf_counter() - start
+                calls[name] += 1
+                active.discard(name)
+
+        return wrapper
+
+    def _counted(self, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            self.halfmoves += 1
+            return method(*args, **kwargs)
+
+        return wrapper
+
+
+@contextmanager
+def profile(profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+    """
+    Profile the calls made inside the block:
+
+        with profile() as profiler:
+            board.play(internal=True)
+        profiler.dump(sys.stdout)
+    """
+
+    profiler = profiler or Profiler()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+
+
+def main(args: Optional[List[str]] = None):
+    # Only the command line prints tables; profiled code doesn't need tabulate
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Profile the hot paths of games")
+    parser.add_argument("agents", nargs="+", choices=sorted(AGENTS))
+    parser.add_argument("--games", type=int, default=10, help="Games per pairing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-fullmoves", type=int, default=300)
+    parser.add_argument("--json", help="Write per-game and total reports here")
+    parsed = parser.parse_args(args)
+
+    games = schedule(parsed.agents, parsed.games, parsed.seed, parsed.max_fullmoves)
+    total, reports = Profiler(), []
+
+    for game in games:
+        with profile() as profiler:
+            play_game(game)
+        reports.append({"game": game._asdict(), **profiler.report()})
+
+        total.halfmoves += profiler.halfmoves
+        for name in TARGETS:
+            total.calls[name] += profiler.calls[name]
+            total.seconds[name] += profiler.seconds[name]
+
+    report = total.report()
+    print(f"{len(games)} games, {report['halfmoves']} halfmoves\n")
+    print(
+        tabulate(
+            [{"function": name, **row} for name, row in report["functions"].items()],
+            headers="keys",
+            floatfmt=".4f",
+        )
+    )
+
+    if parsed.json:
+        with open(parsed.json, "w") as handle:
+            json.dump({"games": reports, "total": report}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
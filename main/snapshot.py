@@ -0,0 +1,185 @@
+import struct
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Type
+
+from main import constants
+from main.bitboards import POSITIONS, SQUARE_INDEX
+from main.moves import PROMOTEE_TYPES
+from main.pieces import Bishop, BlackPawn, King, Knight, Queen, Rook, WhitePawn
+from main.types import Position
+
+if TYPE_CHECKING:
+    from main.board import Board
+    from main.pieces import Piece
+
+# Square of each piece slot (constants.PIECE_ATTRS, White's then Black's), the
+# King/Rook has_moved flags, the promotee type in each _prom slot and which of
+# them hold one, the en passant target, side to move and the two clocks
+SLOTS = len(constants.PIECE_ATTRS) * 2
+FORMAT = struct.Struct(f"<{SLOTS}BBHHHBBHH")
+ABSENT = 255
+# Plies between the snapshots kept along the GameTree (see Board.apply_halfmove)
+INTERVAL = 8
+# Bits of the has_moved byte, shifted by 3 for Black
+MOVED_ATTRS = ("king", "a_rook", "h_rook")
+# Two bits per _prom slot: the promotee's index into PROMOTEE_TYPES. Whether
+# the slot holds one at all (on the board or captured) is a bit apiece, Black's
+# shifted by 8
+PROM_ATTRS = [attr for attr in constants.PIECE_ATTRS if attr.endswith("_prom")]
+
+# Type of the piece in every other slot
+SLOT_TYPES: Dict[str, Dict[str, Type["Piece"]]] = {
+    color: {
+        "king": King,
+        "queen": Queen,
+        "a_rook": Rook,
+        "h_rook": Rook,
+        "b_knight": Knight,
+        "g_knight": Knight,
+        "c_bishop": Bishop,
+        "f_bishop": Bishop,
+        **{attr: pawn_type for attr in constants.PIECE_ATTRS if attr.endswith("_pawn")},
+    }
+    for color, pawn_type in ((constants.WHITE, WhitePawn), (constants.BLACK, BlackPawn))
+}
+
+
+def _slot_piece(agent, attr: str) -> Optional["Piece"]:
+    return getattr(agent, attr) or getattr(agent.graveyard, attr)
+
+
+class Fields(NamedTuple):
+    # Position of each slot, White's then Black's, or None if not on the board
+    positions: List[Optional[Position]]
+    # Of the piece in the slot, or the one captured from it. A _prom slot that
+    # has never held a piece has no type.
+    has_moved: Dict[str, Dict[str, bool]]
+    promotee_types: Dict[str, Dict[str, Optional[Type["Piece"]]]]
+    en_passant_target: Optional[Position]
+    active_color: str
+    halfmove_clock: int
+    fullmove_number: int
+
+
+class Snapshot(bytes):
+    """
+    A position packed into a fixed number of bytes (FORMAT.size): cheap enough to
+    keep many of, and immutable, so they can be shared and hashed. Only the
+    position is kept, not how it was reached (see Board.restore), along with
+    the has_moved flag or type of any captured Rook or promotee.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_fields(cls, fields: Fields) -> "Snapshot":
+        has_moved = 0
+        promotees = []
+        filled = 0
+        for i, color in enumerate(constants.COLORS):
+            for bit, attr in enumerate(MOVED_ATTRS):
+                if fields.has_moved[color][attr]:
+                    has_moved |= 1 << (bit + 3 * i)
+
+            types = 0
+            for bit, attr in enumerate(PROM_ATTRS):
+                if (piece_type := fields.promotee_types[color][attr]) is not None:
+                    types |= PROMOTEE_TYPES.index(piece_type) << (2 * bit)
+                    filled |= 1 << (bit + 8 * i)
+            promotees.append(types)
+
+        return cls(
+            FORMAT.pack(
+                *(
+                    ABSENT if position is None else SQUARE_INDEX[position]
+                    for position in fields.positions
+                ),
+                has_moved,
+                *promotees,
+                filled,
+                (
+                    ABSENT
+                    if fields.en_passant_target is None
+                    else SQUARE_INDEX[fields.en_passant_target]
+                ),
+                fields.active_color == "b",
+                fields.halfmove_clock,
+                fields.fullmove_number,
+            )
+        )
+
+    @classmethod
+    def from_board(cls, board: "Board") -> "Snapshot":
+        positions = []
+        has_moved = {}
+        promotee_types = {}
+
+        for agent in (board.white, board.black):
+            for attr in constants.PIECE_ATTRS:
+                piece = getattr(agent, attr)
+                positions.append(piece.position if piece else None)
+            # Captured pieces are described as they were when captured, so that
+            # taking back the capture after a restore brings back the same piece
+            has_moved[agent.color] = {
+                attr: bool((piece := _slot_piece(agent, attr)) and piece.has_moved)
+                for attr in MOVED_ATTRS
+            }
+            promotee_types[agent.color] = {
+                attr: type(piece) if (piece := _slot_piece(agent, attr)) else None
+                for attr in PROM_ATTRS
+            }
+
+        return cls.from_fields(
+            Fields(
+                positions=positions,
+                has_moved=has_moved,
+                promotee_types=promotee_types,
+                en_passant_target=(
+                    board.white.en_passant_target or board.black.en_passant_target
+                ),
+                active_color=board.active_color,
+                halfmove_clock=board.halfmove_clock,
+                fullmove_number=board.fullmove_number,
+            )
+        )
+
+    def unpack(self) -> Fields:
+        fields = FORMAT.unpack(self)
+        squares = fields[:SLOTS]
+        (
+            has_moved,
+            white_promotees,
+            black_promotees,
+            filled,
+            en_passant,
+            black_to_move,
+            halfmove_clock,
+            fullmove_number,
+        ) = fields[SLOTS:]
+
+        return Fields(
+            positions=[None if sq == ABSENT else POSITIONS[sq] for sq in squares],
+            has_moved={
+                color: {
+                    attr: bool(has_moved >> (bit + 3 * i) & 1)
+                    for bit, attr in enumerate(MOVED_ATTRS)
+                }
+                for i, color in enumerate(constants.COLORS)
+            },
+            promotee_types={
+                color: {
+                    attr: (
+                        PROMOTEE_TYPES[types >> (2 * bit) & 3]
+                        if filled >> (bit + 8 * i) & 1
+                        else None
+                    )
+                    for bit, attr in enumerate(PROM_ATTRS)
+                }
+                for i, (color, types) in enumerate(
+                    zip(constants.COLORS, (white_promotees, black_promotees))
+                )
+            },
+            en_passant_target=None if en_passant == ABSENT else POSITIONS[en_passant],
+            active_color="b" if black_to_move else "w",
+            halfmove_clock=halfmove_clock,
+            fullmove_number=fullmove_number,
+        )
@@ -0,0 +1,203 @@
+"""
+Self-play tournaments. Games are fanned out across a process pool, one game per
+task, and results are streamed back to the parent as each game finishes.
+
+Every game gets its own seed (derived from the tournament seed), so any single
+game can be replayed exactly with play_game, as long as the agents involved
+don't depend on wall-clock time (e.g. a SearchAgent with a time budget).
+
+Usage:
+    python -m main.tournament RandomAgent AggressiveAgent --games 100
+    python -m main.tournament SearchAgent AggressiveAgent --games 20 --pgn out.pgn
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import random
+import time
+from collections import defaultdict
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from main.agents import AggressiveAgent, RandomAgent, SearchAgent
+from main.builders import BoardBuilder
+from main.export import to_pgn
+
+if TYPE_CHECKING:
+    from main.board import Board
+
+AGENTS = {cls.__name__: cls for cls in (RandomAgent, AggressiveAgent, SearchAgent)}
+
+
+class Game(NamedTuple):
+    index: int
+    white: str
+    black: str
+    seed: int
+    max_fullmoves: int = 300
+
+
+class GameRecord(NamedTuple):
+    index: int
+    white: str
+    black: str
+    seed: int
+    result: Optional[str]  # None if max_fullmoves was reached
+    halfmoves: int
+    pgn: str
+    seconds: float
+
+
+def schedule(
+    agents: Sequence[str],
+    games: int,
+    seed: int = 0,
+    max_fullmoves: int = 300,
+) -> List[Game]:
+    """
+    Round robin: every pair of agents plays `games` games, alternating colors.
+    A single agent name plays itself.
+    """
+
+    rng = random.Random(seed)
+    pairings = list(itertools.combinations(agents, 2)) or [(agents[0], agents[0])]
+    schedule = []
+
+    for first, second in pairings:
+        for i in range(games):
+            white, black = (first, second) if i % 2 == 0 else (second, first)
+            schedule.append(
+                Game(
+                    index=len(schedule),
+                    white=white,
+                    black=black,
+                    seed=rng.getrandbits(32),
+                    max_fullmoves=max_fullmoves,
+                )
+            )
+
+    return schedule
+
+
+def play_board(game: Game) -> "Board":
+    random.seed(game.seed)
+    board = BoardBuilder().from_start(
+        white_agent_cls=AGENTS[game.white],
+        black_agent_cls=AGENTS[game.black],
+        max_fullmoves=game.max_fullmoves,
+    )
+    board.play(internal=True)
+
+    return board
+
+
+def play_game(game: Game) -> GameRecord:
+    start = time.perf_counter()
+    board = play_board(game)
+    seconds = time.perf_counter() - start
+
+    return GameRecord(
+        index=game.index,
+        white=game.white,
+        black=game.black,
+        seed=game.seed,
+        result=board.result,
+        halfmoves=len(board.game_tree),
+        pgn=to_pgn(board, {"Round": str(game.index + 1)}),
+        seconds=seconds,
+    )
+
+
+def run(games: Iterable[Game], workers: Optional[int] = None) -> Iterator[GameRecord]:
+    """
+    Play games in a pool of `workers` processes (one per core by default),
+    yielding records in the order games finish
+    """
+
+    if workers == 1:
+        yield from map(play_game, games)
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(play_game, games)
+
+
+def standings(records: Iterable[GameRecord]) -> Dict[str, Dict[str, float]]:
+    table = defaultdict(
+        lambda: {"games": 0, "wins": 0, "draws": 0, "losses": 0, "unfinished": 0}
+    )
+
+    for record in records:
+        white, black = table[record.white], table[record.black]
+        white["games"] += 1
+        black["games"] += 1
+
+        if record.result == "1-0":
+            white["wins"] += 1
+            black["losses"] += 1
+        elif record.result == "0-1":
+            black["wins"] += 1
+            white["losses"] += 1
+        elif record.result is None:
+            # Cut off by max_fullmoves, so worth no points to either side
+            white["unfinished"] += 1
+            black["unfinished"] += 1
+        else:
+            white["draws"] += 1
+            black["draws"] += 1
+
+    for row in table.values():
+        row["points"] = row["wins"] + row["draws"] / 2
+
+    return dict(table)
+
+
+def main(args: Optional[List[str]] = None):
+    # Only the command line prints tables; workers just play games
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Play a self-play tournament")
+    parser.add_argument("agents", nargs="+", choices=sorted(AGENTS))
+    parser.add_argument("--games", type=int, default=10, help="Games per pairing")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-fullmoves", type=int, default=300)
+    parser.add_argument("--pgn", help="Append every game's PGN to this file")
+    parsed = parser.parse_args(args)
+
+    games = schedule(parsed.agents, parsed.games, parsed.seed, parsed.max_fullmoves)
+    records = []
+    pgn_file = open(parsed.pgn, "a") if parsed.pgn else None
+    start = time.perf_counter()
+
+    try:
+        for record in run(games, workers=parsed.workers):
+            records.append(record)
+            print(
+                f"[{len(records)}/{len(games)}] Game {record.index} "
+                f"(seed {record.seed}): {record.white} vs {record.black}: "
+                f"{record.result or '*'} in {record.halfmoves} halfmoves "
+                f"({record.seconds:.2f}s)"
+            )
+            if pgn_file:
+                pgn_file.write(f"{record.pgn}\n")
+    finally:
+        if pgn_file:
+            pgn_file.close()
+
+    print(f"\n{len(records)} games in {time.perf_counter() - start:.1f}s\n")
+    rows = sorted(standings(records).items(), key=lambda i: -i[1]["points"])
+    print(tabulate([{"agent": name, **row} for name, row in rows], headers="keys"))
+
+
+if __name__ == "__main__":
+    main()
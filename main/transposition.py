@@ -0,0 +1,140 @@
+from array import array
+from typing import Dict, NamedTuple, Optional
+
+EXACT = 0
+LOWER = 1  # Fail high: the score is at least this
+UPPER = 2  # Fail low: the score is at most this
+
+SLOT_BYTES = 16  # 8 byte key + 8 byte packed entry
+BUCKET_SLOTS = 2
+
+# Layout of a packed entry
+_SCORE_BITS = 32
+_SCORE_OFFSET = 1 << (_SCORE_BITS - 1)
+_DEPTH_SHIFT = 32
+_BOUND_SHIFT = 40
+_MOVE_SHIFT = 42
+_AGE_SHIFT = 58
+
+
+class TTEntry(NamedTuple):
+    move: int  # See main.moves.encode
+    depth: int
+    bound: int
+    score: int
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by Zobrist key. Memory is
+    allocated once, up front, from a budget in megabytes.
+
+    Each key maps to a bucket of two slots: the first keeps the deepest result
+    (unless it's left over from an older search), the second always takes the
+    newest. A table may be shared by any number of agents, since the key also
+    encodes the side to move.
+    """
+
+    def __init__(self, size_mb: float = 16):
+        buckets = max(1, int(size_mb * 2**20) // (SLOT_BYTES * BUCKET_SLOTS))
+        # Round down to a power of two, so indexing is a mask
+        buckets = 1 << (buckets.bit_length() - 1)
+
+        self.mask = buckets - 1
+        self.keys = array("Q", bytes(8 * buckets * BUCKET_SLOTS))
+        self.entries = array("Q", bytes(8 * buckets * BUCKET_SLOTS))
+        self.age = 0
+
+        self.used = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    __slots__ = ("mask", "keys", "entries", "age", "used", "probes", "hits", "stores")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def size_mb(self) -> float:
+        return len(self) * SLOT_BYTES / 2**20
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    @property
+    def occupancy(self) -> float:
+        return self.used / len(self)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "size_mb": self.size_mb,
+            "slots": len(self),
+            "used": self.used,
+            "occupancy": self.occupancy,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate,
+            "stores": self.stores,
+        }
+
+    def new_search(self):
+        """
+        Entries stored before this are no longer protected by their depth
+        """
+
+        self.age = (self.age + 1) & 63
+
+    def clear(self):
+        slots = len(self)
+        self.keys = array("Q", bytes(8 * slots))
+        self.entries = array("Q", bytes(8 * slots))
+        self.age = self.used = self.probes = self.hits = self.stores = 0
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        self.probes += 1
+        idx = (key & self.mask) * BUCKET_SLOTS
+
+        for slot in (idx, idx + 1):
+            if self.keys[slot] == key:
+                self.hits += 1
+                packed = self.entries[slot]
+                return TTEntry(
+                    move=packed >> _MOVE_SHIFT & 0xFFFF,
+                    depth=packed >> _DEPTH_SHIFT & 0xFF,
+                    bound=packed >> _BOUND_SHIFT & 3,
+                    score=(packed & 0xFFFFFFFF) - _SCORE_OFFSET,
+                )
+
+        return None
+
+    def store(self, key: int, move: int, depth: int, bound: int, score: int):
+        idx = (key & self.mask) * BUCKET_SLOTS
+        keys, entries = self.keys, self.entries
+        packed = (
+            (score + _SCORE_OFFSET)
+            | depth << _DEPTH_SHIFT
+            | bound << _BOUND_SHIFT
+            | move << _MOVE_SHIFT
+            | self.age << _AGE_SHIFT
+        )
+
+        current = entries[idx]
+        if (
+            keys[idx] in (key, 0)
+            or depth >= (current >> _DEPTH_SHIFT & 0xFF)
+            or current >> _AGE_SHIFT != self.age
+        ):
+            slot = idx  # Depth-preferred
+            if keys[idx + 1] == key:
+                # Don't keep a stale copy in the always-replace slot
+                keys[idx + 1] = entries[idx + 1] = 0
+                self.used -= 1
+        else:
+            slot = idx + 1  # Always-replace
+
+        if keys[slot] == 0:
+            self.used += 1
+        keys[slot], entries[slot] = key, packed
+        self.stores += 1
@@ -25,6 +25,8 @@ GameResult = Literal[
     "½-½ Insufficient material",
     "½-½ Repetition",
     "½-½ Seventy-five-move rule",
+    # Agreed, or any other draw the position doesn't show (e.g. read from PGN)
+    "½-½ Agreement",
 ]
 
 
@@ -48,7 +50,6 @@ class Change(LookaheadResults):
     WHITE: AgentChange
     BLACK: AgentChange
     disambiguation: NotRequired[str]
-    rows_changing: NotRequired[set]
     symbol: str | None
     halfmove_clock: Tuple[int, int]
     fullmove_number: Tuple[int, int]
@@ -1,13 +1,17 @@
 import os
+from functools import cache
 from typing import Callable, Optional
 
-from colorist import white, yellow
-from dotenv import load_dotenv
-
 from main import constants
 from main.types import AgentColor
 
-load_dotenv()
+
+@cache
+def load_env():
+    # Deferred until something is printed, so importing the engine stays cheap
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 
 def cprint(
@@ -15,11 +19,14 @@ def cprint(
     agent_color: Optional[AgentColor] = None,
     color_fn: Optional[Callable] = None,
 ):
+    load_env()
     if not int(os.getenv("DEBUG")):
         return
     elif agent_color is None:
         print(message)
         return
 
+    from colorist import white, yellow
+
     color_fn = color_fn or (yellow if agent_color == constants.BLACK else white)
     color_fn(message)
@@ -0,0 +1,102 @@
+import random
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from main import constants
+from main.bitboards import PIECE_SYMBOLS, SQUARE_INDEX
+from main.types import AgentColor, Position
+
+if TYPE_CHECKING:
+    from main.agents import Agent
+    from main.board import Board
+
+# Fixed seed so that keys are stable across processes (and can be stored)
+_rng = random.Random(0x5EED)
+
+
+def _key() -> int:
+    return _rng.getrandbits(64)
+
+
+PIECE_KEYS: Dict[AgentColor, Dict[str, List[int]]] = {
+    color: {symbol: [_key() for _ in range(64)] for symbol in PIECE_SYMBOLS}
+    for color in constants.COLORS
+}
+BLACK_TO_MOVE_KEY = _key()
+# Indexed by castling_index: bit 0 is kingside, bit 1 is queenside
+CASTLING_KEYS: Dict[AgentColor, List[int]] = {
+    color: [0] + [_key() for _ in range(3)] for color in constants.COLORS
+}
+# Indexed by file (x)
+EN_PASSANT_KEYS: List[int] = [0] + [_key() for _ in constants.FILES]
+
+
+def castling_index(agent: "Agent") -> int:
+    if agent.king is None or agent.king.has_moved:
+        return 0
+
+    index = 0
+    if agent.h_rook and not agent.h_rook.has_moved:
+        index |= 1
+    if agent.a_rook and not agent.a_rook.has_moved:
+        index |= 2
+
+    return index
+
+
+class Zobrist:
+    """
+    Incrementally updated 64-bit hash of a position: piece placement, side to
+    move, castling rights and en passant file. Kept in sync by Board.apply_change.
+    Two positions with the same key are the same position for the purposes of
+    repetition (same as comparing truncated FENs).
+    """
+
+    def __init__(self):
+        self.key = 0
+        self.castling: Dict[AgentColor, int] = {constants.WHITE: 0, constants.BLACK: 0}
+        self.en_passant_x: Optional[int] = None
+
+    __slots__ = ("key", "castling", "en_passant_x")
+
+    @classmethod
+    def from_board(cls, board: "Board") -> "Zobrist":
+        zobrist = cls()
+        for agent in (board.white, board.black):
+            for position, piece in agent.pieces.items():
+                zobrist.toggle_piece(agent.color, piece.fen_symbol, position)
+            zobrist.update_castling(agent)
+
+        zobrist.update_en_passant(
+            board.white.en_passant_target or board.black.en_passant_target
+        )
+        if board.active_color == "b":
+            zobrist.toggle_side()
+
+        return zobrist
+
+    def toggle_piece(self, color: AgentColor, symbol: str, position: Position):
+        self.key ^= PIECE_KEYS[color][symbol][SQUARE_INDEX[position]]
+
+    def move_piece(self, color: AgentColor, symbol: str, old: Position, new: Position):
+        keys = PIECE_KEYS[color][symbol]
+        self.key ^= keys[SQUARE_INDEX[old]] ^ keys[SQUARE_INDEX[new]]
+
+    def toggle_side(self):
+        self.key ^= BLACK_TO_MOVE_KEY
+
+    def update_castling(self, agent: "Agent"):
+        index = castling_index(agent)
+        keys = CASTLING_KEYS[agent.color]
+        self.key ^= keys[self.castling[agent.color]] ^ keys[index]
+        self.castling[agent.color] = index
+
+    def update_en_passant(self, target: Optional[Position]):
+        new_x = target[0] if target else None
+        if new_x == self.en_passant_x:
+            return
+
+        if self.en_passant_x is not None:
+            self.key ^= EN_PASSANT_KEYS[self.en_passant_x]
+        if new_x is not None:
+            self.key ^= EN_PASSANT_KEYS[new_x]
+        self.en_passant_x = new_x
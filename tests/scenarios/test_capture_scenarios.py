@@ -78,5 +78,4 @@ class TestCaptureScenarios:
             "halfmove_clock": (0, 0),
             "fullmove_number": (1, 2),
             "fen": "8/8/8/4k3/2Kq4/8/8/8 w - - 0 2",
-            "rows_changing": {1, 4},
         }
@@ -41,6 +41,13 @@ class TestPawnScenarios:
         with pytest.raises(InvalidMoveError):
             default_board.white.move("e_pawn", D, 4)
 
+    def test_pawn_cannot_move_backwards(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("a_pawn", A, 6)
+
+        with pytest.raises(InvalidMoveError):
+            default_board.white.move("e_pawn", E, 3)
+
     def test_pawn_promotion_capture_results_in_expected_state(self, builder):
         board = builder.from_data(
             white_data=[
@@ -131,7 +138,7 @@ class TestPawnScenarios:
             board.white.move("f_pawn", F, 8, promotee_type=Queen)
 
         # Also check that the pawn is left unchanged - we want to ensure
-        # the king_would_be_in_check method has no side effects
+        # rejecting the move has no side effects
         assert board.white.f_pawn.position == (F, 7)
         assert board.white.queen is None
 
@@ -173,7 +180,6 @@ class TestPawnScenarios:
             "halfmove_clock": (0, 0),
             "fullmove_number": (1, 1),
             "fen": "6Q1/8/8/4k3/2K5/8/8/8 b - - 0 1",
-            "rows_changing": {8, 7},
         }
 
 
@@ -291,7 +297,6 @@ class TestEnPassant:
             "halfmove_clock": (0, 0),
             "fullmove_number": (3, 3),
             "fen": "rnbqkbnr/pppp1p1p/4P1p1/8/8/8/PPP1PPPP/RNBQKBNR b KQkq - 0 3",
-            "rows_changing": {5, 6},
         }
 
     def test_rollback_en_passant_results_in_expected_state(self, default_board):
@@ -1,9 +1,11 @@
 import pytest
 
-from main.agents import AggressiveAgent
+from main.agents import AggressiveAgent, RandomAgent, SearchAgent
 from main.exceptions import GameplayError
 from main.pieces import BlackPawn, King, Knight, Queen, Rook, WhitePawn
-from main.x import A, C, D, E, F, G, H
+from main.x import A, B, C, D, E, F, G, H
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
 
 
 class TestManualAgent:
@@ -181,3 +183,73 @@ class TestAggressiveAgent:
 
         halfmove = board.white.move()
         assert halfmove.to_an() == "exf6"
+
+
+class TestSearchAgent:
+    @staticmethod
+    def _board(builder, fen: str, max_depth: int):
+        board = builder.from_fen(
+            fen, white_agent_cls=SearchAgent, black_agent_cls=SearchAgent
+        )
+        for agent in (board.white, board.black):
+            agent.time_budget = None
+            agent.max_depth = max_depth
+
+        return board
+
+    def test_finds_mate_in_one(self, builder):
+        board = self._board(
+            builder,
+            "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 4 4",
+            max_depth=3,
+        )
+
+        halfmove = board.white.move()
+        assert halfmove.to_an() == "Qxf7#"
+        assert board.result == "1-0"
+
+    def test_stops_deepening_once_mate_is_found(self, builder):
+        board = self._board(builder, "6k1/5ppp/8/8/8/8/1Q6/1R4K1 w - - 0 1", 5)
+
+        assert board.white.search() == ("queen", B, 8, None)
+        assert board.white.depth == 1
+
+    def test_wins_hanging_queen(self, builder):
+        board = self._board(
+            builder,
+            "rnb1kbnr/pppp1ppp/8/4p3/4P2q/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3",
+            2,
+        )
+
+        assert board.white.move().to_an() == "Nxh4"
+
+    def test_search_restores_position(self, builder):
+        board = self._board(builder, KIWIPETE, 2)
+        board.white.node_budget = 500
+        fen = board.get_fen(internal=True)
+        key = board.zobrist.key
+
+        board.white.search()
+
+        assert board.get_fen(internal=True) == fen
+        assert board.zobrist.key == key
+        assert board.game_tree.get_latest_halfmove() is None
+
+    def test_node_budget_stops_search(self, builder):
+        board = self._board(builder, KIWIPETE, 64)
+        board.white.node_budget = 200
+
+        assert board.white.search() is not None
+        assert board.white.nodes == 200
+
+    def test_plays_out_game_within_time_budget(self, builder):
+        board = builder.from_start(
+            white_agent_cls=SearchAgent,
+            black_agent_cls=RandomAgent,
+            max_fullmoves=10,
+        )
+        board.white.time_budget = 0.01
+
+        board.play(internal=True)
+
+        assert board.result or board.fullmove_number == 11
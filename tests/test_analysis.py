@@ -0,0 +1,64 @@
+from main.analysis import Analyser, analyse
+from main.benchmark import FENS
+from main.moves import generate, to_coordinate
+from main.perft import START_FEN
+from main.x import D
+
+FOOLS_MATE = "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"
+STALEMATE = "7k/5Q2/6K1/8/8/8/8/8 b - - 0 40"
+
+
+class TestAnalysis:
+    def test_start_position(self):
+        analysis = Analyser().analyse(START_FEN)
+
+        assert len(analysis.moves) == 20
+        assert "e2e4" in analysis.moves
+        assert not analysis.check
+        assert analysis.result is None
+
+    def test_checkmate(self):
+        analysis = Analyser().analyse(FOOLS_MATE)
+
+        assert analysis.moves == []
+        assert analysis.check
+        assert analysis.result == "0-1"
+
+    def test_stalemate(self):
+        analysis = Analyser().analyse(STALEMATE)
+
+        assert analysis.moves == []
+        assert not analysis.check
+        assert analysis.result == "½-½ Stalemate"
+
+    def test_insufficient_material(self):
+        analysis = Analyser().analyse("8/8/4k3/8/8/2N5/4K3/8 w - - 0 60")
+
+        assert analysis.result == "½-½ Insufficient material"
+
+    def test_clock_past_seventy_five_moves_agrees_with_play(self, builder):
+        fen = "4k3/8/8/8/8/8/4P3/4K3 w - - 160 90"
+        board = builder.from_fen(fen)
+        halfmove = board.white.move("king", D, 1)
+
+        assert Analyser().analyse(fen).result == "½-½ Seventy-five-move rule"
+        assert halfmove.change["game_result"] == "½-½ Seventy-five-move rule"
+
+    def test_pooled_board_matches_fresh_boards(self, builder):
+        analyser = Analyser()
+
+        # Each position is set up over whatever the previous one left behind
+        for fen in FENS + FENS[::-1]:
+            analysis = analyser.analyse(fen)
+            board = builder.from_fen(fen)
+
+            assert analyser.board.get_fen(internal=True) == fen
+            assert analyser.board.zobrist.key == board.zobrist.key
+            assert sorted(analysis.moves) == sorted(
+                map(to_coordinate, generate(board.active_agent))
+            )
+
+    def test_worker_pool_keeps_input_order(self):
+        fens = list(FENS * 4)
+
+        assert list(analyse(fens, workers=2, chunksize=3)) == list(analyse(fens))
@@ -0,0 +1,120 @@
+from typing import get_args
+
+import pytest
+
+from main.archive import (
+    HEADER,
+    MAGIC,
+    RESULT_CODES,
+    VERSION,
+    ArchiveReader,
+    ArchiveWriter,
+    pack,
+)
+from main.exceptions import NotationError
+from main.moves import encode_halfmove, generate
+from main.pieces import Knight
+from main.tournament import Game, play_board
+from main.types import GameResult
+from main.x import B, E, F
+
+
+class TestArchive:
+    @pytest.fixture
+    def games(self):
+        return [
+            play_board(Game(i, "RandomAgent", "AggressiveAgent", seed, 40))
+            for i, seed in enumerate((1, 2, 3))
+        ]
+
+    def test_games_read_back_by_index(self, tmp_path, games):
+        path = tmp_path / "games.chsa"
+        with ArchiveWriter(path) as writer:
+            for board in games:
+                writer.add(board)
+
+        with ArchiveReader(path) as reader:
+            assert len(reader) == 3
+            for i in (2, 0, -2):
+                board = games[i]
+                game = reader[i]
+                assert game.start is None
+                assert list(game.moves) == list(map(encode_halfmove, board.game_tree))
+                assert reader.result(i) == game.result == board.result
+
+                replayed = reader.replay(i)
+                assert replayed.get_fen(internal=True) == board.get_fen(internal=True)
+                assert replayed.result == board.result
+
+            with pytest.raises(IndexError):
+                reader[3]
+
+    def test_game_from_other_starting_position(self, tmp_path, builder):
+        fen = "1r2k3/P7/8/8/8/8/7P/4K3 w - - 5 40"
+        board = builder.from_fen(fen)
+        board.white.move("a_pawn", B, 8, promotee_type=Knight)
+        board.black.move("king", F, 7)
+        path = tmp_path / "games.chsa"
+        with ArchiveWriter(path) as writer:
+            writer.add(board)
+
+        with ArchiveReader(path) as reader:
+            replayed = reader.replay(0)
+
+        assert replayed.get_fen(internal=True) == board.get_fen(internal=True)
+        assert replayed.game_tree[0].to_an() == "axb8=N"
+        replayed.jump(0)
+        assert replayed.get_fen(internal=True) == fen
+
+    def test_moves_are_two_bytes_each(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("g_knight", F, 6)
+
+        # Result, start flag and number of halfmoves, then the halfmoves
+        assert len(pack(default_board)) == 4 + 2 * 2
+
+    def test_encode_halfmove_matches_generated_code(self, default_board):
+        codes = generate(default_board.white)
+        halfmove = default_board.white.move("g_knight", F, 3)
+
+        assert encode_halfmove(halfmove) in codes
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "games.pgn"
+        path.write_bytes(b'[Event "?"]\n' * 4)
+
+        with pytest.raises(NotationError):
+            ArchiveReader(path)
+
+    def test_result_codes_are_fixed(self):
+        assert RESULT_CODES == (
+            None,
+            "1-0",
+            "0-1",
+            "½-½ Stalemate",
+            "½-½ Insufficient material",
+            "½-½ Repetition",
+            "½-½ Seventy-five-move rule",
+            "½-½ Agreement",
+        )
+        assert set(RESULT_CODES) == set(get_args(GameResult))
+
+    def test_result_byte_on_disk(self, tmp_path, builder):
+        board = builder.from_fen("7k/8/6K1/5Q2/8/8/8/8 w - - 0 1")
+        board.white.move("queen", F, 7)
+        path = tmp_path / "games.chsa"
+        with ArchiveWriter(path) as writer:
+            writer.add(board)
+
+        data = path.read_bytes()
+        assert data[: HEADER.size] == HEADER.pack(MAGIC, VERSION, 1, len(data) - 8)
+        assert data[HEADER.size] == 3
+        with ArchiveReader(path) as reader:
+            assert reader.result(0) == "½-½ Stalemate"
+
+    def test_rejects_other_versions(self, tmp_path):
+        path = tmp_path / "games.chsa"
+        path.write_bytes(HEADER.pack(MAGIC, VERSION + 1, 0, HEADER.size))
+
+        with pytest.raises(NotationError):
+            ArchiveReader(path)
@@ -0,0 +1,82 @@
+from main import constants
+from main.attacks import AttackMap
+from main.x import A, B, C, D, E, F, G, H
+
+
+class TestAttackMap:
+    @staticmethod
+    def _assert_in_sync(board):
+        rebuilt = AttackMap.from_bitboards(board.bitboards)
+
+        assert board.attacks.planes == rebuilt.planes
+        assert board.attacks.sliders == rebuilt.sliders
+
+    def test_starting_position_counts(self, default_board):
+        attacks = default_board.attacks
+
+        assert attacks.count((F, 3), constants.WHITE) == 3
+        assert attacks.count((E, 3), constants.WHITE) == 2
+        assert attacks.count((E, 2), constants.WHITE) == 4
+        assert attacks.count((E, 4), constants.WHITE) == 0
+        assert attacks.is_attacked((C, 6), constants.BLACK)
+        assert not attacks.is_attacked((C, 5), constants.BLACK)
+
+    def test_sliders_update_when_lines_open(self, default_board):
+        attacks = default_board.attacks
+        default_board.white.move("e_pawn", E, 4)
+
+        assert attacks.is_attacked((A, 6), constants.WHITE)  # f1 Bishop
+        assert attacks.is_attacked((H, 5), constants.WHITE)  # d1 Queen
+        self._assert_in_sync(default_board)
+
+    def test_capture_and_rollback_stay_in_sync(self, default_board):
+        default_board.attacks
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("d_pawn", D, 5)
+        default_board.white.move("e_pawn", D, 5)
+        self._assert_in_sync(default_board)
+
+        default_board.black.move("queen", D, 5)
+        default_board.rollback_halfmove()
+        default_board.rollback_halfmove()
+        self._assert_in_sync(default_board)
+
+    def test_untracked_attacks_are_rebuilt_afterwards(self, default_board):
+        default_board.attacks
+
+        with default_board.untracked_attacks():
+            default_board.white.move("e_pawn", E, 4)
+            assert default_board.attacks is None
+            assert not default_board.white.king.is_in_check()
+
+        assert default_board.attacks.is_attacked((A, 6), constants.WHITE)
+
+
+class TestGivesCheck:
+    def test_direct_check(self, builder):
+        board = builder.from_fen("4k3/8/8/8/4N3/8/8/4K3 w - - 0 1")
+
+        assert board.white.b_knight.gives_check((D, 6))
+        assert not board.white.b_knight.gives_check((C, 5))
+
+    def test_discovered_check(self, builder):
+        board = builder.from_fen("4k3/8/8/8/8/8/4N3/4R1K1 w - - 0 1")
+
+        assert board.white.b_knight.gives_check((C, 3))
+        assert not board.white.king.gives_check((H, 1))
+
+    def test_castling_check_is_given_by_the_rook(self, builder):
+        board = builder.from_fen("5k2/8/8/8/8/8/8/4K2R w K - 0 1")
+
+        assert board.white.king.gives_check((G, 1))
+
+    def test_en_passant_discovered_check(self, builder):
+        board = builder.from_fen("8/8/8/RPp4k/8/8/8/K7 w - c6 0 2")
+
+        assert board.white.b_pawn.gives_check((C, 6))
+        assert not board.white.b_pawn.gives_check((B, 6))
+
+    def test_promotion_checks_as_queen(self, builder):
+        board = builder.from_fen("7k/1P6/8/8/8/8/8/K7 w - - 0 1")
+
+        assert board.white.b_pawn.gives_check((B, 8))
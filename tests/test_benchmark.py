@@ -0,0 +1,70 @@
+import json
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+from main.benchmark import BENCHMARKS, ENGINE_IMPORTS, compare, main, run
+
+
+class TestBenchmark:
+    def test_run_reports_percentiles(self):
+        report = run(["fen_parsing", "from_fen"], repeat=3, warmup=0)
+
+        assert list(report["results"]) == ["fen_parsing", "from_fen"]
+        result = report["results"]["fen_parsing"]
+        assert result["min"] <= result["median"] <= result["p99"]
+        assert result["repeat"] == 3
+        assert json.loads(json.dumps(report)) == report
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": {"a": {"median": 1.0}, "b": {"median": 1.0}}}
+        current = {
+            "results": {"a": {"median": 1.05}, "b": {"median": 1.5}, "c": {"median": 1}}
+        }
+
+        rows = compare(baseline, current, tolerance=0.1)
+
+        assert [(row["benchmark"], row["regression"]) for row in rows] == [
+            ("a", False),
+            ("b", True),
+        ]
+
+    def test_compare_command_exit_code(self, tmp_path):
+        baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+        baseline.write_text(json.dumps({"results": {"a": {"median": 1.0}}}))
+        current.write_text(json.dumps({"results": {"a": {"median": 2.0}}}))
+
+        assert main(["compare", str(baseline), str(current)]) == 1
+        assert main(["compare", str(baseline), str(baseline)]) == 0
+
+    def test_stored_baseline_covers_every_benchmark(self):
+        path = Path(__file__).parent.parent / "benchmarks" / "baseline.json"
+        baseline = json.loads(path.read_text())
+
+        assert set(baseline["results"]) == set(BENCHMARKS)
+        assert all(row["regression"] is False for row in compare(baseline, baseline))
+
+    def test_engine_import_runs_from_any_directory(self, tmp_path, monkeypatch):
+        call = BENCHMARKS["engine_import"].setup(random.Random(0))
+        monkeypatch.chdir(tmp_path)
+
+        assert call().returncode == 0
+
+
+class TestEngineImports:
+    def test_presentation_dependencies_load_lazily(self):
+        modules = {"pyperclip", "colorist", "dotenv", "tabulate"}
+        check = (
+            f"{ENGINE_IMPORTS}, main.benchmark; import sys; "
+            f"print(sorted({modules} & set(sys.modules)))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", check],
+            cwd=Path(__file__).parent.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+        assert output.strip() == "[]"
@@ -0,0 +1,81 @@
+from main import constants
+from main.bitboards import SQUARE_BITS, Bitboards
+from main.pieces import BlackPawn, King, Queen, Rook, WhitePawn
+from main.x import A, B, C, D, E, F, G, H
+
+
+def assert_in_sync(board):
+    rebuilt = Bitboards.from_agents(board.white, board.black)
+
+    assert board.bitboards.colors == rebuilt.colors
+    assert board.bitboards.pieces == rebuilt.pieces
+
+
+class TestBitboards:
+    def test_start_position_occupancy(self, default_board):
+        bitboards = default_board.bitboards
+
+        assert bitboards.colors[constants.WHITE] == 0xFFFF
+        assert bitboards.colors[constants.BLACK] == 0xFFFF << 48
+        assert bitboards.pieces[constants.WHITE]["K"] == SQUARE_BITS[(E, 1)]
+        assert bitboards.pieces[constants.BLACK]["P"] == 0xFF << 48
+
+    def test_stays_in_sync_after_moves_and_captures(self, default_board):
+        default_board.bitboards  # Build before moving so updates are incremental
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("d_pawn", D, 5)
+        default_board.white.move("e_pawn", D, 5)
+
+        assert_in_sync(default_board)
+        assert not default_board.bitboards.colors[constants.BLACK] & SQUARE_BITS[(D, 5)]
+
+    def test_stays_in_sync_after_rollback(self, default_board):
+        default_board.bitboards
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("d_pawn", D, 5)
+        default_board.white.move("e_pawn", D, 5)
+        default_board.rollback_halfmove()
+
+        assert_in_sync(default_board)
+        assert (
+            default_board.bitboards.pieces[constants.BLACK]["P"] & SQUARE_BITS[(D, 5)]
+        )
+
+    def test_stays_in_sync_after_promotion(self, builder):
+        board = builder.from_data(
+            white_data=[
+                {"piece_type": King, "x": E, "y": 1},
+                {"piece_type": WhitePawn, "x": A, "y": 7},
+            ],
+            black_data=[
+                {"piece_type": King, "x": E, "y": 8},
+                {"piece_type": Rook, "x": B, "y": 8},
+            ],
+        )
+        board.bitboards
+        board.white.move("a_pawn", B, 8)
+
+        assert_in_sync(board)
+        assert board.bitboards.pieces[constants.WHITE]["Q"] == SQUARE_BITS[(B, 8)]
+
+    def test_is_attacked(self, builder):
+        board = builder.from_data(
+            white_data=[
+                {"piece_type": King, "x": A, "y": 1},
+                {"piece_type": Queen, "x": D, "y": 1},
+            ],
+            black_data=[
+                {"piece_type": King, "x": H, "y": 8},
+                {"piece_type": BlackPawn, "x": D, "y": 4},
+            ],
+        )
+        bitboards = board.bitboards
+
+        assert bitboards.is_attacked((D, 3), constants.WHITE)
+        assert bitboards.is_attacked((H, 5), constants.WHITE)
+        assert not bitboards.is_attacked((D, 5), constants.WHITE)  # Blocked by pawn
+        assert bitboards.is_attacked((C, 3), constants.BLACK)
+        assert bitboards.is_attacked((G, 7), constants.BLACK)
+        assert not bitboards.is_attacked((F, 1), constants.BLACK)
+        assert bitboards.is_blocked((D, 1), (D, 8))
+        assert not bitboards.is_blocked((D, 1), (H, 5))
@@ -1,5 +1,11 @@
+import random
+
+from main.agents import RandomAgent
+from main.moves import encode
+from main.perft import START_FEN
 from main.pieces import Bishop, BlackPawn, King, Knight, Queen, Rook
 from main.x import A, B, C, D, E, F, G, H
+from main.zobrist import Zobrist
 
 
 class TestBoard:
@@ -256,7 +262,7 @@ class TestHalfmoveClock:
             ],
             active_color="b",
         )
-        board.halfmove_clock = 124
+        board.halfmove_clock = 149
         halfmove = board.black.move("a_pawn", A, 5)
 
         assert board.halfmove_clock == 0
@@ -276,7 +282,7 @@ class TestHalfmoveClock:
             ],
             active_color="b",
         )
-        board.halfmove_clock = 124
+        board.halfmove_clock = 149
         halfmove = board.black.move("king", D, 3)
 
         assert board.halfmove_clock == 0
@@ -296,10 +302,10 @@ class TestHalfmoveClock:
             ],
             active_color="b",
         )
-        board.halfmove_clock = 124
+        board.halfmove_clock = 149
         halfmove = board.black.move("king", B, 4)
 
-        assert board.halfmove_clock == 125
+        assert board.halfmove_clock == 150
         assert halfmove.change["game_result"] == "½-½ Seventy-five-move rule"
 
     def test_when_75th_move_is_checkmate_yields_checkmate(self, builder):
@@ -313,10 +319,10 @@ class TestHalfmoveClock:
             ],
             active_color="b",
         )
-        board.halfmove_clock = 124
+        board.halfmove_clock = 149
         halfmove = board.black.move("queen", E, 2)
 
-        assert board.halfmove_clock == 125
+        assert board.halfmove_clock == 150
         assert halfmove.change["game_result"] == "0-1"
 
 
@@ -418,3 +424,199 @@ class TestDrawByRepetition:
         halfmove = board.white.move("c_bishop", B, 5)
 
         assert halfmove.change["game_result"] == "½-½ Repetition"
+
+
+class TestLazyResults:
+    FOOLS_MATE = [("f_pawn", F, 3), ("e_pawn", E, 5), ("g_pawn", G, 4)]
+
+    def _play_fools_mate(self, board):
+        for i, move in enumerate(self.FOOLS_MATE):
+            (board.white if i % 2 == 0 else board.black).move(*move)
+
+        return board.black.move("queen", H, 4)
+
+    def test_lazy_and_eager_results_match(self, builder):
+        lazy, eager = builder.from_start(), builder.from_start()
+        eager.lazy_results = False
+
+        lazy_halfmove = self._play_fools_mate(lazy)
+        eager_halfmove = self._play_fools_mate(eager)
+
+        assert lazy_halfmove.change == eager_halfmove.change
+        assert lazy_halfmove.to_an() == "Qh4#"
+        assert lazy.result == eager.result == "0-1"
+        assert lazy.position_cts == eager.position_cts
+
+    def test_rollback_of_lazily_evaluated_mate_clears_result(self, default_board):
+        self._play_fools_mate(default_board)
+
+        default_board.rollback_halfmove()
+
+        assert default_board.result is None
+        assert sum(default_board.position_cts.values()) == 4  # Includes the start
+
+
+class TestMakeUnmake:
+    @staticmethod
+    def _make_and_unmake(board, move):
+        fen, key = board.get_fen(internal=True), board.zobrist.key
+        board.make(encode(board.active_agent, move))
+        made = board.get_fen(internal=True)
+        assert board.zobrist.key == Zobrist.from_board(board).key
+
+        board.unmake()
+        assert board.get_fen(internal=True) == fen
+        assert board.zobrist.key == key
+        assert not board.undo_stack
+
+        return made
+
+    def test_game_record_is_untouched(self, default_board):
+        default_board.make(encode(default_board.white, ("e_pawn", E, 4, None)))
+
+        assert default_board.game_tree.get_latest_halfmove() is None
+        assert default_board.position_cts[default_board.zobrist.key] == 0
+        assert default_board.black.en_passant_target is None
+        assert default_board.white.en_passant_target == (E, 3)
+
+        default_board.unmake()
+        assert default_board.white.e_pawn.position == (E, 2)
+
+    def test_castling(self, builder):
+        board = builder.from_fen("r3k3/8/8/8/8/8/8/4K2R w Kq - 3 10")
+
+        made = self._make_and_unmake(board, ("king", G, 1, None))
+
+        assert made == "r3k3/8/8/8/8/8/8/5RK1 b q - 4 10"
+        assert not board.white.h_rook.has_moved
+
+    def test_en_passant(self, builder):
+        board = builder.from_fen("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2")
+
+        made = self._make_and_unmake(board, ("e_pawn", D, 6, None))
+
+        assert made == "4k3/8/3P4/8/8/8/8/4K3 b - - 0 2"
+        assert board.black.d_pawn.position == (D, 5)
+
+    def test_capturing_promotion(self, builder):
+        board = builder.from_fen("1r2k3/P7/8/8/8/8/8/4K3 w - - 5 40")
+
+        made = self._make_and_unmake(board, ("a_pawn", B, 8, Knight))
+
+        assert made == "1N2k3/8/8/8/8/8/8/4K3 b - - 0 40"
+        assert board.white.a_pawn.position == (A, 7)
+        assert board.white.a_prom is None
+        assert board.black.a_rook.position == (B, 8)
+
+
+class TestSnapshots:
+    def test_restore_reuses_pieces(self, default_board):
+        snapshot = default_board.snapshot()
+        e_pawn, knight = default_board.white.e_pawn, default_board.black.g_knight
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("g_knight", F, 6)
+        default_board.white.move("e_pawn", E, 5)
+        default_board.black.move("g_knight", E, 4)
+
+        default_board.restore(snapshot)
+
+        assert default_board.get_fen(internal=True) == START_FEN
+        assert default_board.zobrist.key == Zobrist.from_board(default_board).key
+        assert default_board.white.e_pawn is e_pawn
+        assert default_board.black.g_knight is knight
+        assert default_board.white.pieces[(E, 2)] is e_pawn
+
+    def test_restore_castling_rights_and_en_passant(self, builder):
+        fen = "r3k2r/8/8/3pP3/8/8/8/R3K2R w Kq d6 0 2"
+        board = builder.from_fen(fen)
+        snapshot = board.snapshot()
+        board.white.move("king", G, 1)
+        board.black.move("a_rook", A, 5)
+
+        board.restore(snapshot)
+
+        assert board.get_fen(internal=True) == fen
+        assert board.black.en_passant_target == (D, 6)
+        assert not board.white.king.has_moved
+
+    def test_restore_across_promotion(self, builder):
+        board = builder.from_fen("1r2k3/P7/8/8/8/8/8/4K3 w - - 5 40")
+        before = board.snapshot()
+        board.white.move("a_pawn", B, 8, promotee_type=Knight)
+        after = board.snapshot()
+        promotee = board.white.a_prom
+
+        board.restore(before)
+        assert board.white.a_prom is None
+        assert board.white.a_pawn.position == (A, 7)
+        assert board.black.a_rook.position == (B, 8)
+
+        board.restore(after)
+        assert board.get_fen(internal=True) == "1N2k3/8/8/8/8/8/8/4K3 b - - 0 40"
+        assert board.white.a_prom is promotee
+
+    def test_take_back_capture_after_restore(self, default_board):
+        board = default_board
+        start = board.snapshot()
+        for an_text in ("e3", "a5", "Qf3", "Ra6", "Bxa6", "bxa6"):
+            board.active_agent.move_an(an_text)
+        snapshot = board.snapshot()
+
+        board.restore(start)
+        board.restore(snapshot)
+        board.rollback_halfmove()
+        board.rollback_halfmove()
+
+        assert board.get_fen(internal=True) == (
+            "1nbqkbnr/1ppppppp/r7/p7/8/4PQ2/PPPP1PPP/RNB1KBNR w KQk - 2 3"
+        )
+        assert board.black.a_rook.has_moved
+        assert board.zobrist.key == Zobrist.from_board(board).key
+
+    def test_step_back_over_capture_after_jump(self, default_board):
+        board = default_board
+        for an_text in ("e3", "a5", "Qf3", "Ra6", "Bxa6", "bxa6", "Qf4", "Nc6"):
+            board.active_agent.move_an(an_text)
+
+        board.jump(0)
+        board.jump(8)
+        for _ in range(4):
+            board.step_back()
+
+        assert board.get_fen(internal=True) == (
+            "1nbqkbnr/1ppppppp/r7/p7/8/4PQ2/PPPP1PPP/RNB1KBNR w KQk - 2 3"
+        )
+        assert board.zobrist.key == Zobrist.from_board(board).key
+
+    def test_take_back_capture_of_promotee_after_restore(self, builder):
+        board = builder.from_fen("1r2k3/P7/8/8/8/8/8/4K3 w - - 5 40")
+        before = board.snapshot()
+        board.white.move("a_pawn", A, 8, promotee_type=Knight)
+        board.black.move("a_rook", A, 8)
+        after = board.snapshot()
+
+        board.restore(before)
+        board.restore(after)
+        board.rollback_halfmove()
+
+        assert board.get_fen(internal=True) == "Nr2k3/8/8/8/8/8/8/4K3 b - - 0 40"
+        assert type(board.white.a_prom) is Knight
+
+    def test_jump_to_every_ply(self, builder):
+        random.seed(0)
+        board = builder.from_start(
+            white_agent_cls=RandomAgent, black_agent_cls=RandomAgent, max_fullmoves=30
+        )
+        board.play(internal=True)
+        tree = board.game_tree
+        fens = [START_FEN] + [hm.change["fen"] for hm in tree]
+        position_cts = dict(board.position_cts)
+
+        for ply in reversed(range(len(tree) + 1)):
+            board.jump(ply)
+            assert board.get_fen(internal=True) == fens[ply]
+
+        board.jump(len(tree))
+        assert board.result == tree[-1].change["game_result"]
+        assert board.position_cts == position_cts
+        assert sum(node.snapshot is not None for node in tree.path) > 1
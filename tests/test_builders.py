@@ -1,6 +1,9 @@
+import io
+
 import pytest
 
-from main.exceptions import BuildError, GameplayError
+from main.exceptions import BuildError, GameplayError, NotationError
+from main.export import to_pgn
 from main.pieces import King, Queen, WhitePawn
 from main.x import A, B, C, D, E, F, G, H
 
@@ -148,3 +151,59 @@ class TestBoardBuilder:
         )
 
         assert board.white.en_passant_target == (D, 3)
+
+    def test_from_pgn_replays_game(self, builder):
+        board = builder.from_pgn(
+            """[Event "?"]
+
+            1. e4 d5 2. exd5 c5 3. dxc6 Nxc6 4. Nf3 e5 5. Bc4 Nf6 6. O-O Be7
+            7. Re1 O-O 8. Nc3 Re8 9. Rf1 *
+            """
+        )
+
+        assert board.get_fen(internal=True) == (
+            "r1bqr1k1/pp2bppp/2n2n2/4p3/2B5/2N2N2/PPPP1PPP/R1BQ1RK1 b - - 9 9"
+        )
+        assert board.game_tree.get_latest_halfmove().to_an() == "Rf1"
+
+    def test_from_pgn_takes_result_the_position_does_not_show(self, builder):
+        text = '[Result "1-0"]\n\n1. e4 e5 2. Qh5 Nc6 3. Bc4 a6 1-0\n'
+        board = builder.from_pgn(text)
+
+        assert board.result == "1-0"
+        assert to_pgn(board).endswith("3. Bc4 a6 1-0\n")
+
+        board = builder.from_pgn("1. e4 e5 2. Nf3 Nf6 1/2-1/2")
+        assert board.result == "½-½ Agreement"
+
+        board = builder.from_pgn("1. e4 e5 *")
+        assert board.result is None
+
+    def test_from_pgn_keeps_result_of_final_position(self, builder):
+        board = builder.from_pgn("1. f3 e5 2. g4 Qh4# *")
+
+        assert board.result == "0-1"
+
+    def test_from_pgn_disambiguates_by_rank(self, builder):
+        board = builder.from_pgn(
+            '[FEN "4k3/8/8/R7/8/8/8/R3K3 w - - 0 1"]\n\n1. R1a3 Kd7 2. R5a4 *'
+        )
+
+        assert board.white.h_rook.position == (A, 3)
+        assert board.white.a_rook.position == (A, 4)
+
+    def test_from_pgn_with_illegal_move_raises_notation_error(self, builder):
+        with pytest.raises(NotationError) as exc_info:
+            builder.from_pgn("1. e4 e5 2. Ke3 *")
+
+        assert str(exc_info.value).startswith('Halfmove 3 ("Ke3")')
+
+    def test_iter_pgn_can_skip_invalid_games(self, builder):
+        text = '1. e4 e5 2. Ke3 *\n\n[Event "?"]\n\n1. d4 d5 *\n'
+
+        games = list(builder.iter_pgn(io.StringIO(text), skip_invalid=True))
+
+        assert len(games) == 1
+        pgn, board = games[0]
+        assert pgn.moves == ["d4", "d5"]
+        assert board.fullmove_number == 2
@@ -0,0 +1,79 @@
+import io
+
+from main.export import movetext, pgn_result, to_fen, to_pgn, write_pgn
+from main.notation import iter_pgn
+from main.tournament import Game, play_board
+from main.x import E, F, G, H
+
+
+class TestExport:
+    def _play_fools_mate(self, board):
+        board.white.move("f_pawn", F, 3)
+        board.black.move("e_pawn", E, 5)
+        board.white.move("g_pawn", G, 4)
+        board.black.move("queen", H, 4)
+
+        return board
+
+    def test_pgn_is_plain_text(self, default_board, capsys):
+        text = to_pgn(self._play_fools_mate(default_board))
+
+        assert capsys.readouterr().out == ""
+        assert "\x1b" not in text
+        assert text.endswith("\n\n1. f3 e5 2. g4 Qh4# 0-1\n")
+        assert '[White "ManualAgent"]\n[Black "ManualAgent"]\n[Result "0-1"]\n' in text
+
+    def test_headers_override_defaults_and_extras_follow_roster(self, default_board):
+        text = to_pgn(default_board, {"Event": 'Club "A"', "Annotator": "Me"})
+        tags = text.split("\n\n")[0].splitlines()
+
+        assert tags[0] == '[Event "Club \\"A\\""]'
+        assert tags[6] == '[Result "*"]'
+        assert tags[7] == '[Annotator "Me"]'
+
+    def test_game_starting_with_black(self, builder):
+        board = builder.from_fen("4k3/8/8/8/8/8/4P3/4K3 b - - 0 40")
+        board.black.move("king", F, 7)
+        board.white.move("e_pawn", E, 4)
+
+        assert movetext(board) == "40... Kf7 41. e4 *"
+
+    def test_movetext_one_fullmove_per_line(self, builder):
+        board = builder.from_fen("4k3/8/8/8/8/8/4P3/4K3 b - - 0 40")
+        board.black.move("king", F, 7)
+        board.white.move("e_pawn", E, 4)
+        board.black.move("king", F, 6)
+
+        assert movetext(board, compact=False) == "40... Kf7\n41. e4 Kf6\n*"
+        assert to_pgn(board, compact=False).endswith("\n\n40... Kf7\n41. e4 Kf6\n*\n")
+        assert board.get_pgn(compact=False, internal=True) == to_pgn(
+            board, compact=False
+        )
+
+    def test_movetext_is_wrapped(self):
+        board = play_board(Game(0, "RandomAgent", "AggressiveAgent", 1, 60))
+
+        lines = movetext(board, width=40).splitlines()
+
+        assert len(lines) > 1
+        assert all(len(line) <= 40 for line in lines)
+
+    def test_many_games_stream_to_one_handle(self):
+        boards = [
+            play_board(Game(i, "RandomAgent", "AggressiveAgent", i, 30))
+            for i in range(3)
+        ]
+        handle = io.StringIO()
+        for i, board in enumerate(boards):
+            write_pgn(handle, board, {"Round": str(i + 1)})
+
+        handle.seek(0)
+        pgns = list(iter_pgn(handle))
+
+        assert [pgn.headers["Round"] for pgn in pgns] == ["1", "2", "3"]
+        assert [pgn.result for pgn in pgns] == [pgn_result(b.result) for b in boards]
+        assert [len(pgn.moves) for pgn in pgns] == [len(b.game_tree) for b in boards]
+
+    def test_fen_is_not_printed(self, default_board, capsys):
+        assert to_fen(default_board).startswith("rnbqkbnr/pppppppp/")
+        assert capsys.readouterr().out == ""
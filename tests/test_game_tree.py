@@ -1,8 +1,8 @@
 import pytest
 
 from main import constants
+from main.exceptions import NotFoundError
 from main.game_tree import FullMove, GameTree, HalfMove
-from main.game_tree.utils import get_halfmove
 from main.pieces import King, Knight, Queen, Rook, WhitePawn
 from main.x import A, B, C, D, E, F, G, H
 
@@ -205,11 +205,52 @@ class TestGameTreeMutations:
         assert tree.second_latest_fullmove is tree.root
         assert tree.latest_fullmove == FullMove()
 
+    def test_prune_many_moves_deep_results_in_expected_tree(self, empty_change):
+        tree = GameTree()
+        for color in [constants.WHITE, constants.BLACK] * 5:
+            tree.append(HalfMove(color=color, change=empty_change))
+
+        for _ in range(8):
+            tree.prune()
+
+        assert tree.root == FullMove(
+            white=HalfMove(color=constants.WHITE, change=empty_change),
+            black=HalfMove(color=constants.BLACK, change=empty_change),
+            child=FullMove(),
+        )
+        assert tree.second_latest_fullmove is tree.root
+
 
-class TestUtils:
+class TestIndexing:
     def test_when_get_halfmove_called_out_of_range_raises_error(self, default_board):
-        with pytest.raises(Exception):
-            get_halfmove(1, default_board.game_tree)
+        with pytest.raises(NotFoundError):
+            default_board.game_tree.get_halfmove(1)
+
+    def test_halfmoves_are_indexed_by_ply(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("e_pawn", E, 5)
+        default_board.white.move("g_knight", F, 3)
+        tree = default_board.game_tree
+
+        assert len(tree) == 3
+        assert tree.get_halfmove(1.5) is tree[1]
+        assert tree.get_halfmove(2) is tree[-1] is tree.get_latest_halfmove()
+        assert [halfmove.to_an() for halfmove in tree[1:]] == ["e5", "Nf3"]
+        assert tree.get_node_at_height(1) is tree.root
+
+        default_board.rollback_halfmove()
+        assert len(tree) == 2
+        assert tree.get_latest_halfmove().to_an() == "e5"
+        with pytest.raises(NotFoundError):
+            tree.get_halfmove(2)
+
+    def test_game_starting_with_black(self, builder):
+        board = builder.from_fen("4k3/8/8/8/8/8/4P3/4K3 b - - 0 7")
+        board.black.move("king", D, 8)
+        board.white.move("e_pawn", E, 4)
+
+        assert board.game_tree.get_halfmove(7.5).to_an() == "Kd8"
+        assert board.game_tree.get_halfmove(8).to_an() == "e4"
 
 
 class TestHalfMove:
@@ -342,3 +383,73 @@ class TestHalfMove:
         halfmove = board.black.move("b_knight", B, 3)
 
         assert halfmove.to_an() == "Nb3#"
+
+
+class TestVariations:
+    @staticmethod
+    def _line(node):
+        return [halfmove.to_an() for halfmove in node.line()]
+
+    def test_different_move_from_earlier_position_branches(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("e_pawn", E, 5)
+        default_board.step_back()
+        default_board.black.move("c_pawn", C, 5)
+        tree = default_board.game_tree
+
+        first = tree.start.children[0]
+        assert len(tree.start.children) == 1  # Shared prefix
+        assert [self._line(node) for node in first.children] == [
+            ["e4", "e5"],
+            ["e4", "c5"],
+        ]
+        assert [halfmove.to_an() for halfmove in tree.mainline()] == ["e4", "e5"]
+        assert tree.cursor is first.children[1]
+        assert not tree.cursor.is_mainline
+
+    def test_replaying_a_move_follows_the_existing_line(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.step_back()
+        default_board.white.move("e_pawn", E, 4)
+
+        assert len(default_board.game_tree.start.children) == 1
+
+    def test_step_forward_and_goto_restore_positions(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("e_pawn", E, 5)
+        e5 = default_board.get_fen(internal=True)
+        default_board.step_back()
+        default_board.black.move("c_pawn", C, 5)
+        c5 = default_board.get_fen(internal=True)
+        e5_node, c5_node = default_board.game_tree.start.children[0].children
+
+        default_board.goto(e5_node)
+        assert default_board.get_fen(internal=True) == e5
+        default_board.step_back()
+        default_board.step_forward(variation=1)
+        assert default_board.get_fen(internal=True) == c5
+        assert default_board.game_tree.cursor is c5_node
+        assert sum(default_board.position_cts.values()) == 3
+
+    def test_prune_removes_subtree(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("e_pawn", E, 5)
+        default_board.white.move("g_knight", F, 3)
+        default_board.goto(default_board.game_tree.start.children[0])
+
+        default_board.rollback_halfmove()
+
+        assert default_board.game_tree.start.children == []
+        assert default_board.white.e_pawn.position == (E, 2)
+
+    def test_promote_makes_variation_the_mainline(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("e_pawn", E, 5)
+        default_board.step_back()
+        default_board.black.move("c_pawn", C, 5)
+        tree = default_board.game_tree
+
+        tree.promote(tree.cursor)
+
+        assert tree.cursor.is_mainline
+        assert [halfmove.to_an() for halfmove in tree.mainline()] == ["e4", "c5"]
@@ -0,0 +1,144 @@
+from main.pieces import Bishop, BlackPawn, King, Knight, Queen, Rook, WhitePawn
+from main.x import A, B, C, D, E, F, H
+
+
+class TestKingSafety:
+    def test_pinned_piece_can_only_move_along_pin(self, builder):
+        board = builder.from_data(
+            white_data=[
+                {"piece_type": King, "x": E, "y": 1},
+                {"piece_type": Rook, "x": E, "y": 3},
+            ],
+            black_data=[
+                {"piece_type": King, "x": A, "y": 8},
+                {"piece_type": Queen, "x": E, "y": 7},
+            ],
+        )
+
+        assert board.white.a_rook.get_moveset() == {
+            (E, 2),
+            (E, 4),
+            (E, 5),
+            (E, 6),
+            (E, 7),
+        }
+
+    def test_pinned_knight_cant_move(self, builder):
+        board = builder.from_data(
+            white_data=[
+                {"piece_type": King, "x": A, "y": 1},
+                {"piece_type": Knight, "x": C, "y": 3},
+            ],
+            black_data=[
+                {"piece_type": King, "x": H, "y": 8},
+                {"piece_type": Bishop, "x": F, "y": 6},
+            ],
+        )
+
+        assert board.white.b_knight.get_moveset() == set()
+
+    def test_in_check_only_blocks_and_captures_are_legal(self, builder):
+        board = builder.from_data(
+            white_data=[
+                {"piece_type": King, "x": E, "y": 1},
+                {"piece_type": Rook, "x": A, "y": 3},
+                {"piece_type": Bishop, "x": B, "y": 5},
+            ],
+            black_data=[
+                {"piece_type": King, "x": A, "y": 8},
+                {"piece_type": Rook, "x": E, "y": 8},
+            ],
+        )
+
+        assert board.white.a_rook.get_moveset() == {(E, 3)}
+        assert board.white.c_bishop.get_moveset() == {(E, 8), (E, 2)}
+
+    def test_in_double_check_only_king_can_move(self, builder):
+        board = builder.from_data(
+            white_data=[
+                {"piece_type": King, "x": E, "y": 1},
+                {"piece_type": Queen, "x": D, "y": 4},
+            ],
+            black_data=[
+                {"piece_type": King, "x": A, "y": 8},
+                {"piece_type": Rook, "x": E, "y": 8},
+                {"piece_type": Knight, "x": D, "y": 3},
+            ],
+        )
+
+        assert board.white.queen.get_moveset() == set()
+        assert board.white.king.get_moveset() == {(D, 1), (F, 1), (D, 2)}
+
+    def test_en_passant_exposing_king_on_rank_is_illegal(self, builder):
+        board = builder.from_fen("8/8/8/K2pP2r/8/8/8/7k w - d6 0 2")
+
+        assert not board.white.e_pawn.is_valid_move((D, 6))
+        assert board.white.e_pawn.get_moveset() == {(E, 6)}
+
+    def test_en_passant_capturing_checker_is_legal(self, builder):
+        board = builder.from_data(
+            white_data=[
+                {"piece_type": King, "x": C, "y": 4},
+                {"piece_type": WhitePawn, "x": E, "y": 5},
+            ],
+            black_data=[
+                {"piece_type": King, "x": H, "y": 8},
+                {"piece_type": BlackPawn, "x": D, "y": 7},
+            ],
+            active_color="b",
+        )
+        board.black.move("d_pawn", D, 5)
+
+        assert board.white.e_pawn.get_moveset() == {(D, 6)}
+
+    def test_computing_movesets_does_not_touch_game_tree(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        latest = default_board.game_tree.get_latest_halfmove()
+
+        assert default_board.black.can_move()
+        for piece in default_board.black.pieces.values():
+            piece.get_moveset()
+
+        assert default_board.game_tree.get_latest_halfmove() is latest
+        assert default_board.white.e_pawn.position == (E, 4)
+        assert default_board.black.king_safety is default_board.black.king_safety
+
+
+class TestHasLegalMove:
+    def test_stalemate_with_pinned_pieces(self, builder):
+        # The knight and rook have squares to go to, but are pinned
+        for fen in (
+            "k1K5/1n6/1PB5/8/8/8/8/8 b - - 0 1",
+            "7k/5Kr1/5BP1/8/8/8/8/8 b - - 0 1",
+        ):
+            board = builder.from_fen(fen)
+
+            assert not board.black.king_safety.in_check
+            assert not board.black.can_move(), fen
+
+    def test_mate_when_pinned_piece_cant_block(self, builder):
+        board = builder.from_fen("7k/5Kr1/5BP1/8/8/8/8/7R b - - 0 1")
+
+        assert board.black.king_safety.in_check
+        assert not board.black.can_move()
+
+    def test_double_check_ignores_blocks(self, builder):
+        # The rook could block either check, but not both
+        board = builder.from_fen("r6k/8/8/1R6/3b4/8/3n4/K7 w - - 0 1")
+
+        assert board.white.king_safety.check_mask == 0
+        assert not board.white.can_move()
+
+    def test_only_pawn_moves_left(self, builder):
+        board = builder.from_fen("k7/8/8/8/8/8/P4q2/7K w - - 0 1")
+        assert board.white.can_move()
+
+        board = builder.from_fen("k7/8/8/8/p7/P7/5q2/7K w - - 0 1")
+        assert not board.white.can_move()
+
+    def test_early_stalemate_is_detected(self, builder):
+        board = builder.from_fen("7k/8/6K1/5Q2/8/8/8/8 w - - 0 1")
+        halfmove = board.white.move("queen", F, 7)
+
+        assert board.fullmove_number == 1
+        assert halfmove.change["game_result"] == "½-½ Stalemate"
@@ -0,0 +1,108 @@
+import random
+
+from main.agents import RandomAgent
+from main.material import Material
+from main.x import B, D, E, F
+
+
+class TestMaterial:
+    @staticmethod
+    def _assert_in_sync(board):
+        rebuilt = Material.from_agents(board.white, board.black)
+        assert board.material.counts == rebuilt.counts
+        assert board.material.bishops == rebuilt.bishops
+
+    def test_starting_position(self, default_board):
+        material = default_board.material
+
+        assert material.counts["WHITE"] == {
+            "P": 8,
+            "N": 2,
+            "B": 2,
+            "R": 2,
+            "Q": 1,
+            "K": 1,
+        }
+        assert material.bishops == [2, 2]
+        assert not material.is_insufficient()
+
+    def test_capture_and_rollback_stay_in_sync(self, default_board):
+        default_board.material
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("d_pawn", D, 5)
+        default_board.white.move("f_bishop", B, 5)
+        default_board.black.move("c_bishop", D, 7)
+        default_board.white.move("f_bishop", D, 7)
+        assert default_board.material.bishops == [1, 2]
+        self._assert_in_sync(default_board)
+
+        default_board.rollback_halfmove()
+        assert default_board.material.bishops == [2, 2]
+        self._assert_in_sync(default_board)
+
+    def test_promotion_and_make_unmake(self, builder):
+        board = builder.from_fen("4k3/1P6/8/8/8/8/8/4K3 w - - 0 1")
+        board.material
+        board.white.move("b_pawn", B, 8)
+
+        assert board.material.counts["WHITE"]["Q"] == 1
+        assert board.material.counts["WHITE"]["P"] == 0
+        self._assert_in_sync(board)
+
+        board.rollback_halfmove()
+        self._assert_in_sync(board)
+
+    def test_random_games_stay_in_sync(self, builder):
+        random.seed(3)
+        board = builder.from_start(
+            white_agent_cls=RandomAgent, black_agent_cls=RandomAgent, max_fullmoves=80
+        )
+        board.material
+        while not board.result and board.fullmove_number < 80:
+            board.active_agent.move()
+            self._assert_in_sync(board)
+
+    def test_set_position_rebuilds(self, builder):
+        board = builder.from_start()
+        board.material
+        board.set_position(builder.fields_from_fen("4k3/8/8/8/8/8/8/2B1KB2 w - - 0 1"))
+
+        self._assert_in_sync(board)
+        assert not board.material.is_insufficient()
+
+
+class TestIsInsufficient:
+    def test_lone_kings_and_single_minors(self, builder):
+        for fen in (
+            "4k3/8/8/8/8/8/8/4K3 w - - 0 1",
+            "4k3/8/8/8/8/8/8/4KN2 w - - 0 1",
+            "4k3/8/8/8/8/8/8/4KB2 w - - 0 1",
+            "4kb2/8/8/8/8/8/8/4K3 w - - 0 1",
+        ):
+            assert builder.from_fen(fen).has_insufficient_material(), fen
+
+    def test_bishops_on_one_color(self, builder):
+        # Any number of bishops, on either side, all on light squares
+        board = builder.from_fen("2b1k3/8/8/8/8/8/8/3BKB2 w - - 0 1")
+
+        assert board.has_insufficient_material()
+
+    def test_mating_material(self, builder):
+        for fen in (
+            "4k3/8/8/8/8/8/8/2B1KB2 w - - 0 1",
+            "4k3/8/8/8/8/8/8/1N2K1N1 w - - 0 1",
+            "4k1n1/8/8/8/8/8/8/4KB2 w - - 0 1",
+            "4k1n1/8/8/8/8/8/8/1N2K3 w - - 0 1",
+            "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1",
+            "4k3/8/8/8/8/8/8/4K2R w - - 0 1",
+            "3qk3/8/8/8/8/8/8/4K3 w - - 0 1",
+        ):
+            assert not builder.from_fen(fen).has_insufficient_material(), fen
+
+    def test_detected_early_in_game(self, builder):
+        board = builder.from_fen("4k3/8/8/8/8/8/3q4/4KB2 w - - 0 2")
+        halfmove = board.white.move("king", D, 2)
+
+        assert board.fullmove_number == 2
+        assert halfmove.change["game_result"] == "½-½ Insufficient material"
+        assert board.white.f_bishop.position == (F, 1)
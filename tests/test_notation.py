@@ -1,7 +1,9 @@
+import io
+
 import pytest
 
 from main.exceptions import NotationError
-from main.notation import AN, FEN
+from main.notation import AN, FEN, PGN, iter_pgn
 from main.pieces import Bishop, King, Knight, Pawn, Queen
 from main.x import A, B, C, D, E, G, H
 
@@ -125,3 +127,56 @@ class TestAN:
         default_board.white.move(an_text="b3")
 
         assert default_board.white.b_pawn.position == (B, 3)
+
+
+OPERA_GAME = """[Event "Paris"]
+[Site "Paris FRA"]
+[Date "1858.??.??"]
+[White "Paul Morphy"]
+[Black "Duke Karl / Count Isouard"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 3. d4 Bg4 {This is a weak move already.} 4. dxe5 Bxf3
+5. Qxf3 dxe5 6. Bc4 Nf6 7. Qb3 Qe7 8. Nc3 (8. Qxb7 Qb4+) 8... c6 9. Bg5 b5?!
+10. Nxb5 cxb5 11. Bxb5+ Nbd7 12. O-O-O Rd8 13. Rxd7 Rxd7 14. Rd1 Qe6
+15. Bxd7+ Nxd7 16. Qb8+ $1 Nxb8 17. Rd8# 1-0
+"""
+
+SHORT_GAME = """[Event "?"]
+[Result "0-1"]
+
+1. f3 e5 2. g4 Qh4# 0-1
+"""
+
+
+class TestPGN:
+    def test_pgn_parser_returns_headers_and_mainline(self):
+        pgn = PGN(text=OPERA_GAME)
+
+        assert pgn.headers["White"] == "Paul Morphy"
+        assert pgn.result == "1-0"
+        assert len(pgn.moves) == 33
+        assert pgn.moves[:4] == ["e4", "e5", "Nf3", "d6"]
+        assert "Qxb7" not in pgn.moves
+        assert pgn.moves[17] == "b5"
+        assert pgn.moves[-1] == "Rd8#"
+
+    def test_pgn_parser_handles_zeros_castling_and_nested_variations(self):
+        pgn = PGN(text="1. e4 (1. d4 d5 (1... Nf6)) 1... e5 2. 0-0-0 0-0 *")
+
+        assert pgn.moves == ["e4", "e5", "O-O-O", "O-O"]
+        assert pgn.result == "*"
+
+    def test_iter_pgn_yields_each_game(self):
+        games = list(iter_pgn(io.StringIO(f"{OPERA_GAME}\n{SHORT_GAME}")))
+
+        assert [len(game.moves) for game in games] == [33, 4]
+        assert games[1].result == "0-1"
+
+    def test_iter_pgn_reads_lazily(self):
+        lines = iter(f"{SHORT_GAME}\n{SHORT_GAME}\n{OPERA_GAME}".splitlines(True))
+        games = iter_pgn(lines)
+
+        next(games)
+        # Only the first line of the second game has been read
+        assert next(lines) == '[Result "0-1"]\n'
@@ -0,0 +1,77 @@
+import pytest
+
+from main.perft import START_FEN, divide, perft, timed_perft
+
+# https://www.chessprogramming.org/Perft_Results
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+POSITION_3 = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+POSITION_4 = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+POSITION_5 = "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"
+POSITION_6 = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+
+
+class TestPerft:
+    @pytest.mark.parametrize(
+        "fen, depth, expected",
+        [
+            (START_FEN, 1, 20),
+            (START_FEN, 2, 400),
+            (START_FEN, 3, 8902),
+            (KIWIPETE, 1, 48),
+            (KIWIPETE, 2, 2039),
+            (POSITION_3, 3, 2812),
+            (POSITION_4, 3, 9467),
+            (POSITION_5, 2, 1486),
+            (POSITION_6, 2, 2079),
+        ],
+    )
+    def test_reference_positions(self, builder, fen, depth, expected):
+        result = timed_perft(builder.from_fen(fen), depth)
+
+        assert result.nodes == expected
+
+    @pytest.mark.parametrize(
+        "fen, depth, expected",
+        [
+            # En passant that would expose the King along the rank
+            ("3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1", 3, 1670),
+            # En passant that would expose the King along a diagonal
+            ("8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1", 3, 1928),
+            # Short castling gives check
+            ("5k2/8/8/8/8/8/8/4K2R w K - 0 1", 3, 1198),
+            # Long castling gives check
+            ("3k4/8/8/8/8/8/8/R3K3 w Q - 0 1", 3, 1286),
+            # Castling rights lost by captured rooks
+            ("r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1", 2, 1141),
+            # Castling prevented by attacked squares
+            ("r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1", 2, 1494),
+            # Promotion out of check
+            ("2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1", 3, 1442),
+            # Underpromotion to check
+            ("8/P1k5/K7/8/8/8/8/8 w - - 0 1", 3, 273),
+            # Self stalemate
+            ("K1k5/8/P7/8/8/8/8/8 w - - 0 1", 3, 13),
+            # Stalemate and checkmate
+            ("8/k1P5/8/1K6/8/8/8/8 w - - 0 1", 3, 268),
+        ],
+    )
+    def test_edge_cases(self, builder, fen, depth, expected):
+        assert perft(builder.from_fen(fen), depth) == expected
+
+    def test_divide_sums_to_perft(self, builder):
+        counts = divide(builder.from_fen(KIWIPETE), 2)
+
+        assert len(counts) == 48
+        assert counts["e1g1"] == 43
+        assert sum(counts.values()) == 2039
+
+    def test_perft_restores_position(self, builder):
+        board = builder.from_fen(KIWIPETE)
+        fen = board.get_fen(internal=True)
+        key = board.zobrist.key
+
+        perft(board, 2)
+
+        assert board.get_fen(internal=True) == fen
+        assert board.zobrist.key == key
+        assert board.game_tree.get_latest_halfmove() is None
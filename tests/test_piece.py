@@ -1,7 +1,23 @@
-from main.pieces import Bishop, King, Knight, Queen, Rook, WhitePawn
+from main.bitboards import SQUARE_INDEX
+from main.pieces import Bishop, BlackPawn, King, Knight, Queen, Rook, WhitePawn
 from main.x import A, B, C, D, E, F, G, H
 
 
+class TestRays:
+    def test_rays_stop_at_edge_of_board(self):
+        assert Knight.rays[SQUARE_INDEX[(A, 1)]] == (((C, 2),), ((B, 3),))
+        assert Rook.rays[SQUARE_INDEX[(A, 1)]] == (
+            tuple((x, 1) for x in range(B, H + 1)),
+            tuple((A, y) for y in range(2, 9)),
+        )
+        assert len(Queen.rays[SQUARE_INDEX[(D, 4)]]) == 8
+
+    def test_pawn_rays_include_double_push_from_initial_rank_only(self):
+        assert WhitePawn.rays[SQUARE_INDEX[(E, 2)]][0] == ((E, 3), (E, 4))
+        assert WhitePawn.rays[SQUARE_INDEX[(E, 3)]][0] == ((E, 4),)
+        assert BlackPawn.rays[SQUARE_INDEX[(A, 7)]] == (((A, 6), (A, 5)), ((B, 6),))
+
+
 class TestGetGameResult:
     def test_white_in_check_and_cant_move_yields_checkmate(self, builder):
         board = builder.from_data(
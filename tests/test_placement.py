@@ -0,0 +1,62 @@
+from main.placement import Placement
+from main.x import A, B, D, E, F, G
+
+
+class TestPlacement:
+    @staticmethod
+    def _rebuilt(board) -> str:
+        return str(Placement.from_agents(board.white, board.black))
+
+    def test_starting_position(self, default_board):
+        assert str(default_board.placement) == (
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR"
+        )
+
+    def test_capture_and_rollback_stay_in_sync(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("d_pawn", D, 5)
+        default_board.white.move("e_pawn", D, 5)
+        assert str(default_board.placement) == self._rebuilt(default_board)
+
+        default_board.rollback_halfmove()
+        assert str(default_board.placement) == (
+            "rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR"
+        )
+
+    def test_black_capture_rollback_keeps_resurrected_piece(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("f_pawn", F, 5)
+        default_board.white.move("b_knight", A, 3)
+        default_board.black.move("f_pawn", E, 4)
+
+        default_board.rollback_halfmove()
+
+        assert str(default_board.placement) == self._rebuilt(default_board)
+        assert default_board.placement.squares[3][E - 1] == "P"
+
+    def test_castling_promotion_and_en_passant(self, builder):
+        board = builder.from_fen("4k3/1P6/8/8/3p4/8/4P3/4K2R w K - 0 1")
+        board.white.move("king", G, 1)
+        board.black.move("king", D, 7)
+        board.white.move("e_pawn", E, 4)
+        board.black.move("d_pawn", E, 3)
+        board.white.move("b_pawn", B, 8)
+
+        assert str(board.placement) == "1Q6/3k4/8/8/8/4p3/8/5RK1"
+        assert str(board.placement) == self._rebuilt(board)
+
+    def test_only_changed_ranks_are_rebuilt(self, default_board):
+        str(default_board.placement)
+        knight = default_board.white.g_knight
+        default_board.apply_change(knight.construct_change(F, 3, lookahead=False))
+
+        assert default_board.placement.ranks == [
+            None,
+            "PPPPPPPP",
+            None,
+            "8",
+            "8",
+            "8",
+            "pppppppp",
+            "rnbqkbnr",
+        ]
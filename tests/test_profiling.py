@@ -0,0 +1,62 @@
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from main.board import Board
+from main.pieces import King, Piece
+from main.profiling import profile
+from main.x import E, F
+
+
+class TestProfiler:
+    def test_counts_calls_per_halfmove(self, default_board):
+        with profile() as profiler:
+            default_board.white.move("e_pawn", E, 4)
+            default_board.black.move("e_pawn", E, 5)
+            default_board.rollback_halfmove()
+
+        report = profiler.report()
+        assert report["halfmoves"] == 2
+        assert report["functions"]["rollback_halfmove"]["calls"] == 1
+        assert report["functions"]["get_fen"]["calls_per_halfmove"] == 1
+        assert report["functions"]["get_game_result"]["seconds"] > 0
+
+    def test_recursive_calls_are_counted_once(self, default_board):
+        with profile() as profiler:
+            default_board.white.king.get_moveset()
+
+        assert profiler.calls["get_moveset"] == 1
+
+    def test_disabling_restores_methods(self, default_board):
+        originals = Board.apply_change, Piece.get_moveset, King.get_moveset
+
+        with profile() as profiler:
+            assert Board.apply_change is not originals[0]
+
+        assert (Board.apply_change, Piece.get_moveset, King.get_moveset) == originals
+        default_board.white.move("g_knight", F, 3)
+        assert not profiler.calls["apply_change"]
+
+    def test_dump_is_json(self, default_board):
+        handle = io.StringIO()
+        with profile() as profiler:
+            default_board.white.move("g_knight", F, 3)
+        profiler.dump(handle)
+
+        assert json.loads(handle.getvalue())["functions"]["apply_change"]["calls"] == 1
+
+
+class TestImports:
+    def test_tabulate_loads_lazily(self):
+        check = "import main.profiling, sys; print('tabulate' in sys.modules)"
+        output = subprocess.run(
+            [sys.executable, "-c", check],
+            cwd=Path(__file__).parent.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+        assert output.strip() == "False"
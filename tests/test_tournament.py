@@ -0,0 +1,83 @@
+from main.tournament import (
+    Game,
+    GameRecord,
+    play_board,
+    play_game,
+    run,
+    schedule,
+    standings,
+)
+
+
+class TestTournament:
+    def test_schedule_alternates_colors_for_each_pairing(self):
+        games = schedule(["RandomAgent", "AggressiveAgent", "SearchAgent"], games=2)
+
+        assert len(games) == 6
+        assert [(g.white, g.black) for g in games[:2]] == [
+            ("RandomAgent", "AggressiveAgent"),
+            ("AggressiveAgent", "RandomAgent"),
+        ]
+        assert [g.index for g in games] == list(range(6))
+
+    def test_schedule_is_seeded(self):
+        agents = ["RandomAgent", "AggressiveAgent"]
+
+        assert schedule(agents, games=4, seed=1) == schedule(agents, games=4, seed=1)
+        assert schedule(agents, games=4, seed=1) != schedule(agents, games=4, seed=2)
+
+    def test_same_seed_replays_same_game(self):
+        game = Game(
+            index=0,
+            white="RandomAgent",
+            black="AggressiveAgent",
+            seed=42,
+            max_fullmoves=40,
+        )
+
+        first, second = play_game(game), play_game(game)
+
+        assert first.pgn == second.pgn
+        assert first.halfmoves == second.halfmoves == len(play_board(game).game_tree)
+        assert first.result == second.result
+
+    def test_run_streams_every_game_from_pool(self):
+        games = schedule(["RandomAgent", "AggressiveAgent"], games=4, max_fullmoves=20)
+
+        records = list(run(games, workers=2))
+
+        assert sorted(r.index for r in records) == [0, 1, 2, 3]
+        assert all(r.pgn.startswith('[Event "?"]') for r in records)
+        assert all(0 < r.halfmoves <= 40 for r in records)
+
+    def test_standings_count_points(self):
+        games = schedule(["RandomAgent", "AggressiveAgent"], games=4, max_fullmoves=20)
+        records = list(run(games, workers=1))
+
+        table = standings(records)
+
+        assert table["RandomAgent"]["games"] == table["AggressiveAgent"]["games"] == 4
+        points = table["RandomAgent"]["points"] + table["AggressiveAgent"]["points"]
+        assert points + table["RandomAgent"]["unfinished"] == 4
+
+    def test_unfinished_games_score_no_points(self):
+        records = [
+            GameRecord(0, "RandomAgent", "AggressiveAgent", 0, "1-0", 10, "", 0.1),
+            GameRecord(1, "AggressiveAgent", "RandomAgent", 1, None, 40, "", 0.1),
+            GameRecord(
+                2, "RandomAgent", "AggressiveAgent", 2, "½-½ Stalemate", 9, "", 0.1
+            ),
+        ]
+
+        table = standings(records)
+
+        assert table["RandomAgent"] == {
+            "games": 3,
+            "wins": 1,
+            "draws": 1,
+            "losses": 0,
+            "unfinished": 1,
+            "points": 1.5,
+        }
+        assert table["AggressiveAgent"]["unfinished"] == 1
+        assert table["AggressiveAgent"]["points"] == 0.5
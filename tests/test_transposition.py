@@ -0,0 +1,151 @@
+from array import array
+
+from main.agents import SearchAgent
+from main.moves import (
+    CAPTURE,
+    DOUBLE_PAWN_PUSH,
+    EN_PASSANT,
+    KINGSIDE_CASTLE,
+    NULL_MOVE,
+    PROMOTION,
+    QUIET,
+    decode,
+    encode,
+    generate,
+    to_coordinate,
+)
+from main.pieces import Queen
+from main.transposition import EXACT, LOWER, UPPER, TranspositionTable
+from main.x import A, E, F, G
+
+
+class TestTranspositionTable:
+    def test_size_is_bounded_by_budget(self):
+        table = TranspositionTable(size_mb=1)
+
+        assert len(table) == 2**16
+        assert table.size_mb == 1
+
+    def test_store_then_probe_returns_entry(self):
+        table = TranspositionTable(size_mb=1)
+        table.store(key=12345, move=777, depth=6, bound=LOWER, score=-315)
+
+        entry = table.probe(12345)
+        assert (entry.move, entry.depth, entry.bound, entry.score) == (
+            777,
+            6,
+            LOWER,
+            -315,
+        )
+        assert table.probe(54321) is None
+        assert table.hit_rate == 0.5
+
+    def test_deeper_entry_survives_shallower_store(self):
+        table = TranspositionTable(size_mb=1)
+        colliding = 1 + (table.mask + 1)
+
+        table.store(key=1, move=0, depth=8, bound=EXACT, score=10)
+        table.store(key=colliding, move=0, depth=2, bound=UPPER, score=20)
+
+        assert table.probe(1).depth == 8
+        assert table.probe(colliding).depth == 2
+        assert table.used == 2
+
+    def test_always_replace_slot_takes_newest_entry(self):
+        table = TranspositionTable(size_mb=1)
+        first = 1 + (table.mask + 1)
+        second = 1 + 2 * (table.mask + 1)
+
+        table.store(key=1, move=0, depth=8, bound=EXACT, score=10)
+        table.store(key=first, move=0, depth=2, bound=EXACT, score=20)
+        table.store(key=second, move=0, depth=3, bound=EXACT, score=30)
+
+        assert table.probe(1).depth == 8
+        assert table.probe(first) is None
+        assert table.probe(second).score == 30
+        assert table.occupancy == 2 / len(table)
+
+    def test_entries_from_older_searches_can_be_replaced(self):
+        table = TranspositionTable(size_mb=1)
+        colliding = 1 + (table.mask + 1)
+
+        table.store(key=1, move=0, depth=8, bound=EXACT, score=10)
+        table.new_search()
+        table.store(key=colliding, move=0, depth=2, bound=EXACT, score=20)
+
+        assert table.probe(colliding).depth == 2
+        assert table.probe(1) is None
+
+    def test_clear_empties_table(self):
+        table = TranspositionTable(size_mb=1)
+        table.store(key=1, move=0, depth=1, bound=EXACT, score=0)
+
+        table.clear()
+
+        assert table.probe(1) is None
+        assert table.used == 0
+
+
+class TestMoveEncoding:
+    def test_encode_round_trips(self, builder):
+        board = builder.from_fen("8/P7/8/8/8/8/8/K1k5 w - - 0 1")
+
+        for move in [("king", A, 2, None), ("a_pawn", A, 8, Queen)]:
+            assert decode(board.white, encode(board.white, move)) == move
+
+    def test_flags(self, builder):
+        board = builder.from_fen("r3k3/1P6/8/3pP3/8/8/4P3/4K2R w K d6 0 1")
+        flags = {to_coordinate(code): code >> 12 for code in generate(board.white)}
+
+        assert flags["e2e3"] == QUIET
+        assert flags["e2e4"] == DOUBLE_PAWN_PUSH
+        assert flags["e5d6"] == EN_PASSANT
+        assert flags["e1g1"] == KINGSIDE_CASTLE
+        assert flags["h1h8"] == QUIET
+        assert flags["b7a8n"] == PROMOTION | CAPTURE | 3
+        assert flags["b7b8q"] == PROMOTION
+
+    def test_generate_fills_given_list(self, default_board):
+        moves = array("H", [NULL_MOVE])
+
+        assert generate(default_board.white, moves) is moves
+        assert len(moves) == 21
+
+    def test_decode_without_piece_on_from_square_returns_none(self, default_board):
+        code = encode(default_board.white, ("g_knight", G, 3, None))
+
+        assert decode(default_board.black, code) is None
+        assert decode(default_board.white, 0) is None
+
+
+class TestSearchWithTable:
+    def test_shared_table_is_used_by_both_agents(self, builder):
+        board = builder.from_start(
+            white_agent_cls=SearchAgent, black_agent_cls=SearchAgent
+        )
+        table = TranspositionTable(size_mb=1)
+        for agent in (board.white, board.black):
+            agent.transposition_table = table
+            agent.time_budget = None
+            agent.max_depth = 2
+
+        board.white.move()
+        stores = table.stores
+        board.black.move()
+
+        assert board.black.transposition_table is board.white.transposition_table
+        assert table.stores > stores
+        assert table.hits
+
+    def test_table_hits_do_not_change_best_move(self, builder):
+        fen = "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 4 4"
+        board = builder.from_fen(fen, white_agent_cls=SearchAgent)
+        board.white.time_budget = None
+        board.white.max_depth = 3
+
+        first = board.white.search()
+        second = board.white.search()
+
+        assert first == second == ("queen", F, 7, None)
+        assert board.white.transposition_table.hits
+        assert board.white.king.position == (E, 1)
@@ -0,0 +1,72 @@
+from main.pieces import King, Rook
+from main.x import A, C, E, F, G, H
+from main.zobrist import Zobrist
+
+
+class TestZobrist:
+    def test_incremental_key_matches_full_rehash(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.black.move("g_knight", F, 6)
+        default_board.white.move("e_pawn", E, 5)
+
+        assert default_board.zobrist.key == Zobrist.from_board(default_board).key
+
+    def test_transposition_yields_same_key(self, builder):
+        board_a = builder.from_start()
+        board_a.white.move("g_knight", F, 3)
+        board_a.black.move("g_knight", F, 6)
+        board_a.white.move("b_knight", C, 3)
+
+        board_b = builder.from_start()
+        board_b.white.move("b_knight", C, 3)
+        board_b.black.move("g_knight", F, 6)
+        board_b.white.move("g_knight", F, 3)
+
+        assert board_a.zobrist.key == board_b.zobrist.key
+
+    def test_en_passant_target_changes_key(self, builder):
+        board_a = builder.from_start()
+        board_a.white.move("e_pawn", E, 4)
+
+        board_b = builder.from_fen(
+            "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+        )
+
+        assert board_a.zobrist.key != board_b.zobrist.key
+
+    def test_losing_castling_rights_changes_key(self, builder):
+        board = builder.from_data(
+            white_data=[
+                {"piece_type": King, "x": E, "y": 1},
+                {"piece_type": Rook, "x": H, "y": 1},
+            ],
+            black_data=[
+                {"piece_type": King, "x": E, "y": 8},
+            ],
+        )
+        start_key = board.zobrist.key
+
+        board.white.move("h_rook", G, 1)
+        board.black.move("king", E, 7)
+        board.white.move("h_rook", H, 1)
+        board.black.move("king", E, 8)
+
+        assert board.zobrist.key != start_key
+
+    def test_rollback_restores_key_and_repetition_count(self, default_board):
+        default_board.white.move("b_knight", C, 3)
+        key = default_board.zobrist.key
+
+        default_board.black.move("b_knight", A, 6)
+        default_board.rollback_halfmove()
+
+        assert default_board.zobrist.key == key
+        assert default_board.position_cts[key] == 1
+        assert sum(default_board.position_cts.values()) == 2
+
+    def test_rollback_of_double_push_clears_en_passant_target(self, default_board):
+        default_board.white.move("e_pawn", E, 4)
+        default_board.rollback_halfmove()
+
+        assert default_board.white.en_passant_target is None
+        assert default_board.zobrist.key == Zobrist.from_board(default_board).key